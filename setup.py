@@ -59,6 +59,85 @@ class TagCommand(Command):
         sys.exit()
 
 
+class ZipappCommand(Command):
+    description = "Build a single-file zipapp with vendored, precompiled deps."
+    user_options: list[Any] = [
+        ("output=", "o", "archive to write [default: dist/zenith.pyz]"),
+        ("python=", "p", "interpreter for the shebang [default: /usr/bin/env python3]"),
+    ]
+
+    def initialize_options(self) -> None:
+        self.output = os.path.join(here, "dist", f"{NAME}.pyz")
+        self.python = "/usr/bin/env python3"
+
+    def finalize_options(self) -> None:
+        pass
+
+    def run(self) -> None:
+        import compileall
+        import hashlib
+        import py_compile
+        import shutil
+        import subprocess
+        import tempfile
+        import zipapp
+
+        with tempfile.TemporaryDirectory() as build_dir:
+            site = os.path.join(build_dir, "site")
+            TagCommand.status("Vendoring zenith and its dependencies…")
+            subprocess.run(
+                [sys.executable, "-m", "pip", "install", "--quiet", "--no-compile"]
+                + ["--target", site, "-r", os.path.join(here, "requirements.txt")]
+                + [here],
+                check=True,
+            )
+            # console scripts point at the build interpreter, the zipapp has its own
+            shutil.rmtree(os.path.join(site, "bin"), ignore_errors=True)
+            native = [
+                os.path.relpath(os.path.join(root, name), site)
+                for root, _, files in os.walk(site)
+                for name in files
+                if name.endswith((".so", ".pyd", ".dylib"))
+            ]
+            if native:
+                TagCommand.status(
+                    f"Warning: {len(native)} native extensions, the zipapp is only "
+                    f"portable to {sys.platform} with Python "
+                    f"{sys.version_info.major}.{sys.version_info.minor}"
+                )
+
+            TagCommand.status("Precompiling bytecode…")
+            # unchecked hashes: no source stat or recompile after extraction
+            compileall.compile_dir(
+                site,
+                quiet=1,
+                workers=0,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+
+            digest = hashlib.sha256()
+            for root, dirs, files in os.walk(site):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, site).encode())
+                    with open(path, "rb") as source:
+                        digest.update(source.read())
+            with open(os.path.join(build_dir, "BUILD_ID"), "w", encoding="utf-8") as f:
+                f.write(digest.hexdigest()[:16])
+            shutil.copy(
+                os.path.join(here, NAME, "bootstrap.py"),
+                os.path.join(build_dir, "__main__.py"),
+            )
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.output)), exist_ok=True)
+            zipapp.create_archive(
+                build_dir, self.output, interpreter=self.python, compressed=True
+            )
+        size = os.path.getsize(self.output) / (1 << 20)
+        TagCommand.status(f"Wrote {self.output} ({size:.1f} MB)")
+
+
 setup(
     name=NAME,
     version=pkg_vars.get("__version__"),
@@ -78,6 +157,7 @@ setup(
     entry_points={
         "console_scripts": [
             "zenith=zenith.__main__:main",
+            "zenith-client=zenith.client:main",
         ],
     },
     include_package_data=True,
@@ -89,5 +169,5 @@ setup(
         "Operating System :: OS Independent",
         "Topic :: Software Development :: Tools",
     ],
-    cmdclass={"push_tag": TagCommand},
+    cmdclass={"push_tag": TagCommand, "zipapp": ZipappCommand},
 )
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# zenith derives INSTALL_DIR from HOME when it is first imported, so point it at
+# a scratch directory before any test module imports zenith
+os.environ["HOME"] = tempfile.mkdtemp(prefix="zenith-tests-")
+
+# stands in for sherlock_project/sherlock.py, answering from the outcomes in
+# $SHERLOCK_OUTCOMES ({username: {site: outcome}}). Like the real tool, the
+# --csv report keeps only Claimed rows unless --print-all is passed.
+FAKE_SHERLOCK = """
+import argparse, csv, json, os
+
+parser = argparse.ArgumentParser()
+parser.add_argument("usernames", nargs="+")
+parser.add_argument("--csv", action="store_true")
+parser.add_argument("--print-all", action="store_true")
+parser.add_argument("--print-found", action="store_true", default=True)
+parser.add_argument("--site", action="append")
+parser.add_argument("--folderoutput", default=".")
+args = parser.parse_args()
+outcomes = json.loads(os.environ["SHERLOCK_OUTCOMES"])
+for username in args.usernames:
+    sites = outcomes.get(username, {})
+    rows = [
+        (site, outcome)
+        for site, outcome in sites.items()
+        if not args.site or site in args.site
+    ]
+    base = os.path.join(args.folderoutput, username)
+    with open(base + ".txt", "w") as found:
+        for site, outcome in rows:
+            if outcome == "Claimed":
+                found.write(f"https://{site}.example/{username}\\n")
+    if args.csv:
+        with open(base + ".csv", "w", newline="") as report:
+            writer = csv.writer(report)
+            writer.writerow(["username", "name", "url_main", "url_user", "exists",
+                             "http_status", "response_time_s"])
+            for site, outcome in rows:
+                if args.print_found and not args.print_all and outcome != "Claimed":
+                    continue
+                writer.writerow([username, site, f"https://{site}.example/",
+                                 f"https://{site}.example/{username}", outcome,
+                                 200, 0.25])
+    for site, outcome in rows:
+        if outcome == "Claimed":
+            print(f"[+] {site}: https://{site}.example/{username}")
+        elif args.print_all:
+            print(f"[-] {site}: Not Found!")
+"""
+
+# a route gets the query parameters and request headers and returns
+# (status, response headers, body); a non-bytes body is sent as JSON
+Route = Callable[[Dict[str, List[str]], Dict[str, str]], Tuple[int, Dict, object]]
+
+
+class StandIn:
+    """A local HTTP server answering from a route table and counting requests."""
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Route] = {}
+        self.hits: Counter = Counter()
+        self.headers: Dict[str, List[Dict[str, str]]] = {}
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                headers = dict(self.headers)
+                standin.hits[url.path] += 1
+                standin.headers.setdefault(url.path, []).append(headers)
+                route = standin.routes.get(url.path)
+                if route is None:
+                    status, response_headers, body = 404, {}, b""
+                else:
+                    status, response_headers, body = route(parse_qs(url.query), headers)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                    response_headers.setdefault("Content-Type", "application/json")
+                self.send_response(status)
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def route(self, path: str, route: Route) -> None:
+        self.routes[path] = route
+
+
+@pytest.fixture
+def results_db(tmp_path, monkeypatch) -> Iterator[str]:
+    """A results store of the test's own."""
+    from zenith.core import results
+
+    path = str(tmp_path / "results.db")
+    monkeypatch.setattr(results, "RESULTS_DB", path)
+    try:
+        yield path
+    finally:
+        results.disconnect(path)
+
+
+@pytest.fixture
+def fake_sherlock(tmp_path, monkeypatch, results_db):
+    """A SherlockRepo running FAKE_SHERLOCK; set outcomes with fake.outcomes()."""
+    from zenith.enumeration.sherlock import SherlockRepo
+
+    repo = SherlockRepo()
+    repo.full_path = str(tmp_path / "sherlock")
+    os.makedirs(os.path.join(repo.full_path, "sherlock_project"))
+    with open(
+        os.path.join(repo.full_path, "sherlock_project", "sherlock.py"), "w"
+    ) as script:
+        script.write(FAKE_SHERLOCK)
+    repo.outcomes = lambda outcomes: monkeypatch.setenv(
+        "SHERLOCK_OUTCOMES", json.dumps(outcomes)
+    )
+    return repo
+
+
+@pytest.fixture
+def standin() -> Iterator[StandIn]:
+    server = StandIn()
+    thread = threading.Thread(target=server.server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.server.shutdown()
+        server.server.server_close()
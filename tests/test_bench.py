@@ -0,0 +1,27 @@
+from zenith.core import bench
+
+
+def timing(min, median):
+    return {"rounds": 100, "min": min, "median": median, "mean": median}
+
+
+def test_microsecond_jitter_is_not_a_regression():
+    baseline = {"repo_installed": timing(22e-6, 23e-6)}
+
+    assert bench.compare({"repo_installed": timing(37e-6, 40e-6)}, baseline) == []
+
+
+def test_slower_minimum_beyond_tolerance_and_noise_regresses():
+    baseline = {"startup": timing(0.300, 0.320)}
+
+    assert bench.compare({"startup": timing(0.330, 0.500)}, baseline) == []
+    assert bench.compare({"startup": timing(0.400, 0.410)}, baseline) == ["startup"]
+
+
+def test_a_noisy_baseline_allows_more():
+    steady = {"render": timing(0.004, 0.0041)}
+    noisy = {"render": timing(0.004, 0.007)}
+    result = {"render": timing(0.0065, 0.007)}
+
+    assert bench.compare(result, steady) == ["render"]
+    assert bench.compare(result, noisy) == []
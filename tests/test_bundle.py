@@ -0,0 +1,87 @@
+import io
+import json
+import os
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+
+from zenith.core import bundle
+
+
+@pytest.fixture
+def install_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "install"
+    directory.mkdir()
+    monkeypatch.setattr(bundle, "INSTALL_DIR", str(directory))
+    return directory
+
+
+def make_bundle(tools, links=(), files=()):
+    manifest = {
+        "format": bundle.FORMAT_VERSION,
+        "tools": [
+            {"name": name, "dir": name, "install": None, "wheels": []} for name in tools
+        ],
+        "dirs": [name for name in tools if name],
+        "files": list(files),
+        "links": list(links),
+        "objects": 0,
+    }
+    output = io.BytesIO()
+    with tarfile.open(fileobj=output, mode="w|gz") as archive:
+        data = json.dumps(manifest).encode()
+        info = tarfile.TarInfo(bundle.MANIFEST_NAME)
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    output.seek(0)
+    return output
+
+
+def test_export_and_import_round_trip(tmp_path, install_dir):
+    tool_dir = tmp_path / "source" / "tool"
+    (tool_dir / "bin").mkdir(parents=True)
+    (tool_dir / "tool.py").write_text("print('hi')\n")
+    os.symlink("../tool.py", tool_dir / "bin" / "tool")
+    tool = SimpleNamespace(
+        full_path=str(tool_dir),
+        install_options=None,
+        deps_marker=str(tool_dir / ".zenith_deps_installed"),
+        __str__=lambda: "tool",
+    )
+    output = io.BytesIO()
+    bundle.export_bundle(output, [tool], wheels=False, compression="gz")
+    output.seek(0)
+
+    bundle.import_bundle(output)
+
+    assert (install_dir / "tool" / "bin" / "tool").read_text() == "print('hi')\n"
+
+
+@pytest.mark.parametrize("name", [".", "", "..", "a/b", ".wheels"])
+def test_tool_dir_must_be_a_plain_name(install_dir, name):
+    (install_dir / "keep").mkdir()
+
+    with pytest.raises(bundle.BundleError):
+        bundle.import_bundle(make_bundle([name]), force=True)
+
+    assert (install_dir / "keep").is_dir()
+
+
+@pytest.mark.parametrize(
+    "links",
+    [
+        [{"path": "tool/escape", "target": "/etc"}],
+        [{"path": "tool/escape", "target": "../../outside"}],
+        # tool/here/.. looks like tool, but here is tool itself
+        [
+            {"path": "tool/here", "target": "."},
+            {"path": "tool/escape", "target": "here/.."},
+        ],
+    ],
+)
+def test_links_must_stay_inside_the_tool(install_dir, links):
+    with pytest.raises(bundle.BundleError):
+        bundle.import_bundle(make_bundle(["tool"], links))
+
+    assert not (install_dir / "tool").exists()
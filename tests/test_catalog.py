@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from zenith.core import catalog
+
+PACK = {"tools": [{"name": "amass", "command": "amass {args}", "category": "recon"}]}
+
+
+@pytest.fixture
+def user_catalog(tmp_path, monkeypatch):
+    catalog_dir = tmp_path / "catalog"
+    catalog_dir.mkdir()
+    monkeypatch.setattr(catalog, "USER_CATALOG_DIR", str(catalog_dir))
+    monkeypatch.setattr(catalog, "INDEX_FILE", str(tmp_path / "index.json"))
+    monkeypatch.setattr(catalog, "_index", None)
+    monkeypatch.setattr(catalog, "_proxies", {})
+    return catalog_dir
+
+
+def names(index):
+    return {entry["name"] for entry in index["tools"]}
+
+
+def test_broken_pack_is_skipped(user_catalog, capsys):
+    (user_catalog / "broken.json").write_text(json.dumps(PACK)[:-5])
+    (user_catalog / "good.json").write_text(json.dumps(PACK))
+
+    index = catalog.get_index(rebuild=True)
+
+    assert {"sherlock", "decode", "amass"} <= names(index)
+    assert "Skipping tool catalog" in capsys.readouterr().out
+
+
+def test_pack_with_a_bad_entry_is_skipped_whole(user_catalog):
+    pack = {"tools": PACK["tools"] + [{"name": "no-command"}]}
+    (user_catalog / "pack.json").write_text(json.dumps(pack))
+
+    index = catalog.get_index(rebuild=True)
+
+    assert "sherlock" in names(index)
+    assert "amass" not in names(index)
+
+
+def test_fixing_a_broken_pack_rebuilds_the_index(user_catalog):
+    pack = user_catalog / "pack.json"
+    pack.write_text("{")
+    catalog.get_index(rebuild=True)
+    catalog.write_index(catalog.get_index())
+
+    written = pack.stat().st_mtime_ns
+    pack.write_text(json.dumps(PACK))
+    # coarse filesystem clocks could give the rewrite the same mtime
+    os.utime(pack, ns=(written + 10**9, written + 10**9))
+
+    assert catalog.read_index() is None
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+import pytest
+
+from zenith.core import cluster
+
+TOKEN = "test-token"
+# decode answers its two prompts from the job input and exits 0
+DECODE_JOB = {"tool": "decode", "input": ["aGVsbG8gd29ybGQ=", ""]}
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setattr(cluster, "HEARTBEAT_INTERVAL", 0.2)
+    monkeypatch.setattr(cluster, "POLL_INTERVAL", 0.1)
+    server = cluster.CoordinatorServer(
+        ("127.0.0.1", 0),
+        cluster.Coordinator(
+            TOKEN, results_path=str(tmp_path / "cluster.db"), worker_timeout=1.0
+        ),
+    )
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True
+    )
+    thread.start()
+    try:
+        yield server.server_address
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def call(address, op, **fields):
+    return cluster.request(address, {"op": op, "token": TOKEN, **fields})
+
+
+def start_worker(address, name):
+    worker = cluster.Worker(address, TOKEN, name)
+    worker.register()
+    for loop in (worker.heartbeat_loop, worker.job_loop):
+        threading.Thread(target=loop, daemon=True).start()
+    return worker
+
+
+def wait_for(address, done, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = call(address, "status")
+        if done(status):
+            return status
+        time.sleep(0.2)
+    pytest.fail(f"cluster did not finish: {status}")
+
+
+def test_jobs_of_a_dead_worker_are_requeued(coordinator):
+    for _ in range(3):
+        call(coordinator, "submit", **DECODE_JOB)
+    # a worker that takes a job and then stops sending heartbeats
+    dead = call(coordinator, "register", name="dead")["worker"]
+    leased = call(coordinator, "pull", worker=dead)["job"]
+
+    workers = [start_worker(coordinator, f"live{number}") for number in range(2)]
+    try:
+        status = wait_for(
+            coordinator,
+            lambda status: all(job["state"] == "done" for job in status["jobs"]),
+        )
+    finally:
+        for worker in workers:
+            worker.stopping.set()
+
+    jobs = {job["id"]: job for job in status["jobs"]}
+    assert jobs[leased["id"]]["attempts"] == 2
+    assert {job["worker"] for job in jobs.values()} <= {w.id for w in workers}
+    assert {job["exit_code"] for job in jobs.values()} == {0}
+    assert dead not in {worker["id"] for worker in status["workers"]}
+    # the dead worker's late result must not overwrite the re-run
+    with pytest.raises(cluster.ClusterError):
+        call(coordinator, "result", worker=dead, job=leased["id"], exit_code=1)
+
+
+def test_output_is_sent_before_the_pipe_closes():
+    worker = cluster.Worker(("127.0.0.1", 0))
+    sent = []
+    worker.call = lambda op, **fields: sent.append((time.monotonic(), fields["data"]))
+    read_fd, write_fd = os.pipe()
+    streamer = threading.Thread(target=worker.stream_output, args=({"id": 1}, read_fd))
+    streamer.start()
+
+    os.write(write_fd, b"early\n")
+    written = time.monotonic()
+    time.sleep(cluster.OUTPUT_FLUSH_INTERVAL * 3)
+    os.write(write_fd, b"late\n")
+    os.close(write_fd)
+    streamer.join(5)
+    os.close(read_fd)
+
+    assert [data for _, data in sent] == ["early\n", "late\n"]
+    assert sent[0][0] - written < cluster.OUTPUT_FLUSH_INTERVAL * 2
@@ -0,0 +1,30 @@
+import pytest
+
+from zenith.core import daemon
+
+
+@pytest.fixture
+def exiting(monkeypatch):
+    """Makes dispatch exit the way a command would, with the given code."""
+    import zenith.__main__
+
+    def dispatch_exiting(code):
+        def dispatch(args):
+            raise SystemExit(code)
+
+        monkeypatch.setattr(zenith.__main__, "dispatch", dispatch)
+
+    return dispatch_exiting
+
+
+@pytest.mark.parametrize("code, status", [(None, 0), (0, 0), (3, 3), ("bad", 1)])
+def test_system_exit_maps_like_the_interpreter(exiting, capsys, code, status):
+    exiting(code)
+
+    assert daemon.run_command(["tools"]) == status
+    if isinstance(code, str):
+        assert capsys.readouterr().err == "bad\n"
+
+
+def test_argument_errors_keep_their_status(capsys):
+    assert daemon.run_command(["tools", "--no-such-flag"]) == 2
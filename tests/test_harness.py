@@ -0,0 +1,24 @@
+import os
+
+from zenith.core import repo as repo_module
+from zenith.core.harness import InstallHarness, RequirementsRepo
+
+
+def test_install_runs_pip_on_the_requirements_file():
+    install_dir = repo_module.INSTALL_DIR
+    with InstallHarness() as harness:
+        repo = harness.tool(RequirementsRepo)
+        harness.install(repo)
+
+        calls = harness.calls()
+        stub_package = os.path.join(
+            harness.site_dir, "zenith_harness_requirements_tool_dep.py"
+        )
+        assert os.path.exists(stub_package)
+
+    pip_calls = [call for call in calls if call.startswith("pip ")]
+    assert pip_calls and all("requirements.txt" in call for call in pip_calls)
+    assert not any(call.startswith("sudo ") for call in calls)
+    # everything the harness patched is put back on exit
+    assert repo_module.INSTALL_DIR == install_dir
+    assert "ZENITH_HARNESS_LOG" not in os.environ
@@ -0,0 +1,106 @@
+import pytest
+
+from zenith.core.http import Session
+
+
+@pytest.fixture
+def session(tmp_path):
+    return Session(cache_dir=str(tmp_path / "http"), retries=2, backoff=0, ttl=0)
+
+
+def etag_route(version):
+    def route(query, headers):
+        etag = f'"{version[0]}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, {"version": version[0]}
+
+    return route
+
+
+def test_unchanged_resource_is_revalidated_with_etag(session, standin):
+    standin.route("/item", etag_route(["v1"]))
+
+    first = session.get(f"{standin.url}/item")
+    second = session.get(f"{standin.url}/item")
+
+    assert first.json() == second.json() == {"version": "v1"}
+    assert not first.from_cache
+    assert second.from_cache
+    assert standin.hits["/item"] == 2
+    assert standin.headers["/item"][1]["If-None-Match"] == '"v1"'
+
+
+def test_changed_resource_replaces_the_cached_one(session, standin):
+    version = ["v1"]
+    standin.route("/item", etag_route(version))
+    session.get(f"{standin.url}/item")
+
+    version[0] = "v2"
+    response = session.get(f"{standin.url}/item")
+
+    assert response.json() == {"version": "v2"}
+    assert not response.from_cache
+    assert session.get(f"{standin.url}/item").json() == {"version": "v2"}
+
+
+def test_fresh_entries_skip_the_network(tmp_path, standin):
+    session = Session(cache_dir=str(tmp_path / "http"), ttl=300)
+    standin.route("/item", etag_route(["v1"]))
+
+    session.get(f"{standin.url}/item")
+    response = session.get(f"{standin.url}/item")
+
+    assert response.from_cache
+    assert standin.hits["/item"] == 1
+
+
+def test_max_age_overrides_ttl(tmp_path, standin):
+    session = Session(cache_dir=str(tmp_path / "http"), ttl=300)
+    standin.route(
+        "/item", lambda query, headers: (200, {"Cache-Control": "no-cache"}, {})
+    )
+
+    session.get(f"{standin.url}/item")
+    session.get(f"{standin.url}/item")
+
+    assert standin.hits["/item"] == 2
+
+
+def test_server_errors_are_retried(session, standin):
+    def flaky(query, headers):
+        if standin.hits["/flaky"] == 1:
+            return 503, {}, b""
+        return 200, {}, {"ok": True}
+
+    standin.route("/flaky", flaky)
+
+    assert session.get_json(f"{standin.url}/flaky") == {"ok": True}
+    assert standin.hits["/flaky"] == 2
+
+
+def test_paginate_follows_next_links(session, standin):
+    def pages(query, headers):
+        page = int(query.get("page", ["1"])[0])
+        links = {}
+        if page < 3:
+            links["Link"] = f'<{standin.url}/items?page={page + 1}>; rel="next"'
+        return 200, links, [f"item{page}a", f"item{page}b"]
+
+    standin.route("/items", pages)
+
+    items = list(session.paginate(f"{standin.url}/items"))
+
+    assert items == ["item1a", "item1b", "item2a", "item2b", "item3a", "item3b"]
+    assert standin.hits["/items"] == 3
+
+
+def test_without_cache_dir_nothing_is_cached(standin):
+    session = Session(cache_dir=None, ttl=300)
+    standin.route("/item", etag_route(["v1"]))
+
+    session.get(f"{standin.url}/item")
+    session.get(f"{standin.url}/item")
+
+    assert standin.hits["/item"] == 2
+    assert "If-None-Match" not in standin.headers["/item"][1]
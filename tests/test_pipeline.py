@@ -0,0 +1,77 @@
+import time
+from argparse import Namespace
+
+import pytest
+
+from zenith.core import pipeline
+from zenith.core.pipeline import Pipeline, Stage
+
+ITEMS = 10
+
+
+def sleeper(seconds):
+    def stage(item):
+        time.sleep(seconds)
+        return [item]
+
+    return stage
+
+
+def test_stages_overlap():
+    delays = [0.02, 0.1, 0.02]
+    stages = [
+        Stage(f"stage{index}", sleeper(delay)) for index, delay in enumerate(delays)
+    ]
+
+    started = time.perf_counter()
+    stats = Pipeline(stages, queue_size=4).run(range(ITEMS))
+    elapsed = time.perf_counter() - started
+
+    assert [stage.emitted for stage in stats] == [ITEMS] * len(stages)
+    # the slowest stage sets the pace; the others only add one item each
+    assert elapsed < ITEMS * max(delays) + sum(delays) + 0.3
+    assert elapsed < ITEMS * sum(delays) * 0.8
+    # the last stage emits before the first one has finished
+    assert stats[-1].first_output < stats[0].finished
+
+
+def test_queue_bound_holds_back_fast_stages():
+    queue_size = 2
+    produced, backlog = [0], []
+
+    def fast(item):
+        produced[0] += 1
+        return [item]
+
+    def slow(item):
+        # items the fast stage has produced that this one has not started yet
+        backlog.append(produced[0] - item - 1)
+        time.sleep(0.01)
+        return [item]
+
+    stats = Pipeline(
+        [Stage("fast", fast, threaded=False), Stage("slow", slow)], queue_size
+    ).run(range(50))
+
+    assert stats[1].received == 50
+    # the queue plus the one item blocked on putting into it
+    assert max(backlog) <= queue_size + 1
+
+
+@pytest.mark.parametrize("value", ["80,abc", "70000", "0", "90-80", "1-x", ","])
+def test_invalid_ports_are_rejected(value):
+    with pytest.raises(ValueError):
+        pipeline.parse_ports(value)
+
+
+def test_parse_ports():
+    assert pipeline.parse_ports("443, 80,79-81") == [79, 80, 81, 443]
+
+
+def test_command_reports_invalid_ports(capsys):
+    args = Namespace(
+        domains=["example.com"], sources=None, ports="80,abc", no_scan=False
+    )
+
+    assert pipeline.command(args) == 1
+    assert "Invalid port or range: abc" in capsys.readouterr().out
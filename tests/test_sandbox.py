@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+resource = pytest.importorskip("resource")
+
+PRINT_LIMITS = (
+    "import resource; "
+    "print(resource.getrlimit(resource.RLIMIT_AS)[0], "
+    "resource.getrlimit(resource.RLIMIT_NOFILE)[0])"
+)
+
+
+def launch(**spec) -> list:
+    spec = {"limits": {"memory_mb": 512, "max_files": 64}, "cgroup": None, **spec}
+    output = subprocess.run(
+        [sys.executable, "-m", "zenith.core.sandbox", json.dumps(spec), "--"]
+        + [sys.executable, "-c", PRINT_LIMITS],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return [int(value) for value in output.split()]
+
+
+def test_rlimits_cap_address_space_without_a_group():
+    assert launch() == [512 * 1024 * 1024, 64]
+
+
+def test_scope_leaves_memory_to_systemd():
+    address_space, files = launch(scope=True)
+
+    # inherited unchanged from this process
+    assert address_space == resource.getrlimit(resource.RLIMIT_AS)[0]
+    assert files == 64
+
+
+def test_unjoinable_cgroup_falls_back_to_rlimits(tmp_path):
+    assert launch(cgroup=str(tmp_path / "missing")) == [512 * 1024 * 1024, 64]
@@ -0,0 +1,62 @@
+from zenith.enumeration import sites
+
+# the header and row layout of a real `sherlock --csv --print-all` report
+REPORT = """\
+username,name,url_main,url_user,exists,http_status,response_time_s
+alice,GitHub,https://www.github.com/,https://www.github.com/alice,Claimed,200,0.41
+alice,GitLab,https://gitlab.com/,https://gitlab.com/alice,Available,404,0.38
+alice,Flickr,https://www.flickr.com/,https://www.flickr.com/people/alice,Unknown,,
+alice,Reddit,https://www.reddit.com/,https://www.reddit.com/user/alice,WAF,403,2.5
+"""
+
+
+def test_read_probes_keeps_every_outcome(tmp_path):
+    report = tmp_path / "alice.csv"
+    report.write_text(REPORT)
+
+    assert sites.read_probes(str(report)) == [
+        ("GitHub", "Claimed", 0.41),
+        ("GitLab", "Available", 0.38),
+        ("Flickr", "Unknown", None),
+        ("Reddit", "WAF", 2.5),
+    ]
+
+
+def test_failures_count_towards_failure_rate(tmp_path, results_db):
+    report = tmp_path / "alice.csv"
+    report.write_text(REPORT)
+    for _ in range(5):
+        sites.record(sites.read_probes(str(report)))
+
+    stats = sites.site_stats()
+
+    assert stats["Flickr"].failure_rate == 1
+    assert stats["Reddit"].failure_rate == 1
+    assert stats["GitLab"].failure_rate == 0
+    assert stats["GitLab"].p95 == 0.38
+    limits = sites.Thresholds(0.5, 10, 5, 50)
+    allowed, skipped = sites.plan(["GitHub", "GitLab", "Flickr", "Reddit"], limits)
+    assert allowed == ["GitHub", "GitLab"]
+    assert set(skipped) == {"Flickr", "Reddit"}
+
+
+def test_search_batch_records_sites_without_accounts(tmp_path, fake_sherlock):
+    fake_sherlock.outcomes(
+        {"alice": {"GitHub": "Claimed", "GitLab": "Available", "Flickr": "Unknown"}}
+    )
+
+    found = fake_sherlock.search_batch(["alice"], str(tmp_path))
+
+    assert found == {"alice": ["https://GitHub.example/alice"]}
+    assert sorted(sites.site_stats()) == ["Flickr", "GitHub", "GitLab"]
+
+
+def test_search_echoes_only_found_sites(fake_sherlock, capfd):
+    fake_sherlock.outcomes({"alice": {"GitHub": "Claimed", "GitLab": "Available"}})
+
+    returncode = fake_sherlock.run_echoing_found(
+        fake_sherlock.command(["alice"]) + ["--folderoutput", fake_sherlock.full_path]
+    )
+
+    assert returncode == 0
+    assert capfd.readouterr().out == "[+] GitHub: https://GitHub.example/alice\n"
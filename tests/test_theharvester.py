@@ -0,0 +1,119 @@
+import json
+import os
+import time
+
+import pytest
+
+from zenith.enumeration import theHarvester
+
+# stands in for theHarvester.py: asks the local server for one source's
+# results and writes them where `-f` says, as the real tool does
+FAKE_HARVESTER = """
+import argparse, json, os, sys, urllib.error, urllib.request
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-d")
+parser.add_argument("-b")
+parser.add_argument("-f")
+args = parser.parse_args()
+url = f"{os.environ['HARVESTER_STANDIN']}/{args.b}?domain={args.d}"
+try:
+    with urllib.request.urlopen(url) as response:
+        data = json.load(response)
+except urllib.error.HTTPError:
+    sys.exit(1)
+with open(f"{args.f}.json", "w") as output:
+    json.dump(data, output)
+"""
+
+
+@pytest.fixture
+def harvester(tmp_path, monkeypatch, standin):
+    monkeypatch.setattr(theHarvester, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("HARVESTER_STANDIN", standin.url)
+    repo = theHarvester.TheHarvesterRepo()
+    repo.full_path = str(tmp_path / "theHarvester")
+    os.makedirs(repo.full_path)
+    with open(os.path.join(repo.full_path, "theHarvester.py"), "w") as script:
+        script.write(FAKE_HARVESTER)
+    return repo
+
+
+def source_results(hosts):
+    return lambda query, headers: (
+        200,
+        {},
+        {"emails": ["Admin@Example.com"], "hosts": hosts, "ips": []},
+    )
+
+
+def test_query_parses_results(harvester, standin):
+    standin.route("/crtsh", source_results(["www.example.com:192.0.2.1"]))
+
+    results = harvester.query("example.com", "crtsh")
+
+    assert results == {
+        "emails": ["admin@example.com"],
+        "hosts": ["www.example.com"],
+        "ips": ["192.0.2.1"],
+    }
+
+
+def test_cache_is_per_source(harvester, standin):
+    standin.route("/crtsh", source_results(["a.example.com"]))
+    standin.route("/otx", source_results(["b.example.com"]))
+
+    first = harvester.query("example.com", "crtsh", ttl=3600)
+    again = harvester.query("example.com", "crtsh", ttl=3600)
+    other = harvester.query("example.com", "otx", ttl=3600)
+
+    assert first == again
+    assert other["hosts"] == ["b.example.com"]
+    assert standin.hits["/crtsh"] == 1
+    assert standin.hits["/otx"] == 1
+
+
+def test_expired_cache_is_queried_again(harvester, standin):
+    standin.route("/crtsh", source_results(["a.example.com"]))
+    harvester.query("example.com", "crtsh", ttl=60)
+
+    stale = time.time() - 120
+    os.utime(theHarvester.cache_path("example.com", "crtsh"), (stale, stale))
+    harvester.query("example.com", "crtsh", ttl=60)
+
+    assert standin.hits["/crtsh"] == 2
+
+
+def test_no_ttl_bypasses_the_cache(harvester, standin):
+    standin.route("/crtsh", source_results(["a.example.com"]))
+
+    harvester.query("example.com", "crtsh", ttl=3600)
+    harvester.query("example.com", "crtsh")
+
+    assert standin.hits["/crtsh"] == 2
+
+
+def test_failed_source_is_not_cached(harvester, standin):
+    standin.route("/otx", lambda query, headers: (500, {}, b""))
+
+    assert harvester.query("example.com", "otx", ttl=3600) == {
+        "emails": [],
+        "hosts": [],
+        "ips": [],
+    }
+    harvester.query("example.com", "otx", ttl=3600)
+
+    assert standin.hits["/otx"] == 2
+    assert not os.path.exists(theHarvester.cache_path("example.com", "otx"))
+
+
+def test_harvest_merges_sources(harvester, standin):
+    standin.route("/crtsh", source_results(["a.example.com", "b.example.com"]))
+    standin.route("/otx", source_results(["b.example.com", "c.example.com"]))
+
+    results = harvester.harvest("example.com", ["crtsh", "otx"], ttl=3600)
+
+    assert results["hosts"] == ["a.example.com", "b.example.com", "c.example.com"]
+    assert results["emails"] == ["admin@example.com"]
+    with open(theHarvester.cache_path("example.com", "otx")) as cached:
+        assert json.load(cached)["hosts"] == ["b.example.com", "c.example.com"]
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from zenith.core import watch
+from zenith.enumeration import sherlock as sherlock_module
+
+
+@pytest.fixture
+def watched_sherlock(fake_sherlock, monkeypatch):
+    monkeypatch.setattr(sherlock_module, "sherlock", fake_sherlock)
+    return fake_sherlock
+
+
+def test_available_rows_remove_accounts(tmp_path):
+    report = tmp_path / "alice.csv"
+    report.write_text(
+        "username,name,url_main,url_user,exists,http_status,response_time_s\n"
+        "alice,GitHub,https://github.com/,https://github.com/alice,Available,404,0.4\n"
+        "alice,GitLab,https://gitlab.com/,https://gitlab.com/alice,Unknown,,\n"
+    )
+    snapshot = json.dumps(["https://github.com/alice", "https://gitlab.com/alice"])
+
+    added, removed, current = watch.diff(snapshot, watch.read_outcomes(str(report)))
+
+    # an errored site says nothing, so only the Available one is gone
+    assert (added, removed) == ([], ["https://github.com/alice"])
+    assert json.loads(current) == {"https://gitlab.com/alice": 0}
+
+
+def test_run_due_reports_a_closed_account(watched_sherlock, results_db):
+    job = watch.Job("sherlock", "alice")
+    watched_sherlock.outcomes({"alice": {"GitHub": "Claimed", "GitLab": "Claimed"}})
+    watch.schedule([job], 0.0)
+
+    ran, changes = watch.run_due({job: (0.0, None)}, 1.0)
+    assert (ran, changes) == (1, [])
+
+    snapshot = watch.schedule([job], 1.0)[job][1]
+    watched_sherlock.outcomes({"alice": {"GitHub": "Claimed", "GitLab": "Available"}})
+    ran, changes = watch.run_due({job: (0.0, snapshot)}, 2.0)
+
+    assert changes == [watch.Change(job, [], ["https://GitLab.example/alice"])]
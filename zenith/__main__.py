@@ -1,12 +1,20 @@
+import sys
+
+from zenith.core.profiling import start_from_argv
+
+# profile zenith's own imports too when --profile is passed
+start_from_argv(sys.argv)
+
+# isort: split
+
 import argparse
+import importlib
 import platform
-import sys
-from random import choice
-from socket import gethostbyname
+from typing import List, Optional
 
-import pyfiglet
 from rich.align import Align
 
+import zenith.core.profiling
 import zenith.core.utilities
 import zenith.enumeration
 import zenith.network
@@ -178,6 +186,9 @@ def info():
 
 
 def interactive():
+    import zenith.core.cache
+
+    zenith.core.cache.maybe_prune()
     try:
         while True:
             set_readline(commands)
@@ -188,12 +199,96 @@ def interactive():
         sys.exit(0)
 
 
-def main():
+# subcommand -> module whose add_parser defines it; only the module of the
+# command being run is imported, so `zenith decode` doesn't pay for git or asyncio
+SUBCOMMANDS = {
+    "decode": "zenith.core.encoding",
+    "encode": "zenith.core.encoding",
+    "transform": "zenith.obfuscation.transforms",
+    "search": "zenith.core.results",
+    "bench": "zenith.core.bench",
+    "daemon": "zenith.core.daemon",
+    "coordinator": "zenith.core.cluster",
+    "worker": "zenith.core.cluster",
+    "submit": "zenith.core.cluster",
+    "run": "zenith.core.cluster",
+    "tools": "zenith.core.catalog",
+    "pipeline": "zenith.core.pipeline",
+    "cache": "zenith.core.cache",
+    "bundle": "zenith.core.bundle",
+    "variants": "zenith.enumeration.variants",
+    "watch": "zenith.core.watch",
+}
+
+
+def subcommand_modules(argv: Optional[List[str]]) -> List[str]:
+    """The module of the command in argv, or all of them for help and menus."""
+    everything = list(dict.fromkeys(SUBCOMMANDS.values()))
+    if argv is None:
+        return everything
+    # the first word is only known to be the command if no option came before it
+    if argv and argv[0] in SUBCOMMANDS:
+        return [SUBCOMMANDS[argv[0]]]
+    if "-h" in argv or "--help" in argv:
+        return everything
+    if not any(not arg.startswith("-") for arg in argv):
+        # the menu, --info, --stats and the like need no subcommands
+        return []
+    return everything
+
+
+def build_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """The CLI parser; with argv, only the subcommand it names is loaded."""
     parser = argparse.ArgumentParser(description="A Modular Framework")
     parser.add_argument("-i", "--info", action="store_true", help="gets zenith info")
     parser.add_argument("-s", "--suggest", action="store_true", help="suggest a tool")
-    args = parser.parse_args()
-    if args.info:
+    parser.add_argument(
+        "--stats", action="store_true", help="show per-tool runtime stats"
+    )
+    parser.add_argument(
+        "--prometheus",
+        metavar="PATH",
+        help="with --stats, also write a Prometheus textfile",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="write a cProfile dump (snakeviz) and an import time report",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        nargs="?",
+        const="",
+        help="resume an interrupted batch run (without an id, list them)",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    for module in subcommand_modules(argv):
+        importlib.import_module(module).add_parser(subparsers)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser(argv).parse_args(argv)
+    if args.profile:
+        with zenith.core.profiling.profile(args.profile):
+            return dispatch(args)
+    return dispatch(args)
+
+
+def dispatch(args):
+    if args.command:
+        return args.func(args)
+    if args.stats:
+        import zenith.core.metrics
+
+        zenith.core.metrics.print_stats(args.prometheus)
+    elif args.resume is not None:
+        import zenith.core.journal
+
+        return zenith.core.journal.resume(args.resume)
+    elif args.info:
         info()
     elif args.suggest:
         zenith.core.utilities.suggest_tool()
@@ -202,4 +297,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional
+
+# stdlib only: this file becomes the __main__.py of the zipapp built by
+# `python setup.py zipapp` and runs before the bundled packages are importable
+BUILD_ID_FILE = "BUILD_ID"
+SITE_DIR = "site"
+COMPLETE_MARKER = ".complete"
+# where the running zipapp's packages are, for subprocesses that run zenith
+SITE_ENV = "ZENITH_SITE"
+
+
+def cache_root() -> str:
+    if os.environ.get("ZENITH_ZIPAPP_CACHE"):
+        return os.environ["ZENITH_ZIPAPP_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(str(Path.home()), ".cache")
+    return os.path.join(base, "zenith", "zipapp")
+
+
+def extract(archive: str) -> str:
+    """Unpacks the bundled site directory once per build and returns its path."""
+    with zipfile.ZipFile(archive) as bundle:
+        build_id = bundle.read(BUILD_ID_FILE).decode().strip()
+        target = os.path.join(cache_root(), build_id)
+        if os.path.exists(os.path.join(target, COMPLETE_MARKER)):
+            return target
+        os.makedirs(cache_root(), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=cache_root(), prefix=f".{build_id}-")
+        try:
+            prefix = f"{SITE_DIR}/"
+            bundle.extractall(
+                tmp_dir, [name for name in bundle.namelist() if name.startswith(prefix)]
+            )
+            site = os.path.join(tmp_dir, SITE_DIR)
+            with open(os.path.join(site, COMPLETE_MARKER), "w", encoding="utf-8"):
+                pass
+            try:
+                os.rename(site, target)
+            except OSError:
+                # another process extracted the same build first
+                if not os.path.exists(os.path.join(target, COMPLETE_MARKER)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return target
+
+
+def python_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """env, or os.environ, for a Python subprocess that imports zenith itself.
+
+    Under the zipapp this puts the bundled packages on PYTHONPATH. Tools get
+    the plain environment, so the bundled packages never shadow their own.
+    """
+    env = dict(os.environ if env is None else env)
+    site = os.environ.get(SITE_ENV)
+    if site:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [site, env.get("PYTHONPATH")]))
+    return env
+
+
+def main() -> None:
+    # inside the zipapp __file__ is <archive>/__main__.py
+    site = extract(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, site)
+    os.environ[SITE_ENV] = site
+
+    from zenith.__main__ import main as zenith_main
+
+    sys.exit(zenith_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+from pathlib import Path
+
+# stdlib only: the client runs on every call while the daemon stays warm
+SOCKET_PATH = os.path.join(str(Path.home()), ".zenith", "daemon.sock")
+HEADER = struct.Struct(">cI")
+CHUNK_SIZE = 1 << 16
+
+OUTPUT = b"o"
+ERROR = b"r"
+INPUT = b"i"
+INPUT_EOF = b"e"
+EXIT = b"x"
+
+
+def send_frame(sock: socket.socket, kind: bytes, payload: bytes = b"") -> None:
+    sock.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("zenith daemon closed the connection")
+        data += chunk
+    return data
+
+
+def recv_frame(sock: socket.socket) -> tuple[bytes, bytes]:
+    kind, size = HEADER.unpack(recv_exact(sock, HEADER.size))
+    return kind, recv_exact(sock, size)
+
+
+def forward_stdin(sock: socket.socket) -> None:
+    try:
+        while chunk := os.read(sys.stdin.fileno(), CHUNK_SIZE):
+            send_frame(sock, INPUT, chunk)
+        send_frame(sock, INPUT_EOF)
+    except OSError:
+        pass
+
+
+def run(argv: list[str], socket_path: str = SOCKET_PATH) -> int:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    try:
+        size = (
+            os.get_terminal_size(sys.stdout.fileno()) if sys.stdout.isatty() else None
+        )
+    except OSError:
+        size = None
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "columns": size.columns if size else None,
+        "stdin": not sys.stdin.isatty(),
+    }
+    sock.sendall(json.dumps(request).encode() + b"\n")
+    if request["stdin"]:
+        threading.Thread(target=forward_stdin, args=(sock,), daemon=True).start()
+    streams = {OUTPUT: sys.stdout.buffer, ERROR: sys.stderr.buffer}
+    try:
+        while True:
+            kind, payload = recv_frame(sock)
+            if kind in streams:
+                streams[kind].write(payload)
+                streams[kind].flush()
+            elif kind == EXIT:
+                return int(payload)
+    except ConnectionError as error:
+        print(f"zenith-client: {error}", file=sys.stderr)
+        return 1
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    socket_path = os.environ.get("ZENITH_SOCKET", SOCKET_PATH)
+    try:
+        return run(argv, socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # no daemon running: fall back to a regular in-process invocation
+        os.execv(sys.executable, [sys.executable, "-m", "zenith", *argv])
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+import builtins
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from zenith.bootstrap import python_env
+from zenith.core.config import INSTALL_DIR
+
+# the committed baseline in a source checkout, else one kept in INSTALL_DIR
+REPO_BASELINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "benchmarks",
+    "baseline.json",
+)
+BASELINE_FILE = (
+    REPO_BASELINE
+    if os.path.exists(REPO_BASELINE)
+    else os.path.join(INSTALL_DIR, "bench_baseline.json")
+)
+# built with `python setup.py zipapp`; the zipapp benchmarks skip without it
+ZIPAPP = os.environ.get("ZENITH_ZIPAPP") or os.path.join("dist", "zenith.pyz")
+DEFAULT_TOLERANCE = 0.25
+# timer and scheduler jitter; slowdowns smaller than this are never regressions
+NOISE_FLOOR = 50e-6
+
+# benchmarks ship in zenith rather than tests/ so `zenith bench` can time an
+# installed copy or the zipapp on the host whose numbers matter
+
+# a setup function returns the callable to time, or yields it to clean up afterwards;
+# returning None skips the benchmark, e.g. when an optional artifact is missing
+Benchmark = Callable[[], object]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """Registers a setup function returning the callable to time."""
+
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@contextmanager
+def scratch_install_dir() -> Iterator[str]:
+    """Points config and every store derived from INSTALL_DIR at a throwaway one.
+
+    Modules computing paths at import time (metrics, results, status, the
+    catalog index, caches, ...) have each such module-level path redirected;
+    modules imported later pick up the patched INSTALL_DIR themselves.
+    """
+    from unittest import mock
+
+    import zenith.core.catalog
+    import zenith.core.config
+    import zenith.core.hosts
+    import zenith.core.metrics
+    import zenith.core.results
+    import zenith.core.status
+    import zenith.core.usernames
+
+    install_dir = zenith.core.config.INSTALL_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir, ExitStack() as stack:
+        stack.enter_context(
+            mock.patch.multiple(
+                zenith.core.config,
+                INSTALL_DIR=tmp_dir,
+                CONFIG_FILE=os.path.join(tmp_dir, "zenith.cfg"),
+            )
+        )
+        for name, module in list(sys.modules.items()):
+            if not name.startswith("zenith.") or module is zenith.core.config:
+                continue
+            for attribute, value in list(vars(module).items()):
+                if isinstance(value, str) and (
+                    value == install_dir or value.startswith(install_dir + os.sep)
+                ):
+                    scratch_path = tmp_dir + value[len(install_dir) :]
+                    stack.enter_context(
+                        mock.patch.object(module, attribute, scratch_path)
+                    )
+        # ZENITH_RESULTS_DB may point the store outside INSTALL_DIR
+        results_db = os.path.join(tmp_dir, "results.db")
+        stack.enter_context(
+            mock.patch.object(zenith.core.results, "RESULTS_DB", results_db)
+        )
+        # objects that captured a path when they were created
+        stack.enter_context(
+            mock.patch.object(
+                zenith.core.status,
+                "_cache",
+                zenith.core.status.StatusCache(os.path.join(tmp_dir, "status.json")),
+            )
+        )
+        stack.enter_context(mock.patch.object(zenith.core.catalog, "_index", None))
+        stack.enter_context(mock.patch.dict(zenith.core.catalog._proxies, clear=True))
+        if "zenith.core.http" in sys.modules:
+            stack.enter_context(
+                mock.patch.object(sys.modules["zenith.core.http"], "_session", None)
+            )
+        stack.callback(zenith.core.results.disconnect, results_db)
+        yield tmp_dir
+
+
+@benchmark("import_main")
+def bench_import_main():
+    command = [sys.executable, "-c", "import zenith.__main__"]
+    env = python_env(dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    return lambda: subprocess.run(command, check=True, env=env)
+
+
+def startup(command: List[str], **env: str) -> Callable[[], object]:
+    """Times `zenith --help`, which imports every subcommand module."""
+    import zenith.core.config
+
+    # run the child against the scratch install dir, not the real ~/.zenith
+    env = dict(os.environ, HOME=zenith.core.config.INSTALL_DIR, **env)
+    return lambda: subprocess.run(
+        command + ["--help"], check=True, env=env, stdout=subprocess.DEVNULL
+    )
+
+
+@benchmark("startup_installed")
+def bench_startup_installed():
+    return startup([sys.executable, "-m", "zenith"], **python_env({}))
+
+
+@benchmark("startup_installed_cold")
+def bench_startup_installed_cold():
+    # a fresh bytecode cache per round, like the first run after a plain copy
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rounds = iter(range(sys.maxsize))
+        yield lambda: startup(
+            [sys.executable, "-m", "zenith"],
+            PYTHONPYCACHEPREFIX=os.path.join(tmp_dir, str(next(rounds))),
+            **python_env({}),
+        )()
+
+
+@benchmark("startup_zipapp")
+def bench_startup_zipapp():
+    if not os.path.exists(ZIPAPP):
+        yield None
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield startup([sys.executable, ZIPAPP], ZENITH_ZIPAPP_CACHE=tmp_dir)
+
+
+@benchmark("startup_zipapp_cold")
+def bench_startup_zipapp_cold():
+    if not os.path.exists(ZIPAPP):
+        yield None
+        return
+    # a fresh extraction cache per round, like the first run on a new host
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rounds = iter(range(sys.maxsize))
+        yield lambda: startup(
+            [sys.executable, ZIPAPP],
+            ZENITH_ZIPAPP_CACHE=os.path.join(tmp_dir, str(next(rounds))),
+        )()
+
+
+@benchmark("config_roundtrip")
+def bench_config_roundtrip():
+    from zenith.core.config import get_config, write_config
+
+    return lambda: write_config(get_config())
+
+
+@benchmark("print_menu_items")
+def bench_print_menu_items():
+    from zenith.__main__ import print_menu_items
+    from zenith.console import console
+
+    def render():
+        with console.capture():
+            print_menu_items()
+
+    return render
+
+
+@benchmark("tools_cli_render")
+def bench_tools_cli_render():
+    from unittest import mock
+
+    import zenith.enumeration
+    from zenith.console import console
+    from zenith.core.menu import tools_cli
+
+    def render():
+        with console.capture(), mock.patch.object(builtins, "input", lambda _: "back"):
+            tools_cli("zenith.enumeration.cli", zenith.enumeration.__tools__)
+
+    return render
+
+
+@benchmark("completer_10k")
+def bench_completer():
+    from zenith.core.menu import CommandCompleter
+
+    completer = CommandCompleter(f"tool_{index}" for index in range(10000))
+    return lambda: completer.complete("tool_99", 0)
+
+
+@benchmark("hosts_add_get_10k")
+def bench_hosts():
+    from zenith.core import hosts
+
+    for index in range(10000):
+        hosts.add_host(f"host{index}.example.com")
+
+    def add_and_get():
+        hosts.add_host("new.example.com")
+        return hosts.get_hosts()
+
+    return add_and_get
+
+
+@benchmark("repo_installed")
+def bench_repo_installed():
+    from zenith.core.config import INSTALL_DIR as install_dir
+    from zenith.core.repo import GitHubRepo
+
+    class BenchRepo(GitHubRepo):
+        def run(self) -> int:
+            return 0
+
+    repo = BenchRepo(path="bench/benchrepo", install={"pip": "requirements.txt"})
+    repo.full_path = os.path.join(install_dir, repo.name)
+    repo.deps_marker = os.path.join(repo.full_path, ".zenith_deps_installed")
+    os.makedirs(repo.full_path)
+    with open(repo.deps_marker, "w", encoding="utf-8") as marker:
+        marker.write("bench\n")
+    return repo.installed
+
+
+@benchmark("candidates_10k_words")
+def bench_candidates():
+    from zenith.passwords.candidates import generate
+
+    words = [f"word{index}" for index in range(10000)]
+
+    def run():
+        with open(os.devnull, "wb") as devnull:
+            return generate(words, devnull, workers=2)
+
+    return run
+
+
+@benchmark("install_cold")
+def bench_install_cold():
+    from zenith.core.harness import SCENARIO_REPOS, InstallHarness, registered_repos
+
+    with InstallHarness() as harness:
+        repo_classes = registered_repos() + SCENARIO_REPOS
+        repos = [harness.tool(repo_class) for repo_class in repo_classes]
+        yield lambda: [harness.install(repo) for repo in repos]
+
+
+@benchmark("install_warm")
+def bench_install_warm():
+    from zenith.core.harness import SCENARIO_REPOS, InstallHarness, registered_repos
+
+    with InstallHarness() as harness:
+        repo_classes = registered_repos() + SCENARIO_REPOS
+        repos = [harness.tool(repo_class) for repo_class in repo_classes]
+        for repo in repos:
+            harness.install(repo)
+        yield lambda: [harness.install(repo, fresh=False) for repo in repos]
+
+
+def time_benchmark(
+    setup: Benchmark, min_rounds: int = 5, min_time: float = 0.5
+) -> Optional[Dict[str, float]]:
+    if inspect.isgeneratorfunction(setup):
+        context = contextmanager(setup)()
+    else:
+        context = nullcontext(setup())
+    timings: List[float] = []
+    with context as function:
+        if function is None:
+            return None
+        function()  # warm-up
+        deadline = time.perf_counter() + min_time
+        while len(timings) < min_rounds or time.perf_counter() < deadline:
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+            if len(timings) >= 1000:
+                break
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names or list(BENCHMARKS):
+        with scratch_install_dir():
+            result = time_benchmark(BENCHMARKS[name])
+        if result is not None:
+            results[name] = result
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Benchmarks whose fastest round got slower than the baseline's allows.
+
+    Minimums are compared since noise only ever adds time. On top of the
+    tolerance a benchmark may slow down by its baseline's own spread between
+    fastest and median round, and always by NOISE_FLOOR.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        noise = max(NOISE_FLOOR, base["median"] - base["min"])
+        if result["min"] - base["min"] > base["min"] * tolerance + noise:
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["benchmarks"]
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    data = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "benchmarks": results,
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(data, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def command(args: Namespace) -> int:
+    from rich.table import Table
+    from rich.text import Text
+
+    from zenith.console import console
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        console.print(f"Unknown benchmark: {', '.join(unknown)}", style="error")
+        console.print(f"Available: {', '.join(BENCHMARKS)}", style="info")
+        return 1
+    results = run_benchmarks(args.names)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.tolerance)
+
+    table = Table(
+        "Benchmark",
+        "Rounds",
+        "Median (ms)",
+        "Min (ms)",
+        "Baseline min (ms)",
+        "Change",
+        title="Zenith Benchmarks",
+        title_style="highlight",
+    )
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = ""
+        if base:
+            change = f"{(result['min'] / base['min'] - 1) * 100:+.1f}%"
+        table.add_row(
+            name,
+            str(result["rounds"]),
+            f"{result['median'] * 1000:.3f}",
+            f"{result['min'] * 1000:.3f}",
+            f"{base['min'] * 1000:.3f}" if base else "-",
+            Text(change, style="error" if name in regressions else "success"),
+        )
+    console.print(table)
+    skipped = [name for name in args.names or BENCHMARKS if name not in results]
+    if skipped:
+        console.print(f"Skipped: {', '.join(skipped)}", style="warning")
+
+    if args.save:
+        save_baseline(args.baseline, {**baseline, **results})
+        console.print(f"Baseline saved to {args.baseline}", style="success")
+        return 0
+    if regressions:
+        console.print(
+            f"Regressions over {args.tolerance:.0%}: {', '.join(regressions)}",
+            style="error",
+        )
+        return 1
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser("bench", help="run the performance benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument(
+        "-b", "--baseline", default=BASELINE_FILE, help="baseline JSON file"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store these results as the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown of the fastest round, on top of the baseline's noise",
+    )
+    parser.set_defaults(func=command)
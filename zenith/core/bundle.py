@@ -0,0 +1,418 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from argparse import Namespace
+from typing import IO, Dict, List, Optional
+
+from zenith.__version__ import __version__
+from zenith.core.config import INSTALL_DIR
+
+MANIFEST_NAME = "manifest.json"
+OBJECTS_DIR = "objects"
+FORMAT_VERSION = 1
+CHUNK_SIZE = 1 << 20
+# caches with their own zone (see zenith.core.cache) are not worth shipping
+EXCLUDED_DIRS = {"results", "__pycache__"}
+
+
+class BundleError(Exception):
+    pass
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def safe_path(path: str) -> str:
+    """Rejects manifest paths that would land outside the install directory."""
+    normalized = os.path.normpath(path)
+    if os.path.isabs(normalized) or normalized.split(os.sep)[0] in ("..", ".", ""):
+        raise BundleError(f"Unsafe path in bundle: {path}")
+    return normalized
+
+
+def safe_dir(name: str) -> str:
+    """Accepts only a single visible path component, e.g. a tool's directory name."""
+    separators = filter(None, (os.sep, os.altsep))
+    if not name or name.startswith(".") or any(sep in name for sep in separators):
+        raise BundleError(f"Unsafe directory name in bundle: {name!r}")
+    return name
+
+
+def check_links(stage: str, links: List[Dict]) -> None:
+    """Rejects staged links that resolve outside their own tool directory."""
+    for link in links:
+        if os.path.isabs(link["target"]):
+            raise BundleError(f"Absolute link in bundle: {link['path']}")
+    # resolved only once every link exists, so chains through other links count
+    for link in links:
+        tool_dir = os.path.realpath(os.path.join(stage, link["path"].split(os.sep)[0]))
+        target = os.path.realpath(os.path.join(stage, link["path"]))
+        if os.path.commonpath([tool_dir, target]) != tool_dir:
+            raise BundleError(
+                f"Link escapes its tool directory: {link['path']} -> {link['target']}"
+            )
+
+
+def scan(root: str, prefix: str, manifest: Dict, objects: Dict[str, str]) -> None:
+    """Adds a directory tree to the manifest, one object per distinct content."""
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        relative = os.path.join(prefix, os.path.relpath(current, root))
+        manifest["dirs"].append(os.path.normpath(relative))
+        # os.walk lists symlinks to directories as dirs without descending
+        links = [d for d in dirs if os.path.islink(os.path.join(current, d))]
+        for name in sorted(files + links):
+            path = os.path.join(current, name)
+            rel_path = os.path.normpath(os.path.join(relative, name))
+            info = os.lstat(path)
+            if stat.S_ISLNK(info.st_mode):
+                manifest["links"].append(
+                    {"path": rel_path, "target": os.readlink(path)}
+                )
+            elif stat.S_ISREG(info.st_mode):
+                digest = file_hash(path)
+                objects.setdefault(digest, path)
+                manifest["files"].append(
+                    {
+                        "path": rel_path,
+                        "hash": digest,
+                        "size": info.st_size,
+                        "mode": stat.S_IMODE(info.st_mode),
+                        "mtime": info.st_mtime,
+                    }
+                )
+
+
+def pip_targets(tool) -> Optional[List[str]]:
+    """pip wheel arguments reproducing the tool's pip install, or None if not pip."""
+    options = tool.install_options
+    if not isinstance(options, dict) or not options.get("pip"):
+        return None
+    packages = options["pip"]
+    if isinstance(packages, list):
+        return packages
+    if packages.startswith("pip install"):
+        return packages.split()[2:]
+    return ["-r", os.path.join(tool.full_path, packages)]
+
+
+def build_wheels(tool, wheel_dir: str) -> List[str]:
+    targets = pip_targets(tool)
+    if targets is None:
+        return []
+    os.makedirs(wheel_dir, exist_ok=True)
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "wheel", "-q", "-w", wheel_dir, *targets],
+        cwd=tool.full_path,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise BundleError(f"pip wheel failed for {tool}: {result.stderr.strip()}")
+    return sorted(os.listdir(wheel_dir))
+
+
+def export_bundle(
+    output: IO[bytes],
+    tools: List,
+    wheels: bool = True,
+    compression: str = "xz",
+    log=None,
+) -> Dict:
+    """Writes installed tools, and wheels for their pip dependencies, as one stream."""
+    manifest: Dict = {
+        "format": FORMAT_VERSION,
+        "zenith": __version__,
+        "created": time.time(),
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "platform": sys.platform,
+        "tools": [],
+        "dirs": [],
+        "files": [],
+        "links": [],
+    }
+    objects: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for tool in tools:
+            name = os.path.basename(tool.full_path)
+            if log:
+                log(f"Scanning {tool}")
+            scan(tool.full_path, name, manifest, objects)
+            entry = {
+                "name": str(tool),
+                "dir": name,
+                "install": tool.install_options,
+                "deps_marker": os.path.exists(tool.deps_marker),
+                "wheels": [],
+            }
+            if wheels:
+                if log:
+                    log(f"Building wheels for {tool}")
+                wheel_dir = os.path.join(tmp_dir, name)
+                for wheel in build_wheels(tool, wheel_dir):
+                    path = os.path.join(wheel_dir, wheel)
+                    digest = file_hash(path)
+                    objects.setdefault(digest, path)
+                    entry["wheels"].append({"name": wheel, "hash": digest})
+            manifest["tools"].append(entry)
+
+        manifest["objects"] = len(objects)
+        manifest["size"] = sum(os.path.getsize(path) for path in objects.values())
+        # stream mode: the manifest goes first so imports can plan before any data
+        with tarfile.open(fileobj=output, mode=f"w|{compression}") as archive:
+            data = json.dumps(manifest).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(manifest["created"])
+            archive.addfile(info, io.BytesIO(data))
+            for digest, path in objects.items():
+                info = tarfile.TarInfo(f"{OBJECTS_DIR}/{digest}")
+                info.size = os.path.getsize(path)
+                with open(path, "rb") as source:
+                    archive.addfile(info, source)
+    return manifest
+
+
+def copy_verified(source: IO[bytes], destination: Optional[str], digest: str) -> None:
+    """Copies an object while hashing it; without a destination it only verifies."""
+    hasher = hashlib.sha256()
+    with open(destination or os.devnull, "wb") as target:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            target.write(chunk)
+    if hasher.hexdigest() != digest:
+        raise BundleError(f"Hash mismatch for object {digest}")
+
+
+def import_bundle(
+    source: IO[bytes],
+    force: bool = False,
+    verify_only: bool = False,
+    log=None,
+) -> Dict:
+    """Restores a bundle in one pass over the stream, verifying every object."""
+    with tarfile.open(fileobj=source, mode="r|*") as archive:
+        members = iter(archive)
+        first = next(members, None)
+        if first is None or first.name != MANIFEST_NAME:
+            raise BundleError("Not a zenith bundle: manifest missing")
+        manifest = json.load(archive.extractfile(first))
+        if manifest.get("format") != FORMAT_VERSION:
+            raise BundleError(f"Unsupported bundle format {manifest.get('format')}")
+        for tool in manifest["tools"]:
+            safe_dir(tool["dir"])
+            for wheel in tool["wheels"]:
+                safe_dir(wheel["name"])
+
+        skipped = [
+            tool["dir"]
+            for tool in manifest["tools"]
+            if os.path.exists(os.path.join(INSTALL_DIR, tool["dir"]))
+            and not force
+            and not verify_only
+        ]
+        restore = {tool["dir"] for tool in manifest["tools"]} - set(skipped)
+        stage = tempfile.mkdtemp(dir=INSTALL_DIR, prefix=".bundle-")
+        try:
+            targets: Dict[str, List[Dict]] = {}
+            for entry in manifest["files"]:
+                if safe_path(entry["path"]).split(os.sep)[0] in restore:
+                    targets.setdefault(entry["hash"], []).append(entry)
+            for tool in manifest["tools"]:
+                for wheel in tool["wheels"]:
+                    targets.setdefault(wheel["hash"], []).append(
+                        {"path": os.path.join(".wheels", tool["dir"], wheel["name"])}
+                    )
+            for path in [] if verify_only else manifest["dirs"]:
+                if safe_path(path).split(os.sep)[0] in restore:
+                    os.makedirs(os.path.join(stage, path), exist_ok=True)
+
+            received = set()
+            for member in members:
+                digest = member.name.rpartition("/")[2]
+                if not member.isfile() or digest not in targets:
+                    continue
+                received.add(digest)
+                if verify_only:
+                    copy_verified(archive.extractfile(member), None, digest)
+                    continue
+                destinations = targets[digest]
+                first_path = os.path.join(stage, safe_path(destinations[0]["path"]))
+                os.makedirs(os.path.dirname(first_path), exist_ok=True)
+                copy_verified(archive.extractfile(member), first_path, digest)
+                # duplicate contents are stored once and copied locally
+                for entry in destinations[1:]:
+                    path = os.path.join(stage, safe_path(entry["path"]))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    shutil.copyfile(first_path, path)
+                for entry in destinations:
+                    if "mode" in entry:
+                        path = os.path.join(stage, entry["path"])
+                        os.chmod(path, entry["mode"])
+                        os.utime(path, (entry["mtime"], entry["mtime"]))
+            missing = set(targets) - received
+            if missing:
+                raise BundleError(
+                    f"Bundle is truncated: {len(missing)} objects missing"
+                )
+            if verify_only:
+                return manifest
+
+            links = [
+                {**link, "path": safe_path(link["path"])}
+                for link in manifest["links"]
+                if safe_path(link["path"]).split(os.sep)[0] in restore
+            ]
+            for link in links:
+                path = os.path.join(stage, link["path"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.symlink(link["target"], path)
+            check_links(stage, links)
+            for tool in manifest["tools"]:
+                if tool["dir"] not in restore:
+                    continue
+                final = os.path.join(INSTALL_DIR, tool["dir"])
+                if os.path.exists(final):
+                    shutil.rmtree(final)
+                os.replace(os.path.join(stage, tool["dir"]), final)
+                if log:
+                    log(f"Restored {tool['name']}")
+                install_wheels(tool, os.path.join(stage, ".wheels", tool["dir"]), log)
+        finally:
+            shutil.rmtree(stage, ignore_errors=True)
+    manifest["skipped"] = skipped
+    return manifest
+
+
+def install_wheels(tool: Dict, wheel_dir: str, log=None) -> None:
+    """Installs bundled wheels offline; without them the tool re-checks its deps."""
+    marker = os.path.join(INSTALL_DIR, tool["dir"], ".zenith_deps_installed")
+    if tool["wheels"]:
+        wheels = [os.path.join(wheel_dir, wheel["name"]) for wheel in tool["wheels"]]
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", "install", "-q", "--no-index"]
+            + ["--find-links", wheel_dir, *wheels],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            return
+        if log:
+            log(
+                f"Offline pip install failed for {tool['name']}: {result.stderr.strip()}"
+            )
+    # the marker would otherwise claim dependencies this host does not have
+    if os.path.exists(marker) and tool["install"] and "pip" in tool["install"]:
+        os.remove(marker)
+
+
+def installed_tools(names: Optional[List[str]] = None) -> List:
+    from zenith.core.catalog import find, tools
+
+    if names:
+        selected = []
+        for name in names:
+            tool = find(name)
+            if tool is None or not hasattr(tool, "full_path"):
+                raise BundleError(f"Unknown tool {name!r}")
+            selected.append(tool)
+    else:
+        selected = [tool for tool in tools() if hasattr(tool, "full_path")]
+    return [tool for tool in selected if os.path.isdir(tool.full_path)]
+
+
+def open_stream(path: str, mode: str):
+    if path == "-":
+        stream = sys.stdout.buffer if "w" in mode else sys.stdin.buffer
+        return open(stream.fileno(), mode, closefd=False)
+    return open(path, mode)
+
+
+def command(args: Namespace) -> int:
+    from zenith.console import console
+
+    def log(message: str) -> None:
+        # stdout may be the bundle itself
+        print(message, file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        if args.action == "export":
+            tools = installed_tools(args.tool)
+            if not tools:
+                console.print("No installed tools to bundle", style="warning")
+                return 1
+            with open_stream(args.file, "wb") as output:
+                manifest = export_bundle(
+                    output, tools, not args.no_wheels, args.compression, log
+                )
+            log(
+                f"Bundled {len(manifest['tools'])} tools, {len(manifest['files'])} "
+                f"files as {manifest['objects']} objects in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+            return 0
+        with open_stream(args.file, "rb") as source:
+            manifest = import_bundle(source, args.force, args.action == "verify", log)
+    except (BundleError, OSError, tarfile.TarError, ValueError) as error:
+        console.print(f"Bundle {args.action} failed: {error}", style="error")
+        return 1
+    if args.action == "verify":
+        log(f"Bundle OK: {manifest['objects']} objects verified")
+        return 0
+
+    from zenith.core.catalog import find
+    from zenith.core.status import record
+
+    for entry in manifest["tools"]:
+        tool = find(entry["name"])
+        if tool is not None and entry["dir"] not in manifest["skipped"]:
+            record(tool, tool.installed())
+    for name in manifest["skipped"]:
+        console.print(
+            f"Skipped {name}: already installed, use --force", style="warning"
+        )
+    log(
+        f"Imported {len(manifest['tools']) - len(manifest['skipped'])} tools in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "bundle", help="export or import installed tools as one offline archive"
+    )
+    parser.add_argument("action", choices=["export", "import", "verify"])
+    parser.add_argument("file", help="bundle path, or - for stdout/stdin")
+    parser.add_argument(
+        "-t", "--tool", action="append", help="only these tools (export)"
+    )
+    parser.add_argument(
+        "--no-wheels",
+        action="store_true",
+        help="do not bundle pip dependencies as wheels (export)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["xz", "gz", "bz2"],
+        default="xz",
+        help="xz is smallest, gz fastest (export)",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="replace installed tools (import)"
+    )
+    parser.set_defaults(func=command)
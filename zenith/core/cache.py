@@ -0,0 +1,361 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from argparse import Namespace
+from typing import Dict, List, Optional
+
+from zenith.core.config import INSTALL_DIR, get_config
+
+config = get_config()
+
+CACHE_DIR = os.path.join(INSTALL_DIR, "cache")
+PRUNE_STAMP = os.path.join(CACHE_DIR, ".last_prune")
+# written inside .git so a gc does not change the clone's own mtime
+GC_STAMP = os.path.join(".git", "zenith_gc")
+DAY = 24 * 3600
+
+# zone -> (default budget in MB, 0 for none; default max age in days, 0 for none);
+# override with budget_mb / max_age_days in a [cache.<zone>] section of zenith.cfg
+ZONES = {
+    "http": (256, 30),
+    "theHarvester": (256, 0),
+    "results": (0, 0),
+    "clones": (0, 0),
+}
+# tool output the user asked for; pruned only when named, e.g. -z results
+EXPLICIT_ZONES = {"results"}
+
+
+class Entry:
+    """One evictable unit of a zone: a file group or a directory tree."""
+
+    def __init__(self, zone: str, paths: List[str], used: float, size: int) -> None:
+        self.zone = zone
+        self.paths = paths
+        self.used = used
+        self.size = size
+
+    def remove(self) -> None:
+        for path in self.paths:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def disk_usage(path: str) -> int:
+    """Bytes allocated under path, counting blocks rather than apparent sizes."""
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return 0
+    size = getattr(stat, "st_blocks", 0) * 512 or stat.st_size
+    if not os.path.isdir(path) or os.path.islink(path):
+        return size
+    try:
+        with os.scandir(path) as children:
+            return size + sum(disk_usage(child.path) for child in children)
+    except OSError:
+        return size
+
+
+def last_modified(path: str) -> float:
+    """Newest mtime in a tree, so a directory counts as used when anything in it is."""
+    try:
+        newest = os.lstat(path).st_mtime
+    except OSError:
+        return 0.0
+    if os.path.isdir(path) and not os.path.islink(path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d != ".git"]
+            for name in files:
+                try:
+                    newest = max(newest, os.lstat(os.path.join(root, name)).st_mtime)
+                except OSError:
+                    pass
+    return newest
+
+
+def touch(path: str) -> None:
+    """Marks a cache entry as used, for entries whose mtime is not their freshness."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _http_entries() -> List[Entry]:
+    from zenith.core.http import CACHE_DIR as HTTP_CACHE_DIR
+
+    groups: Dict[str, List[str]] = {}
+    for root, _, files in os.walk(HTTP_CACHE_DIR):
+        for name in files:
+            stem = name.split(".")[0]
+            groups.setdefault(os.path.join(root, stem), []).append(
+                os.path.join(root, name)
+            )
+    return [
+        # the metadata file is touched on hits and rewritten on revalidation
+        Entry(
+            "http", paths, max(map(last_modified, paths)), sum(map(disk_usage, paths))
+        )
+        for _, paths in sorted(groups.items())
+        if all(os.path.exists(path) for path in paths)
+    ]
+
+
+def _dir_entries(zone: str, parent: str) -> List[Entry]:
+    try:
+        names = sorted(os.listdir(parent))
+    except OSError:
+        return []
+    paths = [os.path.join(parent, name) for name in names]
+    return [
+        Entry(zone, [path], last_modified(path), disk_usage(path)) for path in paths
+    ]
+
+
+def clones() -> List[str]:
+    try:
+        names = sorted(os.listdir(INSTALL_DIR))
+    except OSError:
+        return []
+    return [
+        os.path.join(INSTALL_DIR, name)
+        for name in names
+        if os.path.isdir(os.path.join(INSTALL_DIR, name, ".git"))
+    ]
+
+
+def last_runs() -> Dict[str, float]:
+    """Latest run start per tool name, from the results store if there is one."""
+    from zenith.core.results import RESULTS_DB
+
+    if not os.path.exists(RESULTS_DB):
+        return {}
+    try:
+        connection = sqlite3.connect(f"file:{RESULTS_DB}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                "SELECT tool, MAX(started) FROM runs GROUP BY tool"
+            )
+            return {tool.lower(): started for tool, started in rows}
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return {}
+
+
+def clone_used(path: str, runs: Optional[Dict[str, float]] = None) -> float:
+    """A clone is used when its tool runs, or when it is cloned or updated."""
+    runs = last_runs() if runs is None else runs
+    # tool names are derived from the clone directory, see GitHubRepo.__str__
+    tool = os.path.basename(path).lower().replace("-", "_")
+    git_dir = os.path.join(path, ".git")
+    touched = max(
+        (
+            os.path.getmtime(os.path.join(git_dir, name))
+            for name in ["HEAD", "FETCH_HEAD", "index"]
+            if os.path.exists(os.path.join(git_dir, name))
+        ),
+        default=0.0,
+    )
+    return max(runs.get(tool, 0.0), touched)
+
+
+def entries(zone: str) -> List[Entry]:
+    if zone == "http":
+        return _http_entries()
+    if zone == "theHarvester":
+        from zenith.enumeration.theHarvester import CACHE_DIR as HARVESTER_CACHE_DIR
+
+        return _dir_entries(zone, HARVESTER_CACHE_DIR)
+    if zone == "results":
+        found = []
+        for clone in clones():
+            found += _dir_entries(zone, os.path.join(clone, "results"))
+        return found
+    if zone == "clones":
+        runs = last_runs()
+        # results/ folders are their own zone, so they are not counted twice
+        return [
+            Entry(
+                zone,
+                [path],
+                clone_used(path, runs),
+                disk_usage(path) - disk_usage(os.path.join(path, "results")),
+            )
+            for path in clones()
+        ]
+    raise ValueError(f"Unknown cache zone {zone!r}")
+
+
+def budget(zone: str) -> int:
+    """The zone's size budget in bytes, 0 for unlimited."""
+    default, _ = ZONES[zone]
+    return int(config.get(f"cache.{zone}", "budget_mb", fallback=default)) << 20
+
+
+def max_age(zone: str) -> float:
+    _, default = ZONES[zone]
+    return float(config.get(f"cache.{zone}", "max_age_days", fallback=default)) * DAY
+
+
+def plan(zone: str, zone_entries: List[Entry]) -> List[Entry]:
+    """Entries to evict: expired ones, then least recently used until under budget."""
+    limit, age = budget(zone), max_age(zone)
+    now = time.time()
+    evict = [e for e in zone_entries if age and now - e.used > age]
+    remaining = sorted(
+        (e for e in zone_entries if e not in evict), key=lambda e: e.used
+    )
+    total = sum(e.size for e in remaining)
+    while limit and total > limit and remaining:
+        entry = remaining.pop(0)
+        evict.append(entry)
+        total -= entry.size
+    return evict
+
+
+def gc_clone(path: str, used: float) -> bool:
+    """Repacks and prunes a clone idle since its last gc; returns whether it ran."""
+    stamp = os.path.join(path, GC_STAMP)
+    if os.path.exists(stamp) and os.path.getmtime(stamp) >= used:
+        return False
+    for command in (
+        ["git", "reflog", "expire", "--expire=now", "--all"],
+        ["git", "gc", "--quiet", "--prune=now"],
+    ):
+        if subprocess.run(command, cwd=path, capture_output=True).returncode:
+            return False
+    with open(stamp, "w", encoding="utf-8"):
+        pass
+    return True
+
+
+def prune(
+    zones: Optional[List[str]] = None, dry_run: bool = False, gc: bool = True
+) -> Dict[str, Dict[str, int]]:
+    """Evicts over-budget and expired entries and gcs idle clones, per zone.
+
+    Without zones, every zone but the EXPLICIT_ZONES is pruned.
+    """
+    report = {}
+    idle_days = config.getfloat("zenith", "clone_idle_days")
+    for zone in zones or [zone for zone in ZONES if zone not in EXPLICIT_ZONES]:
+        zone_entries = entries(zone)
+        evict = plan(zone, zone_entries)
+        if not dry_run:
+            for entry in evict:
+                entry.remove()
+        report[zone] = {"evicted": len(evict), "freed": sum(e.size for e in evict)}
+        if zone == "clones" and gc and not dry_run and idle_days > 0:
+            before = {e.paths[0]: e.size for e in zone_entries if e not in evict}
+            collected = [
+                e
+                for e in zone_entries
+                if e not in evict
+                and time.time() - e.used > idle_days * DAY
+                and gc_clone(e.paths[0], e.used)
+            ]
+            report[zone]["collected"] = len(collected)
+            report[zone]["freed"] += sum(
+                before[e.paths[0]] - disk_usage(e.paths[0]) for e in collected
+            )
+    if not dry_run:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(PRUNE_STAMP, "w", encoding="utf-8"):
+            pass
+    return report
+
+
+def maybe_prune() -> None:
+    """Enforces budgets in the background at most once a day; no gc, it is slow."""
+    try:
+        if time.time() - os.path.getmtime(PRUNE_STAMP) < DAY:
+            return
+    except OSError:
+        pass
+    threading.Thread(target=prune, kwargs={"gc": False}, daemon=True).start()
+
+
+def format_size(size: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def print_stats() -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    table = Table(
+        "Zone", "Entries", "Size", "Budget", "Oldest use", title_style="highlight"
+    )
+    now = time.time()
+    total = 0
+    for zone in ZONES:
+        zone_entries = entries(zone)
+        size = sum(e.size for e in zone_entries)
+        total += size
+        oldest = min((e.used for e in zone_entries), default=None)
+        table.add_row(
+            zone,
+            str(len(zone_entries)),
+            format_size(size),
+            format_size(budget(zone)) if budget(zone) else "unlimited",
+            "-" if oldest is None else f"{(now - oldest) / DAY:.1f} days ago",
+        )
+    console.print(table)
+    console.print(
+        f"{format_size(total)} in caches, {format_size(disk_usage(INSTALL_DIR))} "
+        f"in {INSTALL_DIR}",
+        style="info",
+    )
+
+
+def command(args: Namespace) -> int:
+    from zenith.console import console
+
+    if args.action == "stats":
+        print_stats()
+        return 0
+    report = prune(args.zone, dry_run=args.dry_run, gc=not args.no_gc)
+    verb = "Would free" if args.dry_run else "Freed"
+    for zone, result in report.items():
+        line = f"{zone}: {verb.lower()} {format_size(result['freed'])}"
+        line += f", {result['evicted']} entries evicted"
+        if "collected" in result:
+            line += f", {result['collected']} idle clones collected"
+        console.print(line, style="info")
+    total = sum(result["freed"] for result in report.values())
+    console.print(f"{verb} {format_size(total)}", style="success")
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "cache", help="show or prune cache usage under the zenith directory"
+    )
+    parser.add_argument("action", choices=["stats", "prune"])
+    parser.add_argument(
+        "-z",
+        "--zone",
+        action="append",
+        choices=list(ZONES),
+        help="only these zones; results is pruned only when named",
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="report what would be evicted"
+    )
+    parser.add_argument("--no-gc", action="store_true", help="skip git gc on clones")
+    parser.set_defaults(func=command)
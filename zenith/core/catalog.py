@@ -0,0 +1,415 @@
+import difflib
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import tomllib
+from argparse import Namespace
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Tuple
+
+from zenith.core.config import INSTALL_DIR
+
+BUILTIN_MANIFEST = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog.json"
+)
+USER_CATALOG_DIR = os.path.join(INSTALL_DIR, "catalog")
+INDEX_FILE = os.path.join(INSTALL_DIR, "catalog_index.json")
+# third-party packs register "<package>:<manifest file>" under this group
+ENTRY_POINT_GROUP = "zenith.catalogs"
+INDEX_VERSION = 1
+
+# utility proxies must not grow these, since menus check hasattr(tool, "install")
+REPO_ATTRIBUTES = {
+    "install",
+    "installed",
+    "clone",
+    "path",
+    "full_path",
+    "deps_marker",
+    "install_options",
+}
+
+
+class CatalogError(Exception):
+    pass
+
+
+# what a broken manifest or pack raises; it is skipped rather than taking the
+# builtin tools down with it
+SOURCE_ERRORS = (
+    CatalogError,
+    OSError,
+    ValueError,
+    ImportError,
+    AttributeError,
+    TypeError,
+)
+
+
+def skip_source(source: str, error: Exception) -> None:
+    from zenith.console import console
+
+    console.print(f"Skipping tool catalog {source}: {error}", style="warning")
+
+
+def parse_manifest(text: str, name: str) -> List[Dict]:
+    data = tomllib.loads(text) if name.endswith(".toml") else json.loads(text)
+    tools = data.get("tools", [])
+    if not isinstance(tools, list):
+        raise CatalogError(f"{name}: 'tools' must be a list")
+    return tools
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def manifests() -> List[Tuple[str, List[Dict], Optional[str]]]:
+    """(source, entries, file) for the builtin, user and entry point manifests."""
+    found = []
+    paths = [BUILTIN_MANIFEST]
+    if os.path.isdir(USER_CATALOG_DIR):
+        paths += [
+            os.path.join(USER_CATALOG_DIR, name)
+            for name in sorted(os.listdir(USER_CATALOG_DIR))
+            if name.endswith((".json", ".toml"))
+        ]
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as manifest:
+                found.append((path, parse_manifest(manifest.read(), path), path))
+        except SOURCE_ERRORS as error:
+            if path == BUILTIN_MANIFEST:
+                raise
+            skip_source(path, error)
+            # still fingerprinted, so fixing the file rebuilds the index
+            found.append((path, [], path))
+
+    from importlib import metadata, resources
+
+    for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        source = f"{entry_point.name} ({entry_point.value})"
+        try:
+            resource = resources.files(entry_point.module).joinpath(entry_point.attr)
+            found.append(
+                (source, parse_manifest(resource.read_text(), resource.name), None)
+            )
+        except SOURCE_ERRORS as error:
+            skip_source(source, error)
+    return found
+
+
+def describe(entry: Dict, source: str) -> Tuple[Dict, Optional[str]]:
+    """Fills an index entry.
+
+    Entries carrying their name and kind are indexed without importing any
+    tool code; factory-only entries, e.g. from older packs, import their tool
+    once, here.
+    """
+    entry = dict(entry, source=source)
+    module_file = None
+    if entry.get("factory") and not ("name" in entry and "kind" in entry):
+        from zenith.core.repo import GitHubRepo
+
+        tool = build(entry)
+        module_file = getattr(sys.modules[type(tool).__module__], "__file__", None)
+        entry.setdefault("name", str(tool))
+        entry.setdefault("description", tool.description or "")
+        if isinstance(tool, GitHubRepo):
+            entry.setdefault("kind", "repo")
+            entry.setdefault("path", tool.path)
+            entry.setdefault("install", tool.install_options)
+        else:
+            entry.setdefault("kind", "utility")
+    elif not entry.get("factory"):
+        if "name" not in entry or "command" not in entry:
+            raise CatalogError(f"{source}: tools need a factory or a name and command")
+    entry.setdefault("kind", "repo" if entry.get("path") else "utility")
+    entry.setdefault("description", "")
+    entry["name"] = entry["name"].lower()
+    entry.setdefault("category", "other")
+    return entry, module_file
+
+
+def fingerprint(files: List[str]) -> Dict[str, Optional[int]]:
+    # import path directories change when packs (entry points) are installed
+    paths = set(files) | {USER_CATALOG_DIR} | {p for p in sys.path if os.path.isdir(p)}
+    return {path: _mtime(path) for path in sorted(paths)}
+
+
+def build_index() -> Dict:
+    entries: Dict[str, Dict] = {}
+    files: List[str] = []
+    for source, tools, path in manifests():
+        if path:
+            files.append(path)
+        described = []
+        try:
+            described = [describe(tool, source) for tool in tools]
+        except SOURCE_ERRORS as error:
+            if path == BUILTIN_MANIFEST:
+                raise
+            skip_source(source, error)
+        for entry, module_file in described:
+            if module_file:
+                files.append(module_file)
+            # later manifests override earlier ones, so packs can replace builtins
+            entries[entry["name"]] = entry
+    return {
+        "version": INDEX_VERSION,
+        "fingerprint": fingerprint(files),
+        "tools": list(entries.values()),
+    }
+
+
+def write_index(index: Dict) -> None:
+    tmp_file = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file)
+        os.replace(tmp_file, INDEX_FILE)
+    except OSError:
+        pass
+
+
+def read_index() -> Optional[Dict]:
+    try:
+        with open(INDEX_FILE, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION:
+        return None
+    current = {path: _mtime(path) for path in index["fingerprint"]}
+    if current != index["fingerprint"] or fingerprint([]).keys() - current.keys():
+        return None
+    return index
+
+
+_index: Optional[Dict] = None
+_proxies: Dict[str, "CatalogTool"] = {}
+_lock = threading.RLock()
+
+
+def get_index(rebuild: bool = False) -> Dict:
+    """The prebuilt index, rebuilt only when a manifest or tool module changed."""
+    global _index
+    with _lock:
+        if _index is None or rebuild:
+            _index = None if rebuild else read_index()
+            if _index is None:
+                _index = build_index()
+                write_index(_index)
+        return _index
+
+
+def build(entry: Dict):
+    factory = entry.get("factory")
+    if not factory:
+        return manifest_repo()(entry) if entry.get("path") else ManifestUtility(entry)
+    module, _, attribute = factory.partition(":")
+    tool = getattr(importlib.import_module(module), attribute)
+    return tool() if isinstance(tool, type) else tool
+
+
+class CatalogTool:
+    """Index entry that stands in for a tool until it is installed or run."""
+
+    def __init__(self, entry: Dict) -> None:
+        self.entry = entry
+        self.description = entry.get("description", "")
+        self.category = entry.get("category")
+        self._tool = None
+        if entry["kind"] == "repo":
+            self.path = entry["path"]
+            self.install_options = entry.get("install")
+            self.full_path = os.path.join(INSTALL_DIR, self.path.split("/")[-1])
+            self.deps_marker = os.path.join(self.full_path, ".zenith_deps_installed")
+
+    def __str__(self) -> str:
+        return self.entry["name"]
+
+    def __repr__(self) -> str:
+        return f"<CatalogTool {self.entry['name']}>"
+
+    def load(self):
+        with _lock:
+            if self._tool is None:
+                self._tool = build(self.entry)
+            return self._tool
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith("_") or (
+            attribute in REPO_ATTRIBUTES and self.entry["kind"] != "repo"
+        ):
+            raise AttributeError(attribute)
+        return getattr(self.load(), attribute)
+
+
+def proxy(entry: Dict) -> CatalogTool:
+    with _lock:
+        if entry["name"] not in _proxies:
+            _proxies[entry["name"]] = CatalogTool(entry)
+        return _proxies[entry["name"]]
+
+
+class ToolList(Sequence):
+    """A category's tools, read from the index on first use rather than at import."""
+
+    def __init__(self, category: Optional[str] = None) -> None:
+        self.category = category
+        self._tools: Optional[List[CatalogTool]] = None
+
+    @property
+    def tools(self) -> List[CatalogTool]:
+        if self._tools is None:
+            self._tools = [
+                proxy(entry)
+                for entry in get_index()["tools"]
+                if self.category is None or entry["category"] == self.category
+            ]
+        return self._tools
+
+    def __getitem__(self, index):
+        return self.tools[index]
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+
+def tools(category: Optional[str] = None) -> ToolList:
+    return ToolList(category)
+
+
+def find(name: str) -> Optional[CatalogTool]:
+    for entry in get_index()["tools"]:
+        if entry["name"] == name.lower():
+            return proxy(entry)
+    return None
+
+
+def score(query: str, entry: Dict) -> float:
+    name = entry["name"]
+    text = f"{entry.get('description', '')} {entry.get('category', '')}".lower()
+    if name == query:
+        return 100
+    if name.startswith(query):
+        return 90 - len(name) / 100
+    if query in name:
+        return 80 - name.index(query)
+    words = query.split()
+    if all(word in text or word in name for word in words):
+        return 60
+    letters = iter(name)
+    if all(letter in letters for letter in query):
+        # subsequence: "thvst" finds theharvester
+        return 50
+    return difflib.SequenceMatcher(None, query, name).ratio() * 40
+
+
+def search(query: str, category: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    query = query.lower().strip()
+    entries = [
+        entry
+        for entry in get_index()["tools"]
+        if category is None or entry["category"] == category
+    ]
+    if not query:
+        return entries[:limit]
+    scored = [(score(query, entry), entry) for entry in entries]
+    scored = [item for item in scored if item[0] >= 20]
+    scored.sort(key=lambda item: (-item[0], item[1]["name"]))
+    return [entry for _, entry in scored[:limit]]
+
+
+def run_command(tool, template: str) -> int:
+    from zenith.core.sandbox import system
+
+    args = input(f"\n{tool} arguments: ").strip()
+    return system(str(tool), template.format(args=args))
+
+
+@functools.cache
+def manifest_repo() -> type:
+    """ManifestRepo, defined on first use since GitHubRepo pulls in GitPython."""
+    from zenith.core.repo import GitHubRepo
+
+    class ManifestRepo(GitHubRepo):
+        """A tool declared only in a manifest: a checkout plus a command to run in it."""
+
+        def __init__(self, entry: Dict) -> None:
+            super().__init__(
+                path=entry["path"],
+                install=entry.get("install", {}),
+                description=entry.get("description"),
+            )
+            self.entry = entry
+
+        def __str__(self) -> str:
+            return self.entry["name"]
+
+        def run(self) -> int:
+            os.chdir(self.full_path)
+            return run_command(self, self.entry["command"])
+
+    return ManifestRepo
+
+
+class ManifestUtility:
+    """A manifest tool without a checkout, e.g. a command already on PATH."""
+
+    def __init__(self, entry: Dict) -> None:
+        self.entry = entry
+        self.description = entry.get("description")
+
+    def __str__(self) -> str:
+        return self.entry["name"]
+
+    def run(self) -> int:
+        return run_command(self, self.entry["command"])
+
+
+def print_matches(entries: List[Dict]) -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    table = Table("Name", "Category", "Description", title_style="highlight")
+    for entry in entries:
+        table.add_row(entry["name"], entry["category"], entry.get("description", ""))
+    console.print(table)
+
+
+def command(args: Namespace) -> int:
+    from zenith.console import console
+
+    try:
+        get_index(rebuild=args.rebuild)
+    except (CatalogError, OSError, ValueError, ImportError) as error:
+        console.print(f"Could not build the tool catalog: {error}", style="error")
+        return 1
+    matches = search(" ".join(args.query), args.category, args.limit)
+    if not matches:
+        console.print("No matching tools", style="warning")
+        return 1
+    print_matches(matches)
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "tools", help="list or fuzzy-search the tool catalog"
+    )
+    parser.add_argument("query", nargs="*", help="name or keywords, typos allowed")
+    parser.add_argument("-c", "--category", help="only tools in this category")
+    parser.add_argument("-n", "--limit", type=int, default=20)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompile the catalog index"
+    )
+    parser.set_defaults(func=command)
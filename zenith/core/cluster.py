@@ -0,0 +1,543 @@
+import hmac
+import json
+import os
+import platform
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from argparse import Namespace
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from zenith.core.config import get_config
+from zenith.core.governor import governed
+
+config = get_config()
+
+DEFAULT_PORT = 7431
+HEARTBEAT_INTERVAL = 5.0
+# a worker that misses heartbeats for this long is presumed dead
+WORKER_TIMEOUT = 20.0
+POLL_INTERVAL = 1.0
+OUTPUT_FLUSH_INTERVAL = 0.5
+CHUNK_SIZE = 1 << 16
+
+
+class ClusterError(Exception):
+    pass
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    if ":" not in address:
+        return address, DEFAULT_PORT
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def request(address: Tuple[str, int], message: Dict, timeout: float = 30) -> Dict:
+    """Sends one JSON-line message to the coordinator and returns its reply."""
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("coordinator closed the connection")
+    reply = json.loads(line)
+    if "error" in reply:
+        raise ClusterError(reply["error"])
+    return reply
+
+
+def all_tools() -> List:
+    from zenith.core.catalog import tools
+
+    return list(tools())
+
+
+def find_tool(name: str):
+    from zenith.core.catalog import find
+
+    return find(name)
+
+
+class Coordinator:
+    """Job queue and worker registry; every operation runs under one lock."""
+
+    def __init__(
+        self,
+        token: str = "",
+        results_path: Optional[str] = None,
+        worker_timeout: float = WORKER_TIMEOUT,
+    ) -> None:
+        self.token = token
+        self.results_path = results_path
+        self.worker_timeout = worker_timeout
+        self.lock = threading.Lock()
+        self.queue: deque = deque()
+        self.jobs: Dict[int, Dict] = {}
+        self.workers: Dict[str, Dict] = {}
+        self.next_job = 1
+
+    def handle(self, message: Dict) -> Dict:
+        if self.token and not hmac.compare_digest(
+            str(message.get("token", "")), self.token
+        ):
+            return {"error": "invalid cluster token"}
+        handler = getattr(self, f"op_{message.get('op')}", None)
+        if handler is None:
+            return {"error": f"unknown operation {message.get('op')!r}"}
+        with self.lock:
+            return handler(message)
+
+    def _worker(self, message: Dict) -> Dict:
+        worker = self.workers.get(message.get("worker", ""))
+        if worker is None:
+            raise ClusterError("unknown worker, register again")
+        worker["last_seen"] = time.time()
+        return worker
+
+    def _leased(self, message: Dict) -> Optional[Dict]:
+        job = self.jobs.get(message.get("job"))
+        if job is None or job["worker"] != message.get("worker"):
+            return None
+        return job
+
+    def op_submit(self, message: Dict) -> Dict:
+        if find_tool(message.get("tool", "")) is None:
+            return {"error": f"unknown tool {message.get('tool')!r}"}
+        job_id = self.next_job
+        self.next_job += 1
+        self.jobs[job_id] = {
+            "id": job_id,
+            "tool": message["tool"],
+            "input": [str(line) for line in message.get("input", [])],
+            "state": "queued",
+            "worker": None,
+            "attempts": 0,
+            "exit_code": None,
+            "records": 0,
+        }
+        self.queue.append(job_id)
+        return {"job": job_id}
+
+    def op_register(self, message: Dict) -> Dict:
+        worker_id = f"{message.get('name') or 'worker'}-{uuid.uuid4().hex[:6]}"
+        self.workers[worker_id] = {"last_seen": time.time(), "jobs": set()}
+        log(f"worker {worker_id} registered")
+        return {"worker": worker_id, "heartbeat": HEARTBEAT_INTERVAL}
+
+    def op_heartbeat(self, message: Dict) -> Dict:
+        try:
+            self._worker(message)
+        except ClusterError as error:
+            return {"error": str(error)}
+        return {}
+
+    def op_pull(self, message: Dict) -> Dict:
+        try:
+            worker = self._worker(message)
+        except ClusterError as error:
+            return {"error": str(error)}
+        if not self.queue:
+            return {"job": None}
+        job = self.jobs[self.queue.popleft()]
+        job.update(state="running", worker=message["worker"])
+        job["attempts"] += 1
+        worker["jobs"].add(job["id"])
+        return {"job": {key: job[key] for key in ("id", "tool", "input")}}
+
+    def op_output(self, message: Dict) -> Dict:
+        job = self._leased(message)
+        if job is not None:
+            for line in message.get("data", "").splitlines():
+                log(f"[job {job['id']} {job['worker']}] {line}")
+        return {}
+
+    def op_result(self, message: Dict) -> Dict:
+        from zenith.core.results import import_runs
+
+        job = self._leased(message)
+        if job is None:
+            # the job was re-queued after a missed heartbeat and belongs elsewhere
+            return {"error": "job is no longer leased to this worker"}
+        job["records"] = import_runs(message.get("runs", []), self.results_path)
+        job["exit_code"] = message.get("exit_code")
+        job["state"] = "done" if job["exit_code"] == 0 else "failed"
+        self.workers.get(job["worker"], {"jobs": set()})["jobs"].discard(job["id"])
+        log(
+            f"job {job['id']} ({job['tool']}) {job['state']} on {job['worker']}, "
+            f"{job['records']} records"
+        )
+        return {"records": job["records"]}
+
+    def op_status(self, message: Dict) -> Dict:
+        now = time.time()
+        return {
+            "jobs": list(self.jobs.values()),
+            "workers": [
+                {
+                    "id": worker_id,
+                    "idle": round(now - worker["last_seen"], 1),
+                    "jobs": sorted(worker["jobs"]),
+                }
+                for worker_id, worker in self.workers.items()
+            ],
+        }
+
+    def reap(self) -> None:
+        """Drops workers that stopped sending heartbeats and re-queues their jobs."""
+        deadline = time.time() - self.worker_timeout
+        with self.lock:
+            for worker_id, worker in list(self.workers.items()):
+                if worker["last_seen"] >= deadline:
+                    continue
+                del self.workers[worker_id]
+                for job_id in sorted(worker["jobs"], reverse=True):
+                    job = self.jobs[job_id]
+                    job.update(state="queued", worker=None)
+                    self.queue.appendleft(job_id)
+                log(
+                    f"worker {worker_id} timed out, re-queued {len(worker['jobs'])} jobs"
+                )
+
+
+def log(message: str) -> None:
+    print(f"{time.strftime('%H:%M:%S')} {message}", flush=True)
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                reply = self.server.coordinator.handle(json.loads(line))
+            except ValueError:
+                reply = {"error": "malformed request"}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class CoordinatorServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], coordinator: Coordinator) -> None:
+        self.coordinator = coordinator
+        super().__init__(address, CoordinatorHandler)
+
+    def service_actions(self) -> None:
+        super().service_actions()
+        self.coordinator.reap()
+
+
+class Worker:
+    """Pulls jobs from a coordinator and runs each as `zenith run <tool>`."""
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        token: str = "",
+        name: Optional[str] = None,
+        concurrency: int = 1,
+    ) -> None:
+        self.address = address
+        self.token = token
+        self.name = name or platform.node()
+        self.concurrency = max(1, concurrency)
+        self.id: Optional[str] = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def call(self, op: str, **fields) -> Dict:
+        message = {"op": op, "token": self.token, "worker": self.id, **fields}
+        return request(self.address, message)
+
+    def register(self, stale_id: Optional[str] = None) -> None:
+        with self.lock:
+            if self.id is not None and self.id != stale_id:
+                # another thread already registered again
+                return
+            reply = request(
+                self.address, {"op": "register", "token": self.token, "name": self.name}
+            )
+            self.id = reply["worker"]
+        log(f"registered with {self.address[0]}:{self.address[1]} as {self.id}")
+
+    def heartbeat_loop(self) -> None:
+        while not self.stopping.wait(HEARTBEAT_INTERVAL):
+            worker_id = self.id
+            try:
+                self.call("heartbeat")
+            except ClusterError:
+                self.register(worker_id)
+            except OSError:
+                # coordinator unreachable; keep trying until it is back
+                pass
+
+    def job_loop(self) -> None:
+        while not self.stopping.is_set():
+            worker_id = self.id
+            try:
+                job = self.call("pull")["job"]
+            except ClusterError:
+                self.register(worker_id)
+                continue
+            except OSError:
+                self.stopping.wait(POLL_INTERVAL)
+                continue
+            if job is None:
+                self.stopping.wait(POLL_INTERVAL)
+                continue
+            self.execute(job)
+
+    def execute(self, job: Dict) -> None:
+        from zenith.bootstrap import python_env
+        from zenith.core.results import disconnect, export_runs
+
+        log(f"job {job['id']}: {job['tool']}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results_path = os.path.join(tmp_dir, "results.db")
+            with governed(job["tool"]):
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "zenith", "run", "--install", job["tool"]],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    env=python_env(dict(os.environ, ZENITH_RESULTS_DB=results_path)),
+                )
+                assert process.stdin and process.stdout
+                process.stdin.write(
+                    "".join(f"{line}\n" for line in job["input"]).encode()
+                )
+                process.stdin.close()
+                self.stream_output(job, process.stdout.fileno())
+                exit_code = process.wait()
+            runs = export_runs(results_path)
+            disconnect(results_path)
+        self.send_result(job, exit_code, runs)
+
+    def stream_output(self, job: Dict, fd: int) -> None:
+        """Forwards output in batches, each at most OUTPUT_FLUSH_INTERVAL old.
+
+        A reader thread blocks on the pipe, so output is sent on time even
+        when the tool goes quiet after writing it.
+        """
+        chunks: queue.Queue = queue.Queue()
+
+        def read() -> None:
+            while chunk := os.read(fd, CHUNK_SIZE):
+                chunks.put(chunk)
+            chunks.put(b"")
+
+        threading.Thread(target=read, daemon=True).start()
+        pending = b""
+        deadline: Optional[float] = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            try:
+                chunk: Optional[bytes] = chunks.get(timeout=timeout)
+            except queue.Empty:
+                chunk = None
+            if chunk:
+                pending += chunk
+                deadline = deadline or time.monotonic() + OUTPUT_FLUSH_INTERVAL
+            if pending and (chunk == b"" or time.monotonic() >= (deadline or 0)):
+                try:
+                    self.call(
+                        "output", job=job["id"], data=pending.decode(errors="replace")
+                    )
+                except OSError:
+                    pass
+                pending = b""
+                deadline = None
+            if chunk == b"":
+                return
+
+    def send_result(self, job: Dict, exit_code: int, runs: List[Dict]) -> None:
+        delay = POLL_INTERVAL
+        while True:
+            try:
+                reply = self.call(
+                    "result", job=job["id"], exit_code=exit_code, runs=runs
+                )
+            except ClusterError as error:
+                log(f"job {job['id']}: result dropped ({error})")
+                return
+            except OSError:
+                if self.stopping.wait(delay):
+                    return
+                delay = min(delay * 2, 30)
+                continue
+            log(f"job {job['id']}: exit {exit_code}, {reply['records']} records sent")
+            return
+
+    def work(self) -> None:
+        self.register()
+        threads = [threading.Thread(target=self.heartbeat_loop, daemon=True)]
+        threads += [
+            threading.Thread(target=self.job_loop, daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                threads[0].join(1)
+        except KeyboardInterrupt:
+            self.stopping.set()
+
+
+def is_loopback(host: str) -> bool:
+    return host in ("localhost", "::1") or host.startswith("127.")
+
+
+def coordinator_command(args: Namespace) -> int:
+    host, port = parse_address(args.bind)
+    if not args.token and not is_loopback(host):
+        print("Set cluster_token in zenith.cfg or pass --token to listen on a network")
+        return 1
+    server = CoordinatorServer((host, port), Coordinator(args.token))
+    log(f"coordinator listening on {host}:{port}")
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def worker_command(args: Namespace) -> int:
+    worker = Worker(parse_address(args.coordinator), args.token, args.name, args.jobs)
+    try:
+        worker.work()
+    except (OSError, ClusterError) as error:
+        print(f"Could not register with {args.coordinator}: {error}")
+        return 1
+    return 0
+
+
+def print_status(status: Dict) -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    jobs = Table(
+        "Job", "Tool", "State", "Worker", "Attempts", "Exit", "Records", title="Jobs"
+    )
+    for job in status["jobs"]:
+        jobs.add_row(
+            str(job["id"]),
+            job["tool"],
+            job["state"],
+            job["worker"] or "-",
+            str(job["attempts"]),
+            "-" if job["exit_code"] is None else str(job["exit_code"]),
+            str(job["records"]),
+        )
+    workers = Table("Worker", "Last heartbeat", "Running", title="Workers")
+    for worker in status["workers"]:
+        workers.add_row(
+            worker["id"],
+            f"{worker['idle']}s ago",
+            ", ".join(map(str, worker["jobs"])) or "-",
+        )
+    console.print(jobs)
+    console.print(workers)
+
+
+def submit_command(args: Namespace) -> int:
+    address = parse_address(args.coordinator)
+    jobs = []
+    if args.file:
+        with open(args.file, encoding="utf-8") as jobs_file:
+            jobs = [json.loads(line) for line in jobs_file if line.strip()]
+    if args.tool:
+        jobs += [{"tool": args.tool, "input": args.input}] * args.count
+    try:
+        for job in jobs:
+            reply = request(address, {"op": "submit", "token": args.token, **job})
+            print(f"submitted job {reply['job']}: {job['tool']}")
+        if args.status or not jobs:
+            print_status(request(address, {"op": "status", "token": args.token}))
+    except (OSError, ClusterError) as error:
+        print(f"{args.coordinator}: {error}")
+        return 1
+    return 0
+
+
+def run_command(args: Namespace) -> int:
+    from zenith.core.metrics import measure
+    from zenith.core.repo import InstallError
+    from zenith.core.results import record_run
+    from zenith.core.status import installed, record
+
+    tool = find_tool(args.tool)
+    if tool is None:
+        print(f"Unknown tool: {args.tool}")
+        return 1
+    if hasattr(tool, "install") and not installed(tool):
+        if not args.install:
+            print(f"{tool} is not installed (pass --install to install it first)")
+            return 1
+        try:
+            with measure(str(tool), "install"):
+                tool.install(no_confirm=True)
+            record(tool, tool.installed())
+        except InstallError as error:
+            print(f"Installation failed: {error}")
+            return 1
+    try:
+        with record_run(str(tool)) as run, measure(str(tool), "run") as metric:
+            response = tool.run()
+            run.exit_code = metric.exit_code = response
+    except EOFError:
+        print(f"\n{tool} asked for more input than was provided")
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return min(response or 0, 255)
+
+
+def add_parser(subparsers) -> None:
+    token = config.get("zenith", "cluster_token")
+    address = f"127.0.0.1:{DEFAULT_PORT}"
+
+    parser = subparsers.add_parser(
+        "coordinator", help="queue jobs for zenith workers and collect their results"
+    )
+    parser.add_argument("--bind", default=address, help="host:port to listen on")
+    parser.add_argument("--token", default=token, help="shared cluster token")
+    parser.set_defaults(func=coordinator_command)
+
+    parser = subparsers.add_parser("worker", help="run jobs from a coordinator")
+    parser.add_argument("coordinator", nargs="?", default=address, help="host:port")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="concurrent jobs")
+    parser.add_argument("--name", help="worker name (default: hostname)")
+    parser.add_argument("--token", default=token, help="shared cluster token")
+    parser.set_defaults(func=worker_command)
+
+    parser = subparsers.add_parser("submit", help="queue a tool run on the cluster")
+    parser.add_argument("tool", nargs="?", help="tool name, e.g. sherlock")
+    parser.add_argument("input", nargs="*", help="answers to the tool's prompts")
+    parser.add_argument("-c", "--coordinator", default=address, help="host:port")
+    parser.add_argument("-n", "--count", type=int, default=1, help="copies to queue")
+    parser.add_argument("-f", "--file", help='JSON lines of {"tool", "input"} jobs')
+    parser.add_argument("--status", action="store_true", help="show the job table")
+    parser.add_argument("--token", default=token, help="shared cluster token")
+    parser.set_defaults(func=submit_command)
+
+    parser = subparsers.add_parser(
+        "run", help="run a tool non-interactively, answering its prompts from stdin"
+    )
+    parser.add_argument("tool", help="tool name, e.g. sherlock")
+    parser.add_argument(
+        "--install", action="store_true", help="install the tool first if needed"
+    )
+    parser.set_defaults(func=run_command)
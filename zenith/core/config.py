@@ -2,6 +2,7 @@ import os.path
 from configparser import NoOptionError, RawConfigParser
 from pathlib import Path
 from sys import platform
+from typing import Optional
 
 import distro
 
@@ -23,20 +24,52 @@ DEFAULT_CONFIG = {
     "version": __version__,
     "agreement": "false",
     "ssh_clone": "false",
+    "git_base_url": "",
     "os": CURRENT_PLATFORM,
     "host_file": "hosts.txt",
     "usernames_file": "usernames.txt",
+    "harvester_cache_ttl": "86400",
+    "cluster_token": "",
+    # shared HTTP client; cached responses without Cache-Control stay fresh
+    # for http_cache_ttl seconds, then are revalidated with a conditional GET
+    "http_retries": "3",
+    "http_backoff": "0.5",
+    "http_timeout": "30",
+    "http_cache_ttl": "300",
+    # cache zone budgets go in [cache.<zone>] sections, see zenith.core.cache;
+    # clones unused for this many days are repacked by `zenith cache prune`
+    "clone_idle_days": "14",
+    # `zenith watch` re-checks each username and host about this often (in
+    # seconds), randomly earlier or later by up to watch_jitter of the interval
+    "watch_username_interval": "86400",
+    "watch_host_interval": "3600",
+    "watch_jitter": "0.1",
+    # round-robin DNS answers with a subset of a host's addresses, so an
+    # address counts as removed only after this many checks in a row miss it
+    "watch_dns_misses": "3",
+    # launch limits shared by all tools, 0 means unlimited; per-tool
+    # max_concurrency and rate_limit go in [tool.<name>] sections, as do the
+    # cpu_seconds, memory_mb, max_files, max_processes and cpu_percent run
+    # limits ([tool.default] applies to every tool). Memory, cpu_percent and
+    # max_processes use a cgroup v2 or systemd-run scope when one is available;
+    # otherwise rlimits apply, and max_processes then counts all of the user's
+    # processes, not just the run's. Sherlock's fast mode reads
+    # fast_max_failure_rate, fast_max_p95, fast_min_samples and fast_window
+    # from [tool.sherlock]
+    "max_concurrency": "32",
+    "rate_limit": "0",
+    "target_rate_limit": "0",
+    "cpu_budget": "1.0",
+    "memory_budget": "0.9",
 }
 
 
 def get_config() -> RawConfigParser:
     config = RawConfigParser()
-    if not os.path.exists(INSTALL_DIR):
-        os.mkdir(INSTALL_DIR)
+    os.makedirs(INSTALL_DIR, exist_ok=True)
     if not os.path.exists(CONFIG_FILE):
         config["zenith"] = DEFAULT_CONFIG
-        with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-            config.write(configfile)
+        write_config(config)
     config.read(CONFIG_FILE)
     check_config(config)
     if config.get("zenith", "version") != __version__:
@@ -46,8 +79,18 @@ def get_config() -> RawConfigParser:
 
 
 def write_config(config: RawConfigParser) -> None:
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
+    # replace atomically so concurrent zenith processes never read a partial file
+    tmp_file = f"{CONFIG_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as configfile:
         config.write(configfile)
+    os.replace(tmp_file, CONFIG_FILE)
+
+
+def tool_option(
+    config: RawConfigParser, tool: str, key: str, fallback: Optional[str] = None
+) -> Optional[str]:
+    """Reads key from the tool's own [tool.<name>] section of zenith.cfg."""
+    return config.get(f"tool.{tool.lower()}", key, fallback=fallback)
 
 
 def check_config(config: RawConfigParser) -> None:
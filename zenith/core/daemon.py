@@ -0,0 +1,194 @@
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+from argparse import Namespace
+from configparser import RawConfigParser
+from typing import List, Optional
+
+from zenith.client import (
+    ERROR,
+    EXIT,
+    INPUT,
+    INPUT_EOF,
+    OUTPUT,
+    SOCKET_PATH,
+    recv_frame,
+    send_frame,
+)
+from zenith.core.config import CONFIG_FILE
+
+CHUNK_SIZE = 1 << 16
+# commands that would recurse into another daemon
+BLOCKED_COMMANDS = {"daemon"}
+
+
+def reload_configs() -> None:
+    """Re-reads zenith.cfg into every loaded module's config object."""
+    for name, module in list(sys.modules.items()):
+        config = getattr(module, "config", None)
+        if name.startswith("zenith") and isinstance(config, RawConfigParser):
+            config.read(CONFIG_FILE)
+
+
+def run_command(argv: List[str]) -> int:
+    from zenith.__main__ import build_parser, dispatch
+
+    try:
+        args = build_parser().parse_args(argv)
+        if args.command in BLOCKED_COMMANDS or not (args.command or args.stats):
+            print("zenith daemon: only non-interactive commands can be run remotely")
+            return 2
+        return dispatch(args) or 0
+    except SystemExit as exit_:
+        # as the interpreter does: None is success, anything else is printed
+        if exit_.code is None:
+            return 0
+        if isinstance(exit_.code, int):
+            return exit_.code
+        print(exit_.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Runs one command in a forked child with its output streamed back."""
+
+    # unbuffered, so stdin frames after the request line stay on the socket
+    rbufsize = 0
+
+    def setup(self) -> None:
+        super().setup()
+        # stdout and stderr are pumped by separate threads over one socket
+        self.send_lock = threading.Lock()
+
+    def pump_output(self, read_fd: int, kind: bytes) -> None:
+        while chunk := os.read(read_fd, CHUNK_SIZE):
+            with self.send_lock:
+                send_frame(self.request, kind, chunk)
+
+    def pump_input(self, write_fd: int) -> None:
+        try:
+            while True:
+                kind, payload = recv_frame(self.request)
+                if kind == INPUT:
+                    os.write(write_fd, payload)
+                elif kind == INPUT_EOF:
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            os.close(write_fd)
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        os.chdir(request.get("cwd") or os.path.expanduser("~"))
+
+        if request.get("stdin"):
+            stdin_read, stdin_write = os.pipe()
+            threading.Thread(
+                target=self.pump_input, args=(stdin_write,), daemon=True
+            ).start()
+        else:
+            stdin_read = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(stdin_read, 0)
+        os.close(stdin_read)
+
+        if request.get("columns"):
+            from zenith.console import console
+
+            console.width = request["columns"]
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pumps = []
+        for fd, kind in ((1, OUTPUT), (2, ERROR)):
+            read_fd, write_fd = os.pipe()
+            os.dup2(write_fd, fd)
+            os.close(write_fd)
+            pump = threading.Thread(target=self.pump_output, args=(read_fd, kind))
+            pump.start()
+            pumps.append(pump)
+
+        exit_code = run_command(request.get("argv", []))
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.close(1)
+        os.close(2)
+        for pump in pumps:
+            pump.join()
+        send_frame(self.request, EXIT, str(exit_code).encode())
+
+
+class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str) -> None:
+        self.config_mtime = self._config_mtime()
+        super().__init__(socket_path, RequestHandler)
+
+    @staticmethod
+    def _config_mtime() -> Optional[float]:
+        try:
+            return os.path.getmtime(CONFIG_FILE)
+        except OSError:
+            return None
+
+    def service_actions(self) -> None:
+        super().service_actions()
+        mtime = self._config_mtime()
+        if mtime != self.config_mtime:
+            self.config_mtime = mtime
+            reload_configs()
+
+
+def warm_up() -> None:
+    """Pays the import and file-read costs once, before the first fork."""
+    import zenith.__main__
+    from zenith.core.hosts import get_hosts
+    from zenith.core.usernames import get_usernames
+
+    zenith.__main__.build_parser()
+    get_hosts()
+    get_usernames()
+
+
+def serve(socket_path: str = SOCKET_PATH) -> None:
+    warm_up()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    old_umask = os.umask(0o177)
+    try:
+        server = DaemonServer(socket_path)
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"zenith daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def command(args: Namespace) -> int:
+    if not hasattr(os, "fork"):
+        print("zenith daemon needs a platform with fork()", file=sys.stderr)
+        return 1
+    serve(args.socket)
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "daemon", help="keep zenith warm and serve zenith-client over a unix socket"
+    )
+    parser.add_argument("--socket", default=SOCKET_PATH, help="unix socket path")
+    parser.set_defaults(func=command)
@@ -0,0 +1,371 @@
+import base64
+import binascii
+import re
+import sys
+import zlib
+from argparse import Namespace
+from typing import BinaryIO, Dict, List, Optional, Type
+from urllib.parse import quote_from_bytes, unquote_to_bytes
+
+CHUNK_SIZE = 1 << 16
+MAX_DETECT_DEPTH = 8
+
+WHITESPACE = b" \t\r\n"
+BASE64_RE = re.compile(rb"^[A-Za-z0-9+/_-]+={0,2}$")
+BASE32_RE = re.compile(rb"^[A-Z2-7]+=*$")
+HEX_RE = re.compile(rb"^[0-9A-Fa-f]+$")
+URL_RE = re.compile(rb"%[0-9A-Fa-f]{2}")
+
+
+class CodecError(Exception):
+    pass
+
+
+class Codec:
+    """Streaming codec: feed bytes to update() and collect the tail from finish()."""
+
+    def update(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class AlignedDecoder(Codec):
+    block = 1
+
+    def __init__(self) -> None:
+        self.buffer = b""
+
+    def decode(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def update(self, data: bytes) -> bytes:
+        self.buffer += data.translate(None, WHITESPACE)
+        size = len(self.buffer) - len(self.buffer) % self.block
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return self.decode(data) if data else b""
+
+    def finish(self) -> bytes:
+        data, self.buffer = self.buffer, b""
+        if not data:
+            return b""
+        return self.decode(data + b"=" * (-len(data) % self.block))
+
+
+class Base64Decoder(AlignedDecoder):
+    block = 4
+
+    def decode(self, data: bytes) -> bytes:
+        try:
+            return base64.b64decode(data, altchars=b"-_", validate=False)
+        except binascii.Error as error:
+            raise CodecError(f"Invalid base64: {error}") from error
+
+
+class Base32Decoder(AlignedDecoder):
+    block = 8
+
+    def decode(self, data: bytes) -> bytes:
+        try:
+            return base64.b32decode(data, casefold=True)
+        except binascii.Error as error:
+            raise CodecError(f"Invalid base32: {error}") from error
+
+
+class HexDecoder(AlignedDecoder):
+    block = 2
+
+    def decode(self, data: bytes) -> bytes:
+        try:
+            return binascii.unhexlify(data)
+        except binascii.Error as error:
+            raise CodecError(f"Invalid hex: {error}") from error
+
+    def finish(self) -> bytes:
+        if self.buffer:
+            raise CodecError("Invalid hex: odd number of digits")
+        return b""
+
+
+class UrlDecoder(Codec):
+    def __init__(self) -> None:
+        self.buffer = b""
+
+    def update(self, data: bytes) -> bytes:
+        data = self.buffer + data
+        # keep a trailing partial escape (% or %X) for the next chunk
+        cut = data.rfind(b"%", max(0, len(data) - 2))
+        if cut != -1:
+            data, self.buffer = data[:cut], data[cut:]
+        else:
+            self.buffer = b""
+        return unquote_to_bytes(data.replace(b"+", b" "))
+
+    def finish(self) -> bytes:
+        data, self.buffer = self.buffer, b""
+        return unquote_to_bytes(data.replace(b"+", b" "))
+
+
+class GzipDecoder(Codec):
+    def __init__(self) -> None:
+        # wbits=47 accepts both gzip and zlib headers
+        self.decompressor = zlib.decompressobj(wbits=47)
+
+    def update(self, data: bytes) -> bytes:
+        try:
+            return self.decompressor.decompress(data)
+        except zlib.error as error:
+            raise CodecError(f"Invalid gzip: {error}") from error
+
+    def finish(self) -> bytes:
+        return self.decompressor.flush()
+
+
+class AlignedEncoder(Codec):
+    block = 1
+
+    def __init__(self) -> None:
+        self.buffer = b""
+
+    def encode(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def update(self, data: bytes) -> bytes:
+        self.buffer += data
+        size = len(self.buffer) - len(self.buffer) % self.block
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return self.encode(data) if data else b""
+
+    def finish(self) -> bytes:
+        data, self.buffer = self.buffer, b""
+        return self.encode(data) if data else b""
+
+
+class Base64Encoder(AlignedEncoder):
+    block = 3
+
+    def encode(self, data: bytes) -> bytes:
+        return base64.b64encode(data)
+
+
+class Base32Encoder(AlignedEncoder):
+    block = 5
+
+    def encode(self, data: bytes) -> bytes:
+        return base64.b32encode(data)
+
+
+class HexEncoder(Codec):
+    def update(self, data: bytes) -> bytes:
+        return binascii.hexlify(data)
+
+
+class UrlEncoder(Codec):
+    def update(self, data: bytes) -> bytes:
+        return quote_from_bytes(data, safe="").encode()
+
+
+class GzipEncoder(Codec):
+    def __init__(self) -> None:
+        self.compressor = zlib.compressobj(wbits=31)
+
+    def update(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+DECODERS: Dict[str, Type[Codec]] = {
+    "base64": Base64Decoder,
+    "base32": Base32Decoder,
+    "hex": HexDecoder,
+    "url": UrlDecoder,
+    "gzip": GzipDecoder,
+}
+ENCODERS: Dict[str, Type[Codec]] = {
+    "base64": Base64Encoder,
+    "base32": Base32Encoder,
+    "hex": HexEncoder,
+    "url": UrlEncoder,
+    "gzip": GzipEncoder,
+}
+
+
+class Chain(Codec):
+    def __init__(self, codecs: List[Codec]) -> None:
+        self.codecs = codecs
+
+    def update(self, data: bytes) -> bytes:
+        for codec in self.codecs:
+            data = codec.update(data)
+        return data
+
+    def finish(self) -> bytes:
+        data = b""
+        for codec in self.codecs:
+            data = codec.update(data) + codec.finish()
+        return data
+
+
+def parse_chain(chain: str | List[str]) -> List[str]:
+    names = chain.replace(",", " ").split() if isinstance(chain, str) else chain
+    unknown = [name for name in names if name not in DECODERS]
+    if unknown:
+        raise CodecError(f"Unknown codec: {', '.join(unknown)}")
+    return list(names)
+
+
+def decoder(chain: str | List[str]) -> Chain:
+    return Chain([DECODERS[name]() for name in parse_chain(chain)])
+
+
+def encoder(chain: str | List[str]) -> Chain:
+    return Chain([ENCODERS[name]() for name in parse_chain(chain)])
+
+
+def guess_codec(sample: bytes, complete: bool = False) -> Optional[str]:
+    if sample[:2] == b"\x1f\x8b" or sample[:2] in (b"x\x01", b"x\x9c", b"x\xda"):
+        return "gzip"
+    text = sample.strip(WHITESPACE).replace(b"\r", b"").replace(b"\n", b"")
+    if len(text) < 8:
+        return None
+    if URL_RE.search(text) and b" " not in text:
+        return "url"
+    if HEX_RE.match(text) and (not complete or len(text) % 2 == 0):
+        return "hex"
+    if BASE32_RE.match(text) and (not complete or len(text) % 8 == 0):
+        return "base32"
+    if BASE64_RE.match(text) and (not complete or len(text) % 4 == 0):
+        return "base64"
+    return None
+
+
+def printable(data: bytes) -> bool:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return bool(text.strip()) and "".join(text.split()).isprintable()
+
+
+def plausible_text(data: bytes) -> bool:
+    """Printable data a person could have typed: short, or not one run of
+    base64 characters, as a long encoded blob would be."""
+    text = data.strip(WHITESPACE)
+    return printable(text) and (len(text) < 32 or not BASE64_RE.match(text))
+
+
+def canonical(name: str, sample: bytes, decoded: bytes, complete: bool) -> bool:
+    """True if encoding decoded again gives back the sample exactly."""
+    text = sample.translate(None, WHITESPACE)
+    if name == "base64":
+        urlsafe = b"-" in text or b"_" in text
+        encoded = base64.b64encode(decoded, altchars=b"-_" if urlsafe else None)
+    elif name == "base32":
+        encoded, text = base64.b32encode(decoded), text.upper()
+    elif name == "hex":
+        encoded, text = binascii.hexlify(decoded), text.lower()
+    else:
+        return True
+    # a partial sample only decodes up to its last whole block
+    return encoded == text if complete else text.startswith(encoded)
+
+
+def detect(sample: bytes, complete: bool = False) -> List[str]:
+    """Guesses the decode chain by repeatedly peeling layers off a sample.
+
+    Plain words are often valid base64, base32 or hex too, so a layer is only
+    peeled when the sample is its canonical encoding and the result is text
+    or another recognizable layer. Binary results are accepted only for input
+    that isn't plausible text and didn't come out of a gzip or url layer.
+    """
+    chain: List[str] = []
+    while len(chain) < MAX_DETECT_DEPTH:
+        name = guess_codec(sample, complete)
+        if name is None:
+            break
+        codec = DECODERS[name]()
+        try:
+            decoded = codec.update(sample)
+            if complete:
+                decoded += codec.finish()
+        except CodecError:
+            break
+        if not decoded or not canonical(name, sample, decoded, complete):
+            break
+        encoded = not chain or chain[-1] in ("base64", "base32", "hex")
+        if not (
+            printable(decoded)
+            or guess_codec(decoded, complete)
+            or (encoded and not plausible_text(sample))
+        ):
+            break
+        chain.append(name)
+        sample = decoded
+    return chain
+
+
+def transform(
+    source: BinaryIO,
+    output: BinaryIO,
+    chain: Optional[str | List[str]] = None,
+    encode: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> List[str]:
+    first = source.read(chunk_size)
+    if chain is None:
+        if encode:
+            raise CodecError("Encoding needs an explicit codec chain")
+        chain = detect(first, complete=len(first) < chunk_size)
+        if not chain:
+            raise CodecError("Could not detect the encoding")
+    codec = encoder(chain) if encode else decoder(chain)
+    data = first
+    while data:
+        output.write(codec.update(data))
+        data = source.read(chunk_size)
+    output.write(codec.finish())
+    output.flush()
+    return parse_chain(chain)
+
+
+def command(args: Namespace) -> int:
+    source: Optional[BinaryIO] = None
+    output: Optional[BinaryIO] = None
+    try:
+        source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        chain = transform(source, output, args.chain, encode=args.command == "encode")
+    except CodecError as error:
+        print(f"{args.command}: {error}", file=sys.stderr)
+        return 1
+    except OSError as error:
+        print(f"{args.command}: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not None and source is not sys.stdin.buffer:
+            source.close()
+        if output is not None and output is not sys.stdout.buffer:
+            output.close()
+    if args.chain is None:
+        print(f"detected: {','.join(chain)}", file=sys.stderr)
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    for name, verb in [("decode", "Decode"), ("encode", "Encode")]:
+        parser = subparsers.add_parser(
+            name, help=f"{verb} base64/base32/hex/url/gzip chains"
+        )
+        parser.add_argument("input", nargs="?", default="-", help="file or - for stdin")
+        parser.add_argument("-o", "--output", default="-", help="file or - for stdout")
+        parser.add_argument(
+            "-c",
+            "--chain",
+            help="comma separated codecs, e.g. base64,gzip"
+            + (" (auto-detected if omitted)" if name == "decode" else ""),
+            required=name == "encode",
+        )
+        parser.set_defaults(func=command)
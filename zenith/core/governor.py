@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+from zenith.core.config import get_config, tool_option
+
+config = get_config()
+
+BUDGET_POLL_INTERVAL = 0.25
+
+
+class TokenBucket:
+    """Allows rate events per second on average, with bursts of up to burst."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Takes tokens, sleeping until they are available; returns the wait."""
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # reserve now and sleep outside the lock so waiters queue up in order
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def load_per_cpu() -> Optional[float]:
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def memory_used() -> Optional[float]:
+    """Fraction of physical memory in use, from /proc/meminfo where available."""
+    info = {}
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as meminfo:
+            for line in meminfo:
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0])
+        return 1 - info["MemAvailable"] / info["MemTotal"]
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+class Governor:
+    """Shares concurrency, request rate and host load limits between tool launches.
+
+    Limits of 0 mean unlimited. The CPU and memory budgets only hold back
+    additional launches, so at least one is always allowed to proceed.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 0,
+        rate_limit: float = 0,
+        target_rate_limit: float = 0,
+        cpu_budget: float = 0,
+        memory_budget: float = 0,
+        tool_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        self.global_slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        )
+        self.global_bucket = TokenBucket(rate_limit)
+        self.target_rate_limit = target_rate_limit
+        self.cpu_budget = cpu_budget
+        self.memory_budget = memory_budget
+        self.tool_limits = tool_limits or {}
+        self.lock = threading.Lock()
+        self.active = 0
+        self.tool_slots: Dict[str, Optional[threading.BoundedSemaphore]] = {}
+        self.tool_buckets: Dict[str, TokenBucket] = {}
+        self.target_buckets: Dict[str, TokenBucket] = {}
+
+    def _limit(self, tool: str, key: str) -> float:
+        if tool not in self.tool_limits:
+            self.tool_limits[tool] = {
+                "max_concurrency": float(
+                    tool_option(config, tool, "max_concurrency", "0")
+                ),
+                "rate_limit": float(tool_option(config, tool, "rate_limit", "0")),
+            }
+        return self.tool_limits[tool].get(key, 0)
+
+    def _tool_slots(self, tool: str):
+        with self.lock:
+            if tool not in self.tool_slots:
+                cap = int(self._limit(tool, "max_concurrency"))
+                self.tool_slots[tool] = (
+                    threading.BoundedSemaphore(cap) if cap > 0 else None
+                )
+            return self.tool_slots[tool] or nullcontext()
+
+    def _bucket(self, buckets: Dict[str, TokenBucket], key: str, rate: float):
+        with self.lock:
+            if key not in buckets:
+                buckets[key] = TokenBucket(rate)
+            return buckets[key]
+
+    def throttle(self, target: str) -> float:
+        """Waits for the per-target rate limit only, for probes that are not tools."""
+        return self._bucket(
+            self.target_buckets, target.lower(), self.target_rate_limit
+        ).acquire()
+
+    def over_budget(self) -> bool:
+        if self.cpu_budget > 0:
+            load = load_per_cpu()
+            if load is not None and load > self.cpu_budget:
+                return True
+        if self.memory_budget > 0:
+            used = memory_used()
+            if used is not None and used > self.memory_budget:
+                return True
+        return False
+
+    @contextmanager
+    def slot(self, tool: str, target: Optional[str] = None) -> Iterator[None]:
+        """Blocks until tool may launch against target, and holds a slot meanwhile."""
+        # the tool's own cap comes first so waiters never hold a global slot
+        with self._tool_slots(tool):
+            while self.active > 0 and self.over_budget():
+                time.sleep(BUDGET_POLL_INTERVAL)
+            with self.global_slots or nullcontext():
+                self.global_bucket.acquire()
+                self._bucket(
+                    self.tool_buckets, tool, self._limit(tool, "rate_limit")
+                ).acquire()
+                if target:
+                    self.throttle(target)
+                with self.lock:
+                    self.active += 1
+                try:
+                    yield
+                finally:
+                    with self.lock:
+                        self.active -= 1
+
+
+_governor: Optional[Governor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> Governor:
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = Governor(
+                max_concurrency=config.getint("zenith", "max_concurrency"),
+                rate_limit=config.getfloat("zenith", "rate_limit"),
+                target_rate_limit=config.getfloat("zenith", "target_rate_limit"),
+                cpu_budget=config.getfloat("zenith", "cpu_budget"),
+                memory_budget=config.getfloat("zenith", "memory_budget"),
+            )
+        return _governor
+
+
+def reset_governor() -> None:
+    """Drops the shared governor so the next launch rebuilds it from zenith.cfg."""
+    global _governor
+    with _governor_lock:
+        _governor = None
+
+
+def governed(tool: str, target: Optional[str] = None):
+    return get_governor().slot(tool, target)
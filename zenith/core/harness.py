@@ -0,0 +1,243 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple, Type
+
+from git import RemoteProgress
+
+from zenith.core.repo import GitHubRepo, InstallError
+
+# stand-ins for package managers; every call is logged so calls() can report them
+PIP_STUB = """#!{python}
+import os
+import sys
+
+with open(os.environ["ZENITH_HARNESS_LOG"], "a", encoding="utf-8") as log:
+    log.write("pip " + " ".join(sys.argv[1:]) + "\\n")
+
+packages = []
+args = iter(sys.argv[2:] if sys.argv[1:2] == ["install"] else [])
+for arg in args:
+    if arg == "-r":
+        with open(next(args), encoding="utf-8") as requirements:
+            packages += [line.strip() for line in requirements]
+    elif not arg.startswith("-") and arg != ".":
+        packages.append(arg)
+
+site = os.environ["ZENITH_HARNESS_SITE"]
+for package in packages:
+    for separator in (">=", "==", "<=", ">", "<", "!"):
+        package = package.split(separator)[0]
+    package = package.strip().replace("-", "_")
+    if package and not package.startswith("#"):
+        open(os.path.join(site, package + ".py"), "w").close()
+"""
+
+COMMAND_STUB = """#!/bin/sh
+echo "{name} $*" >> "$ZENITH_HARNESS_LOG"
+"""
+
+SUDO_STUB = """#!/bin/sh
+echo "sudo $*" >> "$ZENITH_HARNESS_LOG"
+exec "$@"
+"""
+
+PACKAGE_MANAGERS = ["apt-get", "brew", "yum", "pacman", "dnf", "zypper"]
+
+
+def git(*args: str, cwd: Optional[str] = None) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def registered_repos() -> List[Type[GitHubRepo]]:
+    from zenith.core.catalog import tools
+
+    return [
+        type(tool.load())
+        for tool in tools()
+        if tool.entry["kind"] == "repo" and tool.entry.get("factory")
+    ]
+
+
+class RequirementsRepo(GitHubRepo):
+    """Installs from a requirements file, so pip really runs during install."""
+
+    def __init__(self):
+        super().__init__(
+            path="zenith-harness/requirements-tool",
+            install={"pip": "requirements.txt"},
+            description="Harness tool installed from requirements.txt",
+        )
+
+    def run(self) -> int:
+        return 0
+
+
+SCENARIO_REPOS: List[Type[GitHubRepo]] = [RequirementsRepo]
+
+
+def default_files(repo: GitHubRepo, file_count: int = 20) -> Dict[str, str]:
+    """Builds a plausible checkout for repo that satisfies its install options."""
+    files = {
+        f"src/module_{index}.py": f"VALUE = {index}\n" for index in range(file_count)
+    }
+    files["README.md"] = f"# {repo.name}\n"
+    packages = (
+        repo.install_options.get("pip")
+        if isinstance(repo.install_options, dict)
+        else None
+    )
+    if isinstance(packages, str) and not packages.startswith("pip install"):
+        files[packages] = f"zenith-harness-{repo.name.lower()}-dep\n"
+    else:
+        files["pyproject.toml"] = f'[project]\nname = "{repo.name}"\n'
+    return files
+
+
+class InstallHarness:
+    """Runs GitHubRepo installs against local bare remotes and stub package managers.
+
+    Inside the context, INSTALL_DIR, the clone base URL, PATH and the metrics log
+    all point into a scratch directory, so nothing touches GitHub, pip or sudo.
+    """
+
+    def __init__(self, root: Optional[str] = None, quiet: bool = True) -> None:
+        self.quiet = quiet
+        self._tmp = None if root else tempfile.TemporaryDirectory()
+        self.root = root or self._tmp.name  # type: ignore[union-attr]
+        self.remotes = os.path.join(self.root, "remotes")
+        self.install_dir = os.path.join(self.root, "install")
+        self.bin_dir = os.path.join(self.root, "bin")
+        self.site_dir = os.path.join(self.root, "site")
+        self.log_file = os.path.join(self.root, "calls.log")
+        self._patches: List[Tuple[object, str, object]] = []
+        self._environ: Dict[str, Optional[str]] = {}
+        self._cwd = os.getcwd()
+
+    def __enter__(self) -> "InstallHarness":
+        import zenith.core.metrics
+        import zenith.core.repo
+
+        for directory in (self.remotes, self.install_dir, self.bin_dir, self.site_dir):
+            os.makedirs(directory, exist_ok=True)
+        self._write_stubs()
+        python_path = os.pathsep.join(
+            filter(None, [self.site_dir, os.environ.get("PYTHONPATH")])
+        )
+        environ = {
+            "PATH": self.bin_dir + os.pathsep + os.environ.get("PATH", ""),
+            "PYTHONPATH": python_path,
+            "ZENITH_HARNESS_LOG": self.log_file,
+            "ZENITH_HARNESS_SITE": self.site_dir,
+        }
+        self._environ = {key: os.environ.get(key) for key in environ}
+        os.environ.update(environ)
+        self._patch(zenith.core.repo, "INSTALL_DIR", self.install_dir)
+        self._patch(zenith.core.repo, "confirm", lambda *_: True)
+        self._patch(
+            zenith.core.metrics,
+            "METRICS_FILE",
+            os.path.join(self.root, "metrics.jsonl"),
+        )
+        if self.quiet:
+            self._patch(zenith.core.repo, "GitProgress", RemoteProgress)
+        config = zenith.core.repo.config
+        self._config = {
+            key: config.get("zenith", key) for key in ("git_base_url", "ssh_clone")
+        }
+        config.set("zenith", "git_base_url", f"file://{self.remotes}")
+        config.set("zenith", "ssh_clone", "false")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        import zenith.core.repo
+
+        os.chdir(self._cwd)
+        for key, value in self._config.items():
+            zenith.core.repo.config.set("zenith", key, value)
+        for module, name, value in reversed(self._patches):
+            setattr(module, name, value)
+        self._patches = []
+        for key, value in self._environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if self._tmp:
+            self._tmp.cleanup()
+
+    def _patch(self, module, name: str, value) -> None:
+        self._patches.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    def _write_stubs(self) -> None:
+        stubs = {name: COMMAND_STUB.format(name=name) for name in PACKAGE_MANAGERS}
+        stubs["sudo"] = SUDO_STUB
+        stubs["pip"] = PIP_STUB.format(python=sys.executable)
+        for name, script in stubs.items():
+            path = os.path.join(self.bin_dir, name)
+            with open(path, "w", encoding="utf-8") as stub:
+                stub.write(script)
+            os.chmod(path, 0o755)
+
+    def add_remote(self, path: str, files: Dict[str, str]) -> str:
+        """Creates a bare repository served at <git_base_url>/<path>."""
+        remote = os.path.join(self.remotes, path)
+        work = tempfile.mkdtemp(dir=self.root)
+        try:
+            git("init", "-q", "-b", "main", work)
+            for name, content in files.items():
+                file_path = os.path.join(work, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w", encoding="utf-8") as file:
+                    file.write(content)
+            git("add", "-A", cwd=work)
+            git(
+                "-c",
+                "user.name=zenith",
+                "-c",
+                "user.email=zenith@localhost",
+                "commit",
+                "-q",
+                "-m",
+                "initial",
+                cwd=work,
+            )
+            git("clone", "-q", "--bare", work, remote)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        return remote
+
+    def tool(self, repo_class: Type[GitHubRepo], file_count: int = 20) -> GitHubRepo:
+        """Instantiates repo_class inside the harness, creating its remote if needed."""
+        repo = repo_class()
+        if not os.path.exists(os.path.join(self.remotes, repo.path)):
+            self.add_remote(repo.path, default_files(repo, file_count))
+        return repo
+
+    def calls(self) -> List[str]:
+        """Returns the logged package manager and sudo invocations, oldest first."""
+        try:
+            with open(self.log_file, encoding="utf-8") as log:
+                return log.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def install(self, repo: GitHubRepo, fresh: bool = True) -> Dict[str, float]:
+        """Runs the full install flow and returns the time spent in each step."""
+        if fresh and os.path.exists(repo.full_path):
+            shutil.rmtree(repo.full_path)
+        timings = {}
+        started = time.perf_counter()
+        repo.install(no_confirm=True)
+        timings["install"] = time.perf_counter() - started
+        started = time.perf_counter()
+        installed = repo.installed()
+        timings["installed"] = time.perf_counter() - started
+        os.chdir(self._cwd)
+        if not installed:
+            raise InstallError(f"{repo} reports not installed after install")
+        return timings
@@ -1,4 +1,5 @@
 import os.path
+from collections.abc import Iterable
 from typing import List
 
 from zenith.core.config import INSTALL_DIR, get_config
@@ -25,3 +26,17 @@ def add_host(host: str) -> None:
         raise ValueError
     with open(full_path, "a", encoding="utf-8") as hostfile:
         hostfile.write(f"\n{host}")
+
+
+def add_hosts(hosts: Iterable[str]) -> List[str]:
+    known = set(get_hosts())
+    new_hosts = []
+    for host in hosts:
+        host = host.strip()
+        if host and host not in known:
+            known.add(host)
+            new_hosts.append(host)
+    if new_hosts:
+        with open(full_path, "a", encoding="utf-8") as hostfile:
+            hostfile.write("".join(f"\n{host}" for host in new_hosts))
+    return new_hosts
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from zenith.__version__ import __version__
+from zenith.core.cache import touch
+from zenith.core.config import INSTALL_DIR, get_config
+
+config = get_config()
+
+CACHE_DIR = os.path.join(INSTALL_DIR, "cache", "http")
+USER_AGENT = f"zenith/{__version__}"
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+# request headers that change the response and so belong in the cache key
+VARY_HEADERS = ["Accept", "Authorization"]
+
+
+def cache_key(url: str, headers: Dict[str, str]) -> str:
+    vary = [f"{name}:{headers.get(name, '')}" for name in VARY_HEADERS]
+    return hashlib.sha256("\n".join([url] + vary).encode()).hexdigest()
+
+
+def max_age(headers) -> Optional[int]:
+    """Freshness lifetime from Cache-Control; 0 for no-cache, None if absent."""
+    control = headers.get("Cache-Control", "").lower()
+    if "no-cache" in control or "no-store" in control:
+        return 0
+    match = re.search(r"max-age=(\d+)", control)
+    return int(match.group(1)) if match else None
+
+
+class DiskCache:
+    """Response bodies plus their validators, one metadata and one body file each."""
+
+    def __init__(self, path: str = CACHE_DIR) -> None:
+        self.path = path
+
+    def _files(self, key: str):
+        base = os.path.join(self.path, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, key: str) -> Optional[Dict]:
+        meta_file, body_file = self._files(key)
+        try:
+            with open(meta_file, encoding="utf-8") as meta:
+                entry = json.load(meta)
+            with open(body_file, "rb") as body:
+                entry["body"] = body.read()
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, url: str, response: requests.Response) -> None:
+        meta_file, body_file = self._files(key)
+        entry = {
+            "url": url,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "stored": time.time(),
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_file), exist_ok=True)
+            # body first, so a metadata file always has the body it describes
+            for path, data, mode in [
+                (body_file, response.content, "wb"),
+                (meta_file, json.dumps(entry).encode(), "wb"),
+            ]:
+                tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_file, mode) as cache_file:
+                    cache_file.write(data)
+                os.replace(tmp_file, path)
+        except OSError:
+            pass
+
+    def used(self, key: str) -> None:
+        # freshness comes from "stored", so the mtime is free to track use for LRU
+        touch(self._files(key)[0])
+
+    def touch(self, key: str) -> None:
+        """Restarts an entry's freshness after the server confirmed it with a 304."""
+        meta_file, _ = self._files(key)
+        entry = self.get(key)
+        if entry is None:
+            return
+        entry.pop("body")
+        entry["stored"] = time.time()
+        tmp_file = f"{meta_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as meta:
+                json.dump(entry, meta)
+            os.replace(tmp_file, meta_file)
+        except OSError:
+            pass
+
+
+def cached_response(entry: Dict, request: requests.PreparedRequest):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.url = entry["url"]
+    response.request = request
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+class Session:
+    """A pooled requests session with retries and a conditional-request disk cache.
+
+    Fresh entries (Cache-Control max-age, or ttl when the server sends none)
+    are served without touching the network; stale ones are revalidated with
+    If-None-Match / If-Modified-Since so an unchanged resource costs a 304.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = CACHE_DIR,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        ttl: int = 0,
+        pool_size: int = 16,
+    ) -> None:
+        self.cache = DiskCache(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self.ttl = ttl
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=["GET", "HEAD"],
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, params=None, headers=None, **kwargs) -> requests.Response:
+        request = self.session.prepare_request(
+            requests.Request("GET", url, params=params, headers=headers)
+        )
+        kwargs.setdefault("timeout", self.timeout)
+        if self.cache is None:
+            return self.session.send(request, **kwargs)
+
+        key = cache_key(request.url, request.headers)
+        entry = self.cache.get(key)
+        if entry is not None:
+            lifetime = max_age(entry["headers"])
+            if time.time() - entry["stored"] < (
+                self.ttl if lifetime is None else lifetime
+            ):
+                self.cache.used(key)
+                return cached_response(entry, request)
+            if "ETag" in entry["headers"]:
+                request.headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                request.headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = self.session.send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return cached_response(entry, request)
+        response.from_cache = False
+        control = response.headers.get("Cache-Control", "").lower()
+        if response.status_code == 200 and "no-store" not in control:
+            self.cache.put(key, request.url, response)
+        return response
+
+    def get_json(self, url: str, params=None, headers=None, **kwargs):
+        response = self.get(url, params=params, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def paginate(self, url: str, params=None, headers=None, **kwargs) -> Iterator:
+        """Yields the items of a JSON list API, following Link: rel="next" headers."""
+        while url:
+            response = self.get(url, params=params, headers=headers, **kwargs)
+            response.raise_for_status()
+            yield from response.json()
+            url = response.links.get("next", {}).get("url")
+            # the next link already carries the query string
+            params = None
+
+
+_session: Optional[Session] = None
+_session_lock = threading.Lock()
+
+
+def session() -> Session:
+    """The process-wide session, configured from the [zenith] http_* options."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = Session(
+                retries=config.getint("zenith", "http_retries"),
+                backoff=config.getfloat("zenith", "http_backoff"),
+                timeout=config.getfloat("zenith", "http_timeout"),
+                ttl=config.getint("zenith", "http_cache_ttl"),
+            )
+        return _session
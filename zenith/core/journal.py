@@ -0,0 +1,139 @@
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterable
+from typing import Dict, List, Optional
+
+from zenith.core.config import INSTALL_DIR
+
+JOURNAL_DIR = os.path.join(INSTALL_DIR, "journals")
+
+
+class JournalError(Exception):
+    pass
+
+
+def journal_path(run_id: str) -> str:
+    return os.path.join(JOURNAL_DIR, f"{run_id}.jsonl")
+
+
+class Journal:
+    """Append-only record of the finished units of a batch run.
+
+    The first line holds the tool and the parameters needed to restart it;
+    every later line marks one unit (username, domain, shard...) as done.
+    Lines are written with a single O_APPEND write, so a killed run loses
+    at most the unit it was working on.
+    """
+
+    def __init__(self, run_id: str, tool: str, params: Dict) -> None:
+        self.run_id = run_id
+        self.tool = tool
+        self.params = params
+        self.path = journal_path(run_id)
+        self.completed: Dict[str, Dict] = {}
+
+    @classmethod
+    def create(cls, tool: str, params: Dict) -> "Journal":
+        run_id = f"{tool}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:4]}"
+        journal = cls(run_id, tool, params)
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        journal._append({"tool": tool, "params": params, "created": time.time()})
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str) -> "Journal":
+        try:
+            with open(journal_path(run_id), encoding="utf-8") as journal_file:
+                lines = journal_file.read().splitlines()
+        except FileNotFoundError:
+            raise JournalError(f"No unfinished run with id {run_id}") from None
+        header = json.loads(lines[0])
+        journal = cls(run_id, header["tool"], header["params"])
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # torn last line from a killed run; that unit simply reruns
+                continue
+            journal.completed[entry["unit"]] = entry.get("result", {})
+        return journal
+
+    def _append(self, entry: Dict) -> None:
+        line = (json.dumps(entry, sort_keys=True) + "\n").encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def done(self, unit: str) -> bool:
+        return unit in self.completed
+
+    def pending(self, units: Iterable[str]) -> List[str]:
+        return [unit for unit in units if unit not in self.completed]
+
+    def complete(self, unit: str, **result) -> None:
+        self.completed[unit] = result
+        self._append({"unit": unit, "result": result, "finished": time.time()})
+
+    def finish(self) -> None:
+        """Removes the journal once every unit is done; there is nothing to resume."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def unfinished() -> List[Journal]:
+    try:
+        names = sorted(os.listdir(JOURNAL_DIR))
+    except FileNotFoundError:
+        return []
+    journals = []
+    for name in names:
+        if name.endswith(".jsonl"):
+            try:
+                journals.append(Journal.load(name[: -len(".jsonl")]))
+            except (JournalError, ValueError, KeyError, IndexError):
+                continue
+    return journals
+
+
+def resume(run_id: Optional[str]) -> int:
+    from zenith.console import console
+    from zenith.core.cluster import find_tool
+    from zenith.core.results import record_run
+
+    if not run_id:
+        journals = unfinished()
+        if not journals:
+            console.print("No interrupted runs to resume", style="info")
+            return 0
+        console.print("Interrupted runs:", style="info")
+        for journal in journals:
+            console.print(
+                f"  {journal.run_id}  ({len(journal.completed)} units done)",
+                style="tool_description",
+            )
+        return 0
+    try:
+        journal = Journal.load(run_id)
+    except JournalError as error:
+        console.print(str(error), style="error")
+        return 1
+    tool = find_tool(journal.tool)
+    if tool is None or not hasattr(tool, "resume"):
+        console.print(f"{journal.tool} runs cannot be resumed", style="error")
+        return 1
+    console.print(
+        f"Resuming {run_id}: skipping {len(journal.completed)} finished units",
+        style="info",
+    )
+    try:
+        with record_run(str(tool), f"--resume {run_id}") as run:
+            run.exit_code = tool.resume(journal)
+    except KeyboardInterrupt:
+        return 130
+    return run.exit_code
@@ -9,6 +9,9 @@ from rich.text import Text
 
 from zenith.console import console
 from zenith.core.config import INSTALL_DIR
+from zenith.core.metrics import measure
+from zenith.core.results import record_run
+from zenith.core.status import badges, installed, record
 
 BACK_COMMANDS = ["back", "return"]
 
@@ -81,12 +84,25 @@ def input_wait():
     clear_screen()
 
 
+def status_badge(status, installable=True):
+    if not installable:
+        return Text("built-in", style="tool_description")
+    if status is None:
+        return Text("checking…", style="tool_description")
+    if status:
+        return Text("installed", style="success")
+    return Text("not installed", style="warning")
+
+
 def tools_cli(name, tools, links=True):
     table = Table(box=box.ROUNDED, border_style="table_border", title_style="highlight")
     table.add_column("Name", style="tool_name", no_wrap=True, width=20)
     table.add_column("Description", style="tool_description", min_width=40)
     if links:
         table.add_column("Repository", style="link", no_wrap=True, width=30)
+    statuses = badges(tools)
+    if statuses:
+        table.add_column("Status", no_wrap=True, width=15)
 
     tools_dict = {}
     for tool in tools:
@@ -96,6 +112,8 @@ def tools_cli(name, tools, links=True):
             text_link = Text(f"{tool.path}")
             text_link.stylize(Style(link=f"https://github.com/{tool.path}"))
             args.append(text_link)
+        if statuses:
+            args.append(status_badge(statuses.get(str(tool)), str(tool) in statuses))
         table.add_row(*args)
 
     console.print()
@@ -121,7 +139,7 @@ def tools_cli(name, tools, links=True):
         return tools_cli(name, tools, links)
     tool = tools_dict.get(selected_tool)
 
-    if hasattr(tool, "install") and not tool.installed():
+    if hasattr(tool, "install") and not installed(tool):
 
         console.print(f"\n{selected_tool} is not installed.", style="warning")
         from zenith.core.repo import InstallError
@@ -130,9 +148,12 @@ def tools_cli(name, tools, links=True):
             console.print(f"Installing {selected_tool}...", style="info")
             try:
 
-                tool.install(no_confirm=True)
+                with measure(selected_tool, "install"):
+                    tool.install(no_confirm=True)
 
-                if not tool.installed():
+                verified = tool.installed()
+                record(tool, verified)
+                if not verified:
                     console.print(
                         f"Installation failed: Tool verification check failed",
                         style="error",
@@ -155,7 +176,9 @@ def tools_cli(name, tools, links=True):
     try:
         console.print(f"\nRunning {selected_tool}...", style="info")
         console.print("─" * 50, style="info")
-        response = tool.run()
+        with record_run(str(tool)) as run, measure(str(tool), "run") as metric:
+            response = tool.run()
+            run.exit_code = metric.exit_code = response
 
         if response and response > 0 and response != 256:
             console.print("─" * 50, style="info")
@@ -0,0 +1,200 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from zenith.core.config import INSTALL_DIR
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None  # type: ignore[assignment]
+
+METRICS_FILE = os.path.join(INSTALL_DIR, "metrics.jsonl")
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class Measurement:
+    def __init__(self, tool: str, phase: str) -> None:
+        self.tool = tool
+        self.phase = phase
+        self.exit_code: Optional[int] = None
+
+
+def _usage() -> Tuple[float, int]:
+    if resource is None:
+        return time.process_time(), 0
+    cpu = 0.0
+    rss = 0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        cpu += usage.ru_utime + usage.ru_stime
+        rss = max(rss, usage.ru_maxrss * RSS_UNIT)
+    return cpu, rss
+
+
+def append(record: Dict[str, object], path: Optional[str] = None) -> None:
+    line = (json.dumps(record, sort_keys=True) + "\n").encode()
+    # a single O_APPEND write keeps lines intact across concurrent processes
+    fd = os.open(path or METRICS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def measure(tool: str, phase: str) -> Iterator[Measurement]:
+    """Records wall time, CPU time, peak RSS and exit code of a block."""
+    measurement = Measurement(tool, phase)
+    cpu_start, _ = _usage()
+    started = time.time()
+    wall_start = time.perf_counter()
+    error = None
+    try:
+        yield measurement
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu_end, peak_rss = _usage()
+        exit_code = measurement.exit_code
+        if exit_code is None:
+            exit_code = 1 if error else 0
+        try:
+            append(
+                {
+                    "tool": tool,
+                    "phase": phase,
+                    "started": started,
+                    "wall": round(wall, 6),
+                    "cpu": round(cpu_end - cpu_start, 6),
+                    # process-lifetime peak of zenith and its reaped children
+                    "peak_rss": peak_rss,
+                    "exit_code": exit_code,
+                    "error": error,
+                }
+            )
+        except OSError:
+            pass
+
+
+def load(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    records = []
+    try:
+        with open(path or METRICS_FILE, encoding="utf-8") as metrics_file:
+            for line in metrics_file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = (len(values) - 1) * pct
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Dict[str, float]]:
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        groups[(record["tool"], record["phase"])].append(record)
+    summary = {}
+    for key, group in sorted(groups.items()):
+        walls = [record["wall"] for record in group]
+        summary[key] = {
+            "count": len(group),
+            "failures": sum(1 for record in group if record.get("exit_code")),
+            "p50": percentile(walls, 0.5),
+            "p95": percentile(walls, 0.95),
+            "sum": sum(walls),
+            "cpu": sum(record["cpu"] for record in group),
+            "peak_rss": max(record.get("peak_rss") or 0 for record in group),
+        }
+    return summary
+
+
+def prometheus(summary: Dict[Tuple[str, str], Dict[str, float]]) -> str:
+    lines = [
+        "# HELP zenith_phase_seconds Wall time of zenith tool phases.",
+        "# TYPE zenith_phase_seconds summary",
+    ]
+    for (tool, phase), stats in summary.items():
+        labels = f'tool="{tool}",phase="{phase}"'
+        lines.append(f'zenith_phase_seconds{{{labels},quantile="0.5"}} {stats["p50"]}')
+        lines.append(f'zenith_phase_seconds{{{labels},quantile="0.95"}} {stats["p95"]}')
+        lines.append(f"zenith_phase_seconds_sum{{{labels}}} {stats['sum']}")
+        lines.append(f"zenith_phase_seconds_count{{{labels}}} {stats['count']}")
+    lines.append(
+        "# HELP zenith_phase_cpu_seconds_total CPU time of zenith tool phases."
+    )
+    lines.append("# TYPE zenith_phase_cpu_seconds_total counter")
+    for (tool, phase), stats in summary.items():
+        labels = f'tool="{tool}",phase="{phase}"'
+        lines.append(f"zenith_phase_cpu_seconds_total{{{labels}}} {stats['cpu']}")
+    lines.append("# HELP zenith_phase_failures_total Phases with a non-zero exit code.")
+    lines.append("# TYPE zenith_phase_failures_total counter")
+    for (tool, phase), stats in summary.items():
+        labels = f'tool="{tool}",phase="{phase}"'
+        lines.append(f"zenith_phase_failures_total{{{labels}}} {stats['failures']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, summary: Dict[Tuple[str, str], Dict[str, float]]):
+    # node_exporter may read at any time, so replace the file atomically
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as textfile:
+        textfile.write(prometheus(summary))
+    os.replace(tmp_path, path)
+
+
+def print_stats(prometheus_file: Optional[str] = None) -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    summary = summarize(load())
+    if not summary:
+        console.print("No metrics recorded yet", style="info")
+        return
+    table = Table(
+        "Tool",
+        "Phase",
+        "Runs",
+        "Failed",
+        "p50 (s)",
+        "p95 (s)",
+        "CPU (s)",
+        "Peak RSS (MB)",
+        title="Zenith Runtime Stats",
+        title_style="highlight",
+    )
+    for (tool, phase), stats in summary.items():
+        table.add_row(
+            tool,
+            phase,
+            str(stats["count"]),
+            str(stats["failures"]),
+            f"{stats['p50']:.2f}",
+            f"{stats['p95']:.2f}",
+            f"{stats['cpu']:.2f}",
+            f"{stats['peak_rss'] / (1 << 20):.1f}",
+        )
+    console.print(table)
+    if prometheus_file:
+        write_prometheus(prometheus_file, summary)
+        console.print(f"Prometheus metrics written to {prometheus_file}", style="info")
@@ -0,0 +1,364 @@
+import asyncio
+import inspect
+import socket
+import time
+from argparse import Namespace
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Dict, List, NamedTuple, Optional
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_PORTS = [21, 22, 25, 53, 80, 110, 143, 443, 445, 3306, 3389, 8080, 8443]
+
+_END = object()
+
+
+class Record(NamedTuple):
+    kind: str
+    value: str
+    data: Dict[str, str] = {}
+
+
+class StageStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.received = 0
+        self.emitted = 0
+        self.busy = 0.0
+        self.first_output: Optional[float] = None
+        self.finished: Optional[float] = None
+
+
+class Stage:
+    """One step of a pipeline.
+
+    function gets an item (or a list of up to batch items) and returns the
+    items to pass on: a list, an async iterator, or a coroutine returning a
+    list. Blocking functions run in threads unless threaded is False.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable,
+        workers: int = 1,
+        batch: int = 0,
+        threaded: bool = True,
+    ) -> None:
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+        self.batch = batch
+        self.threaded = threaded
+
+    async def call(self, item) -> AsyncIterator:
+        if inspect.isasyncgenfunction(self.function):
+            async for output in self.function(item):
+                yield output
+            return
+        if inspect.iscoroutinefunction(self.function):
+            outputs = await self.function(item)
+        elif self.threaded:
+            outputs = await asyncio.to_thread(self.function, item)
+        else:
+            outputs = self.function(item)
+        for output in outputs or []:
+            yield output
+
+
+class Pipeline:
+    """Connects stages through bounded queues so they all run at the same time.
+
+    A stage starts on the first item its predecessor emits, and a full queue
+    blocks the stage feeding it, so fast stages never run far ahead of slow
+    ones and memory stays bounded by the queue sizes.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats = [StageStats(stage.name) for stage in stages]
+        self.started = 0.0
+
+    async def _next_batch(self, queue: asyncio.Queue, size: int):
+        item = await queue.get()
+        if item is _END or not size:
+            return item
+        batch = [item]
+        # take whatever is already waiting without holding up the first item
+        while len(batch) < size and not queue.empty():
+            item = queue.get_nowait()
+            if item is _END:
+                queue.put_nowait(item)
+                break
+            batch.append(item)
+        return batch
+
+    async def _worker(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+    ) -> None:
+        while True:
+            item = await self._next_batch(inbox, stage.batch)
+            if item is _END:
+                # leave the marker for this stage's other workers
+                inbox.put_nowait(_END)
+                return
+            stats.received += len(item) if stage.batch else 1
+            started = time.perf_counter()
+            async for output in stage.call(item):
+                stats.emitted += 1
+                if stats.first_output is None:
+                    stats.first_output = time.perf_counter() - self.started
+                if outbox is not None:
+                    stats.busy += time.perf_counter() - started
+                    await outbox.put(output)
+                    started = time.perf_counter()
+            stats.busy += time.perf_counter() - started
+
+    async def _stage(self, index: int, queues: List[asyncio.Queue]) -> None:
+        stage, stats = self.stages[index], self.stats[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+        await asyncio.gather(
+            *(
+                self._worker(stage, stats, queues[index], outbox)
+                for _ in range(stage.workers)
+            )
+        )
+        stats.finished = time.perf_counter() - self.started
+        if outbox is not None:
+            await outbox.put(_END)
+
+    async def _feed(self, items: Iterable, queue: asyncio.Queue) -> None:
+        for item in items:
+            await queue.put(item)
+        await queue.put(_END)
+
+    async def run_async(self, items: Iterable) -> List[StageStats]:
+        self.started = time.perf_counter()
+        # the last stage is the sink, nothing reads its output
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        tasks = [asyncio.ensure_future(self._feed(items, queues[0]))] + [
+            asyncio.ensure_future(self._stage(index, queues))
+            for index in range(len(self.stages))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self.stats
+
+    def run(self, items: Iterable) -> List[StageStats]:
+        return asyncio.run(self.run_async(items))
+
+
+def harvest_stage(sources: List[str], ttl: int, workers: int = 8) -> Stage:
+    from zenith.enumeration.theHarvester import RESULT_KEYS, theHarvester
+
+    async def harvest(domain: str) -> AsyncIterator[Record]:
+        # one thread per source, so hosts flow on as soon as the first source answers
+        queries = [
+            asyncio.to_thread(theHarvester.query, domain, source, ttl)
+            for source in sources
+        ]
+        for query in asyncio.as_completed(queries):
+            results = await query
+            for key in RESULT_KEYS:
+                for value in results[key]:
+                    yield Record(key[:-1], value, {"domain": domain})
+
+    return Stage("theHarvester", harvest, workers=workers)
+
+
+def inventory_stage() -> Stage:
+    from zenith.core.hosts import add_hosts
+
+    seen = set()
+
+    def inventory(records: List[Record]) -> List[Record]:
+        fresh = [r for r in records if r.kind != "host" or r.value not in seen]
+        seen.update(r.value for r in fresh if r.kind == "host")
+        add_hosts([r.value for r in fresh if r.kind == "host"])
+        return fresh
+
+    return Stage("inventory", inventory, batch=64)
+
+
+def dns_stage(workers: int = 16) -> Stage:
+    async def resolve(records: List[Record]) -> List[Record]:
+        loop = asyncio.get_running_loop()
+        hosts = [r for r in records if r.kind == "host"]
+        answers = await asyncio.gather(
+            *(loop.getaddrinfo(r.value, None, type=socket.SOCK_STREAM) for r in hosts),
+            return_exceptions=True,
+        )
+        resolved = list(records)
+        for record, answer in zip(hosts, answers):
+            if isinstance(answer, Exception):
+                continue
+            for ip in sorted({info[4][0] for info in answer}):
+                resolved.append(Record("ip", ip, {"host": record.value}))
+        return resolved
+
+    return Stage("dns", resolve, workers=workers, batch=32)
+
+
+def scan_stage(ports: List[int], timeout: float, workers: int = 32) -> Stage:
+    from zenith.core.governor import get_governor
+
+    seen = set()
+    governor = get_governor()
+
+    async def probe(ip: str, port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def scan(record: Record) -> List[Record]:
+        if record.kind != "ip" or record.value in seen:
+            return [record]
+        seen.add(record.value)
+        # the shared per-target rate limit applies to scans as it does to tools
+        await asyncio.to_thread(governor.throttle, record.value)
+        states = await asyncio.gather(*(probe(record.value, port) for port in ports))
+        return [record] + [
+            Record("port", str(port), {"ip": record.value})
+            for port, state in zip(ports, states)
+            if state
+        ]
+
+    return Stage("scan", scan, workers=workers)
+
+
+def store_stage(run) -> Stage:
+    def store(records: List[Record]) -> List[Record]:
+        for record in records:
+            run.add(record.kind, record.value, **record.data)
+        return records
+
+    return Stage("results", store, batch=256, threaded=False)
+
+
+def recon(
+    domains: List[str],
+    sources: List[str],
+    ports: List[int],
+    ttl: int = 0,
+    timeout: float = 1.0,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    run=None,
+) -> Pipeline:
+    stages = [harvest_stage(sources, ttl), inventory_stage(), dns_stage()]
+    if ports:
+        stages.append(scan_stage(ports, timeout))
+    if run is not None:
+        stages.append(store_stage(run))
+    return Pipeline(stages, queue_size)
+
+
+def print_stats(stats: List[StageStats], elapsed: float) -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    table = Table(
+        "Stage", "In", "Out", "Busy", "First out", "Done", title_style="highlight"
+    )
+    for stage in stats:
+        table.add_row(
+            stage.name,
+            str(stage.received),
+            str(stage.emitted),
+            f"{stage.busy:.2f}s",
+            "-" if stage.first_output is None else f"{stage.first_output:.2f}s",
+            "-" if stage.finished is None else f"{stage.finished:.2f}s",
+        )
+    console.print(table)
+    console.print(
+        f"{elapsed:.2f}s end to end, {sum(s.busy for s in stats):.2f}s of stage work",
+        style="info",
+    )
+
+
+def parse_ports(value: str) -> List[int]:
+    """Parses "22,80,8000-8100" into sorted ports; raises ValueError when invalid."""
+    ports = set()
+    for part in filter(None, value.replace(" ", "").split(",")):
+        start, _, end = part.partition("-")
+        if not start.isdigit() or not (end or start).isdigit():
+            raise ValueError(f"Invalid port or range: {part}")
+        first, last = int(start), int(end or start)
+        if not 1 <= first <= last <= 65535:
+            raise ValueError(f"Ports must be 1-65535 and ranges ascending: {part}")
+        ports.update(range(first, last + 1))
+    if not ports:
+        raise ValueError("No ports given; use --no-scan to skip the port scan")
+    return sorted(ports)
+
+
+def command(args: Namespace) -> int:
+    from zenith.console import console
+    from zenith.core.config import get_config
+    from zenith.core.results import record_run
+    from zenith.enumeration.theHarvester import DEFAULT_SOURCES
+
+    sources = args.sources.replace(",", " ").split() if args.sources else None
+    try:
+        ports = [] if args.no_scan else parse_ports(args.ports)
+    except ValueError as error:
+        console.print(str(error), style="error")
+        return 1
+    ttl = get_config().getint("zenith", "harvester_cache_ttl")
+    started = time.perf_counter()
+    try:
+        with record_run("pipeline", " ".join(args.domains)) as run:
+            pipeline = recon(
+                args.domains,
+                sources or DEFAULT_SOURCES,
+                ports,
+                ttl=ttl,
+                timeout=args.timeout,
+                queue_size=args.queue_size,
+                run=run,
+            )
+            stats = pipeline.run(args.domains)
+    except KeyboardInterrupt:
+        console.print("\nPipeline cancelled", style="warning")
+        return 130
+    print_stats(stats, time.perf_counter() - started)
+    console.print(f"Records stored under run {run.id}", style="success")
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "pipeline",
+        help="stream theHarvester hosts through inventory, DNS and a port scan",
+    )
+    parser.add_argument("domains", nargs="+", metavar="DOMAIN")
+    parser.add_argument("-b", "--sources", help="theHarvester sources, comma separated")
+    parser.add_argument(
+        "-p",
+        "--ports",
+        default=",".join(map(str, DEFAULT_PORTS)),
+        help="TCP ports to probe, e.g. 22,80,8000-8100",
+    )
+    parser.add_argument("--no-scan", action="store_true", help="skip the port scan")
+    parser.add_argument(
+        "--timeout", type=float, default=1.0, help="seconds per port probe"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="items buffered between stages before upstream stages wait",
+    )
+    parser.set_defaults(func=command)
@@ -0,0 +1,108 @@
+import cProfile
+import re
+import subprocess
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# this module is imported before the rest of zenith so it must stay stdlib-only
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_profiler: Optional[cProfile.Profile] = None
+
+
+def start() -> None:
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def start_from_argv(argv: List[str]) -> None:
+    """Starts profiling before zenith's own imports when --profile was passed."""
+    if any(arg == "--profile" or arg.startswith("--profile=") for arg in argv):
+        start()
+
+
+def stop(path: str) -> None:
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.disable()
+    _profiler.dump_stats(path)
+    _profiler = None
+
+
+def import_times(module: str = "zenith.__main__") -> List[Tuple[int, int, int, str]]:
+    """Imports module in a fresh interpreter with -X importtime."""
+    from zenith.bootstrap import python_env
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+        env=python_env(),
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent), name))
+    return entries
+
+
+def attribute_imports(
+    entries: List[Tuple[int, int, int, str]], package: str = "zenith"
+) -> Dict[str, Dict[str, int]]:
+    """Charges every third-party import to the zenith module that triggered it."""
+    report: Dict[str, Dict[str, int]] = {}
+    # importtime prints children before their parent, deepest indent first
+    pending: Dict[int, List[Tuple[int, str]]] = {}
+    for self_us, cumulative_us, depth, name in entries:
+        children = pending.pop(depth + 2, [])
+        if name == package or name.startswith(f"{package}."):
+            external = sum(us for us, child in children if not _is_own(child, package))
+            report[name] = {
+                "self": self_us,
+                "cumulative": cumulative_us,
+                "external": external,
+            }
+        pending.setdefault(depth, []).append((cumulative_us, name))
+    return report
+
+
+def _is_own(name: str, package: str) -> bool:
+    return name == package or name.startswith(f"{package}.")
+
+
+def format_import_report(report: Dict[str, Dict[str, int]]) -> str:
+    lines = [f"{'cumulative ms':>14} {'self ms':>9} {'external ms':>12}  module"]
+    for name, times in sorted(
+        report.items(), key=lambda item: item[1]["cumulative"], reverse=True
+    ):
+        lines.append(
+            f"{times['cumulative'] / 1000:>14.1f} {times['self'] / 1000:>9.1f} "
+            f"{times['external'] / 1000:>12.1f}  {name}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile(path: str) -> Iterator[None]:
+    """Profiles the block into path (cProfile format, e.g. for snakeviz), and
+    zenith's import times into PATH.imports.txt."""
+    start()
+    try:
+        yield
+    finally:
+        stop(path)
+        report = format_import_report(attribute_imports(import_times()))
+        imports_path = f"{path}.imports.txt"
+        with open(imports_path, "w", encoding="utf-8") as report_file:
+            report_file.write(report)
+        print(f"\nProfile written to {path}", file=sys.stderr)
+        print(f"Import times written to {imports_path}", file=sys.stderr)
@@ -11,7 +11,9 @@ from rich.table import Table
 
 from zenith.console import console
 from zenith.core.config import INSTALL_DIR, get_config
+from zenith.core.governor import governed
 from zenith.core.menu import confirm
+from zenith.core.metrics import measure
 from zenith.core.package_manager import (
     detect_os,
     detect_package_manager,
@@ -202,6 +204,10 @@ class GitHubRepo(metaclass=ABCMeta):
         url = f"https://github.com/{self.path}"
         if config.getboolean("zenith", "ssh_clone"):
             url = f"git@github.com:{self.path}.git"
+        base_url = config.get("zenith", "git_base_url")
+        if base_url:
+            # mirrors and local bare repositories laid out as <base>/<owner>/<name>
+            url = f"{base_url.rstrip('/')}/{self.path}"
         Repo.clone_from(url, self.full_path, progress=GitProgress())
         if not os.path.exists(self.full_path):
             raise CloneError(f"{self.full_path} not found")
@@ -214,9 +220,12 @@ class GitHubRepo(metaclass=ABCMeta):
             raise InstallError("User cancelled installation")
 
         if clone:
-            self.clone()
+            with measure(str(self), "clone"):
+                self.clone()
 
-        if self._check_pip_dependencies_installed():
+        with measure(str(self), "deps_check"):
+            deps_installed = self._check_pip_dependencies_installed()
+        if deps_installed:
             return
 
         if not self.install_options:
@@ -358,7 +367,8 @@ class GitHubRepo(metaclass=ABCMeta):
             command = install
 
         if command != "exit 1":
-            result = os.system(command)
+            with governed(str(self)), measure(str(self), "install_command") as metric:
+                result = metric.exit_code = os.system(command)
             if result != 0:
                 raise InstallError(
                     f"Installation command failed with exit code {result}"
@@ -400,7 +410,8 @@ class GitHubRepo(metaclass=ABCMeta):
             return False
 
         if isinstance(self.install_options, dict) and "pip" in self.install_options:
-            return self._check_pip_dependencies_installed()
+            with measure(str(self), "deps_check"):
+                return self._check_pip_dependencies_installed()
 
         return True
 
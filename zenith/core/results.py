@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from argparse import Namespace
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from zenith.core.config import INSTALL_DIR
+
+# cluster workers point each job at a scratch store before shipping it back
+RESULTS_DB = os.environ.get("ZENITH_RESULTS_DB") or os.path.join(
+    INSTALL_DIR, "results.db"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    args TEXT,
+    started REAL NOT NULL,
+    finished REAL,
+    exit_code INTEGER
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    data TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_kind_value ON records(kind, value);
+CREATE INDEX IF NOT EXISTS records_run ON records(run_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    tool, kind, value, data, content='records', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts(rowid, tool, kind, value, data)
+    VALUES (new.id, new.tool, new.kind, new.value, new.data);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts(records_fts, rowid, tool, kind, value, data)
+    VALUES ('delete', old.id, old.tool, old.kind, old.value, old.data);
+END;
+"""
+
+_local = threading.local()
+_current_run: ContextVar[Optional["Run"]] = ContextVar("current_run", default=None)
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Returns this thread's connection to the results store, creating it on demand."""
+    path = path or RESULTS_DB
+    connections = _local.__dict__.setdefault("connections", {})
+    if path not in connections:
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        try:
+            connection.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            # sqlite built without FTS5, search() falls back to LIKE
+            pass
+        connections[path] = connection
+    return connections[path]
+
+
+def disconnect(path: Optional[str] = None) -> None:
+    connection = _local.__dict__.get("connections", {}).pop(path or RESULTS_DB, None)
+    if connection is not None:
+        connection.close()
+
+
+def has_fts(connection: sqlite3.Connection) -> bool:
+    row = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'"
+    ).fetchone()
+    return row is not None
+
+
+class Run:
+    def __init__(self, tool: str, args: str = "", path: Optional[str] = None):
+        self.tool = tool
+        self.path = path
+        self.exit_code: Optional[int] = None
+        self.id = (
+            connect(path)
+            .execute(
+                "INSERT INTO runs (tool, args, started) VALUES (?, ?, ?)",
+                (tool, args, time.time()),
+            )
+            .lastrowid
+        )
+
+    def add(self, kind: str, value: str, **data) -> None:
+        self.add_many(kind, [value], **data)
+
+    def add_many(self, kind: str, values: Iterable[str], **data) -> None:
+        encoded = json.dumps(data, sort_keys=True) if data else None
+        now = time.time()
+        connection = connect(self.path)
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO records (run_id, tool, kind, value, data, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.id, self.tool, kind, value, encoded, now) for value in values],
+            )
+
+    def finish(self, exit_code: Optional[int]) -> None:
+        connect(self.path).execute(
+            "UPDATE runs SET finished = ?, exit_code = ? WHERE id = ?",
+            (time.time(), exit_code, self.id),
+        )
+
+
+@contextmanager
+def record_run(tool: str, args: str = "") -> Iterator[Run]:
+    """Registers a tool run; records added during it via current_run() attach to it."""
+    run = Run(tool, args)
+    token = _current_run.set(run)
+    exit_code: Optional[int] = None
+    try:
+        yield run
+        exit_code = 0 if run.exit_code is None else run.exit_code
+    finally:
+        _current_run.reset(token)
+        run.finish(exit_code)
+
+
+def current_run() -> Optional[Run]:
+    return _current_run.get()
+
+
+def add_records(tool: str, kind: str, values: Iterable[str], **data) -> None:
+    """Adds records to the active run, or to a standalone run when called outside one."""
+    run = current_run()
+    if run is not None:
+        run.add_many(kind, values, **data)
+        return
+    with record_run(tool) as run:
+        run.add_many(kind, values, **data)
+
+
+def export_runs(path: Optional[str] = None) -> List[Dict[str, object]]:
+    """Returns every run in the store with its records nested under "records"."""
+    connection = connect(path)
+    runs = [dict(row) for row in connection.execute("SELECT * FROM runs")]
+    for run in runs:
+        run["records"] = [
+            dict(row)
+            for row in connection.execute(
+                "SELECT kind, value, data, created FROM records WHERE run_id = ?",
+                (run.pop("id"),),
+            )
+        ]
+    return runs
+
+
+def import_runs(runs: List[Dict], path: Optional[str] = None) -> int:
+    """Inserts runs exported from another store; returns the number of records."""
+    connection = connect(path)
+    count = 0
+    with connection:
+        connection.execute("BEGIN")
+        for run in runs:
+            run_id = connection.execute(
+                "INSERT INTO runs (tool, args, started, finished, exit_code) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    run["tool"],
+                    run.get("args"),
+                    run["started"],
+                    run.get("finished"),
+                    run.get("exit_code"),
+                ),
+            ).lastrowid
+            records = run.get("records", [])
+            connection.executemany(
+                "INSERT INTO records (run_id, tool, kind, value, data, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        run["tool"],
+                        record["kind"],
+                        record["value"],
+                        record.get("data"),
+                        record["created"],
+                    )
+                    for record in records
+                ],
+            )
+            count += len(records)
+    return count
+
+
+def _fts_query(query: str) -> str:
+    # quote every term so hosts, emails and URLs are matched literally
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search(
+    query: str,
+    kind: Optional[str] = None,
+    tool: Optional[str] = None,
+    limit: int = 100,
+    path: Optional[str] = None,
+) -> List[Dict[str, object]]:
+    connection = connect(path)
+    filters = ""
+    params: List[object] = []
+    if kind:
+        filters += " AND r.kind = ?"
+        params.append(kind)
+    if tool:
+        filters += " AND r.tool = ?"
+        params.append(tool)
+    if has_fts(connection):
+        sql = (
+            "SELECT r.* FROM records_fts f JOIN records r ON r.id = f.rowid "
+            f"WHERE records_fts MATCH ?{filters} ORDER BY r.id DESC LIMIT ?"
+        )
+        params = [_fts_query(query)] + params
+    else:
+        sql = (
+            "SELECT r.* FROM records r WHERE (r.value LIKE ? OR r.data LIKE ?)"
+            f"{filters} ORDER BY r.id DESC LIMIT ?"
+        )
+        params = [f"%{query}%", f"%{query}%"] + params
+    rows = connection.execute(sql, params + [limit]).fetchall()
+    return [dict(row) for row in rows]
+
+
+def command(args: Namespace) -> int:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    started = time.perf_counter()
+    rows = search(args.query, args.kind, args.tool, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    if not rows:
+        console.print(f"No results for {args.query!r}", style="warning")
+        return 1
+    table = Table("Time", "Tool", "Kind", "Value", "Data", title_style="highlight")
+    for row in rows:
+        table.add_row(
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"])),
+            row["tool"],
+            row["kind"],
+            row["value"],
+            row["data"] or "",
+        )
+    console.print(table)
+    print(f"{len(rows)} results in {elapsed:.1f} ms", file=sys.stderr)
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser("search", help="search results from all tool runs")
+    parser.add_argument("query", help="text to search for, e.g. a host or email")
+    parser.add_argument("-k", "--kind", help="only records of this kind, e.g. host")
+    parser.add_argument("-t", "--tool", help="only records from this tool")
+    parser.add_argument("-n", "--limit", type=int, default=100)
+    parser.set_defaults(func=command)
@@ -0,0 +1,309 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None  # type: ignore[assignment]
+
+# the launcher half of this module runs before every limited tool, so it must
+# stay stdlib-only; zenith imports happen inside the functions that need them
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+CONTROLLERS = ["memory", "cpu", "pids"]
+_config = None
+# the cgroup zenith started in, before it possibly moved itself into a leaf
+_cgroup_base: Optional[str] = None
+_systemd_run: Optional[bool] = None
+_warned = False
+
+LIMIT_KEYS = ["cpu_seconds", "memory_mb", "max_files", "max_processes", "cpu_percent"]
+
+
+class Limits:
+    """Per-run resource limits; 0 leaves a resource unlimited."""
+
+    def __init__(
+        self,
+        cpu_seconds: int = 0,
+        memory_mb: int = 0,
+        max_files: int = 0,
+        max_processes: int = 0,
+        cpu_percent: int = 0,
+    ) -> None:
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_files = max_files
+        self.max_processes = max_processes
+        self.cpu_percent = cpu_percent
+
+    def __bool__(self) -> bool:
+        return any(self.to_dict().values())
+
+    def to_dict(self) -> Dict[str, int]:
+        return {key: getattr(self, key) for key in LIMIT_KEYS}
+
+
+def limits_for(tool: str) -> Limits:
+    """Reads [tool.<name>] limits from zenith.cfg, falling back to [tool.default]."""
+    global _config
+    from zenith.core.config import get_config, tool_option
+
+    if _config is None:
+        _config = get_config()
+    values = {}
+    for key in LIMIT_KEYS:
+        default = tool_option(_config, "default", key, "0")
+        values[key] = int(tool_option(_config, tool, key, default) or 0)
+    return Limits(**values)
+
+
+def apply_rlimits(limits: Limits, grouped: bool = False) -> None:
+    """Limits set in the launched process itself.
+
+    When grouped, a cgroup or systemd scope already enforces memory and
+    process counts, so only the CPU time and open files limits are set.
+    Otherwise memory_mb falls back to RLIMIT_AS, which caps address space
+    rather than memory in use and so breaks e.g. Go and JVM tools well below
+    their real footprint, and max_processes to RLIMIT_NPROC, which counts the
+    processes of the whole user, not of this run.
+    """
+    if resource is None:
+        return
+    rlimits = [
+        (resource.RLIMIT_CPU, limits.cpu_seconds),
+        (resource.RLIMIT_NOFILE, limits.max_files),
+    ]
+    if not grouped:
+        rlimits += [
+            (resource.RLIMIT_AS, limits.memory_mb * 1024 * 1024),
+            (resource.RLIMIT_NPROC, limits.max_processes),
+        ]
+    for kind, value in rlimits:
+        if value <= 0:
+            continue
+        _, hard = resource.getrlimit(kind)
+        soft = value if hard == resource.RLIM_INFINITY else min(value, hard)
+        # the soft CPU limit sends SIGXCPU, the hard one SIGKILL a little later
+        new_hard = soft + 5 if kind == resource.RLIMIT_CPU else soft
+        if hard != resource.RLIM_INFINITY:
+            new_hard = min(new_hard, hard)
+        resource.setrlimit(kind, (soft, new_hard))
+
+
+def own_cgroup() -> Optional[str]:
+    """Path of this process's cgroup v2 directory, if the unified hierarchy is used."""
+    if not os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        return None
+    try:
+        with open("/proc/self/cgroup", encoding="utf-8") as cgroup_file:
+            for line in cgroup_file:
+                if line.startswith("0::"):
+                    return os.path.join(CGROUP_ROOT, line[3:].strip().lstrip("/"))
+    except OSError:
+        pass
+    return None
+
+
+def _write(path: str, value: str) -> None:
+    with open(path, "w", encoding="utf-8") as control:
+        control.write(value)
+
+
+def enable_controllers(base: str) -> bool:
+    """Turns on the memory, cpu and pids controllers for children of base.
+
+    cgroup v2 only lets a cgroup without member processes delegate controllers
+    (the no-internal-process rule), so when zenith is alone in base it first
+    moves itself into a leaf child. If other processes share base, it can't.
+    """
+    try:
+        with open(os.path.join(base, "cgroup.subtree_control"), encoding="utf-8") as f:
+            enabled = f.read().split()
+        if all(controller in enabled for controller in CONTROLLERS):
+            return True
+        with open(os.path.join(base, "cgroup.procs"), encoding="utf-8") as procs_file:
+            procs = {int(pid) for pid in procs_file.read().split()}
+        if procs - {os.getpid()}:
+            return False
+        if procs:
+            leaf = os.path.join(base, "zenith-main")
+            os.makedirs(leaf, exist_ok=True)
+            _write(os.path.join(leaf, "cgroup.procs"), str(os.getpid()))
+        _write(
+            os.path.join(base, "cgroup.subtree_control"),
+            " ".join(f"+{controller}" for controller in CONTROLLERS),
+        )
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def create_cgroup(tool: str, limits: Limits) -> Optional[str]:
+    """Creates a child cgroup carrying limits, or returns None if not delegated."""
+    global _cgroup_base
+    if _cgroup_base is None:
+        _cgroup_base = own_cgroup() or ""
+    base = _cgroup_base
+    if not base or not enable_controllers(base):
+        return None
+    path = os.path.join(base, f"zenith-{tool}-{uuid.uuid4().hex[:8]}")
+    try:
+        os.mkdir(path)
+        if limits.memory_mb:
+            _write(os.path.join(path, "memory.max"), str(limits.memory_mb << 20))
+        if limits.cpu_percent:
+            _write(os.path.join(path, "cpu.max"), f"{limits.cpu_percent * 1000} 100000")
+        if limits.max_processes:
+            _write(os.path.join(path, "pids.max"), str(limits.max_processes))
+    except OSError:
+        # a missing memory.max etc. means the controller isn't delegated
+        remove_cgroup(path)
+        return None
+    return path
+
+
+def systemd_available() -> bool:
+    global _systemd_run
+    if _systemd_run is None:
+        _systemd_run = False
+        if shutil.which("systemd-run"):
+            try:
+                probe = subprocess.run(
+                    ["systemd-run", "--user", "--scope", "--quiet", "true"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=10,
+                )
+                _systemd_run = probe.returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+    return _systemd_run
+
+
+def systemd_scope(limits: Limits) -> List[str]:
+    """systemd-run prefix putting the command in a transient scope with limits."""
+    if not systemd_available():
+        return []
+    properties = []
+    if limits.memory_mb:
+        properties += ["-p", f"MemoryMax={limits.memory_mb}M"]
+    if limits.cpu_percent:
+        properties += ["-p", f"CPUQuota={limits.cpu_percent}%"]
+    if limits.max_processes:
+        properties += ["-p", f"TasksMax={limits.max_processes}"]
+    return ["systemd-run", "--user", "--scope", "--quiet", "--collect", *properties]
+
+
+def warn_rlimits_only(limits: Limits) -> None:
+    global _warned
+    if _warned:
+        return
+    _warned = True
+    message = (
+        "zenith: no delegated cgroup v2 or systemd user manager, "
+        "applying resource limits with rlimits only"
+    )
+    if limits.cpu_percent:
+        message += "; cpu_percent is not enforced"
+    print(message, file=sys.stderr)
+
+
+def remove_cgroup(path: str) -> None:
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def limited(
+    tool: str, command: List[str], env: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[List[str], Optional[Dict[str, str]]]]:
+    """Yields command wrapped in the launcher that applies the tool's limits,
+    and the environment to start it with; None inherits this process's."""
+    from zenith.bootstrap import python_env
+
+    limits = limits_for(tool)
+    if not limits or resource is None:
+        yield command, env
+        return
+    cgroup, scope = None, []
+    if limits.memory_mb or limits.cpu_percent or limits.max_processes:
+        cgroup = create_cgroup(tool, limits)
+        if cgroup is None:
+            scope = systemd_scope(limits)
+            if not scope:
+                warn_rlimits_only(limits)
+    spec = json.dumps(
+        {
+            "limits": limits.to_dict(),
+            "cgroup": cgroup,
+            "scope": bool(scope),
+            # the launcher imports zenith, the tool gets its PYTHONPATH back
+            "python_path": (os.environ if env is None else env).get("PYTHONPATH"),
+        }
+    )
+    try:
+        yield scope + [
+            sys.executable,
+            "-m",
+            "zenith.core.sandbox",
+            spec,
+            "--",
+            *command,
+        ], python_env(env)
+    finally:
+        if cgroup:
+            remove_cgroup(cgroup)
+
+
+def run(
+    tool: str, command: List[str], target: Optional[str] = None, **kwargs
+) -> subprocess.CompletedProcess:
+    """subprocess.run under the shared governor and the tool's resource limits."""
+    from zenith.core.governor import governed
+
+    env = kwargs.pop("env", None)
+    with governed(tool, target), limited(tool, command, env) as (argv, env):
+        return subprocess.run(argv, env=env, **kwargs)
+
+
+def system(tool: str, command: str, target: Optional[str] = None) -> int:
+    """os.system under the governor and limits; returns a wait status like it."""
+    from zenith.core.governor import governed
+
+    with governed(tool, target):
+        if os.name == "nt" or not limits_for(tool):
+            return os.system(command)
+        with limited(tool, ["/bin/sh", "-c", command]) as (argv, env):
+            returncode = subprocess.call(argv, env=env)
+    return -returncode if returncode < 0 else returncode << 8
+
+
+def launch(spec: Dict, argv: List[str]) -> None:
+    grouped = bool(spec.get("scope"))
+    if spec.get("cgroup"):
+        try:
+            _write(os.path.join(spec["cgroup"], "cgroup.procs"), "0")
+            grouped = True
+        except OSError:
+            pass
+    apply_rlimits(Limits(**spec["limits"]), grouped)
+    if spec.get("python_path") is None:
+        os.environ.pop("PYTHONPATH", None)
+    else:
+        os.environ["PYTHONPATH"] = spec["python_path"]
+    os.execvp(argv[0], argv)
+
+
+if __name__ == "__main__":
+    # python -m zenith.core.sandbox SPEC -- COMMAND...
+    launch(json.loads(sys.argv[1]), sys.argv[3:])
@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from typing import Dict, List, Optional
+
+from zenith.core.config import INSTALL_DIR
+
+STATUS_FILE = os.path.join(INSTALL_DIR, "status.json")
+# re-verify now and then even if nothing changed on disk, e.g. after pip uninstall
+MAX_AGE = 24 * 3600
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def fingerprint(tool) -> List:
+    """Stat-only key that changes whenever an install, marker or requirement changes."""
+    paths = [tool.full_path, tool.deps_marker]
+    options = tool.install_options
+    packages = options.get("pip") if isinstance(options, dict) else None
+    if isinstance(packages, str) and not packages.startswith("pip install"):
+        paths.append(os.path.join(tool.full_path, packages))
+    # dependency checks import packages with this interpreter
+    return [sys.executable] + [_mtime(path) for path in paths]
+
+
+class StatusCache:
+    """installed() results keyed on full_path, shared between zenith processes."""
+
+    def __init__(self, path: str = STATUS_FILE) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.loaded: Optional[int] = None
+        self.lock = threading.RLock()
+        self.pending: set = set()
+
+    def _load(self) -> None:
+        mtime = _mtime(self.path)
+        if mtime == self.loaded:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as status_file:
+                self.entries = json.load(status_file)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.loaded = mtime
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as status_file:
+                json.dump(self.entries, status_file)
+            os.replace(tmp_path, self.path)
+            self.loaded = _mtime(self.path)
+        except OSError:
+            pass
+
+    def peek(self, tool) -> Optional[bool]:
+        """The cached status if it is still valid, without touching anything but stat."""
+        with self.lock:
+            self._load()
+            entry = self.entries.get(tool.full_path)
+        if (
+            entry is None
+            or entry["key"] != fingerprint(tool)
+            or time.time() - entry["checked"] > MAX_AGE
+        ):
+            return None
+        return entry["installed"]
+
+    def update(self, tool, installed: bool) -> None:
+        with self.lock:
+            self._load()
+            self.entries[tool.full_path] = {
+                "key": fingerprint(tool),
+                "installed": installed,
+                "checked": time.time(),
+            }
+            self._save()
+
+    def installed(self, tool) -> bool:
+        cached = self.peek(tool)
+        if cached is not None:
+            return cached
+        result = tool.installed()
+        self.update(tool, result)
+        return result
+
+    def refresh_async(self, tools: Iterable) -> None:
+        """Checks stale tools in the background so a later render can show them."""
+        for tool in tools:
+            with self.lock:
+                if tool.full_path in self.pending:
+                    continue
+                self.pending.add(tool.full_path)
+            threading.Thread(target=self._refresh, args=(tool,), daemon=True).start()
+
+    def _refresh(self, tool) -> None:
+        try:
+            self.installed(tool)
+        finally:
+            with self.lock:
+                self.pending.discard(tool.full_path)
+
+
+_cache = StatusCache()
+
+
+def installable(tool) -> bool:
+    return hasattr(tool, "install") and hasattr(tool, "full_path")
+
+
+def installed(tool) -> bool:
+    """tool.installed(), answered from the status cache while nothing changed."""
+    if not installable(tool):
+        return True
+    return _cache.installed(tool)
+
+
+def record(tool, installed: bool) -> None:
+    if installable(tool):
+        _cache.update(tool, installed)
+
+
+def badges(tools: Iterable) -> Dict[str, Optional[bool]]:
+    """Cached status per tool name for menus; None while a check is still running."""
+    statuses: Dict[str, Optional[bool]] = {}
+    stale = []
+    for tool in tools:
+        if not installable(tool):
+            continue
+        status = _cache.peek(tool)
+        if status is None and not os.path.exists(tool.full_path):
+            # nothing cloned yet; no dependency check needed to know that
+            status = False
+        if status is None:
+            stale.append(tool)
+        statuses[str(tool)] = status
+    _cache.refresh_async(stale)
+    return statuses
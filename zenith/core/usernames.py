@@ -1,4 +1,5 @@
 import os.path
+from collections.abc import Iterable
 from typing import List
 
 from zenith.core.config import INSTALL_DIR, get_config
@@ -19,3 +20,17 @@ def get_usernames() -> List[str]:
 def add_username(username: str) -> None:
     with open(full_path, "a", encoding="utf-8") as usernamefile:
         usernamefile.write(f"\n{username}")
+
+
+def add_usernames(usernames: Iterable[str]) -> List[str]:
+    known = set(get_usernames())
+    new_usernames = []
+    for username in usernames:
+        username = username.strip()
+        if username and username not in known:
+            known.add(username)
+            new_usernames.append(username)
+    if new_usernames:
+        with open(full_path, "a", encoding="utf-8") as usernamefile:
+            usernamefile.write("".join(f"\n{username}" for username in new_usernames))
+    return new_usernames
@@ -1,14 +1,14 @@
 import os
 from abc import ABCMeta
-from base64 import b64decode
 from socket import gethostbyname
 
 import pyfiglet
-from requests import get
 
 from zenith.console import console
 
+from .catalog import tools
 from .config import GITHUB_PATH, INSTALL_DIR
+from .encoding import CodecError, decoder, detect, parse_chain, transform
 from .hosts import add_host, get_hosts
 from .menu import confirm, set_readline, tools_cli
 
@@ -38,14 +38,35 @@ class host2ip(Utility):
         console.print(f"\n{user_host} has the IP of {ip}")
 
 
-class base64_decode(Utility):
+class decode(Utility):
     def __init__(self):
-        super().__init__(description="Decodes base64")
+        super().__init__(description="Decodes base64/base32/hex/url/gzip chains")
 
     def run(self):
-        user_base64 = input("\nEnter base64: ").strip()
-        text = b64decode(user_base64)
-        console.print(f"\nDecoded: {text}")
+        user_input = input("\nEnter encoded text or @path to a file: ").strip()
+        chain = input("Codec chain (e.g. base64,gzip) [auto]: ").strip() or None
+        try:
+            if user_input.startswith("@"):
+                output = input("Output path [print]: ").strip()
+                with open(user_input[1:], "rb") as source:
+                    if output:
+                        with open(output, "wb") as target:
+                            used = transform(source, target, chain)
+                        console.print(f"\nDecoded ({','.join(used)}) to {output}")
+                        return
+                    data = source.read()
+            else:
+                data = user_input.encode()
+            used = chain or detect(data, complete=True)
+            if not used:
+                raise CodecError("Could not detect the encoding")
+            codec = decoder(used)
+            text = codec.update(data) + codec.finish()
+        except (CodecError, OSError) as error:
+            console.print(f"\n{error}", style="error")
+            return 1
+        console.print(f"\nDecoded ({','.join(parse_chain(used))}):", style="info")
+        console.print(text.decode(errors="backslashreplace"), markup=False)
 
 
 class print_contributors(Utility):
@@ -53,13 +74,24 @@ class print_contributors(Utility):
         super().__init__(description="Prints the author")
 
     def run(self):
+        # requests is slow to import and only this utility needs it
+        from requests import RequestException
+
+        from .http import session
+
         banner = pyfiglet.figlet_format("Author")
         console.print(banner, style="bold white")
 
-        response = get(
-            f"https://api.github.com/repos/{GITHUB_PATH}/contributors", timeout=30
-        )
-        contributors = response.json()
+        try:
+            contributors = list(
+                session().paginate(
+                    f"https://api.github.com/repos/{GITHUB_PATH}/contributors",
+                    params={"per_page": 100},
+                )
+            )
+        except RequestException as error:
+            console.print(f"Could not fetch contributors: {error}", style="error")
+            return 1
         for contributor in sorted(
             contributors, key=lambda c: c["contributions"], reverse=True
         ):
@@ -96,10 +128,7 @@ class reset_tool_dependencies(Utility):
                     console.print(f"Failed to remove {deps_file}: {e}", style="error")
 
 
-__tools__ = [
-    tool()
-    for tool in [host2ip, base64_decode, print_contributors, reset_tool_dependencies]
-]
+__tools__ = tools("utilities")
 
 
 def cli():
@@ -0,0 +1,415 @@
+import csv
+import json
+import os
+import random
+import socket
+import tempfile
+import time
+from argparse import Namespace
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from zenith.core.config import get_config
+
+config = get_config()
+
+TOOL = "watch"
+# checked when nothing is due, so watchlist edits are picked up promptly
+POLL_SECONDS = 60
+SHERLOCK_BATCH = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watch_state (
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    snapshot TEXT,
+    last_run REAL,
+    next_run REAL NOT NULL,
+    PRIMARY KEY (kind, target)
+);
+"""
+
+
+class Job(NamedTuple):
+    kind: str
+    target: str
+
+
+class Observation(NamedTuple):
+    """What one check saw: values present, and values known to be absent.
+
+    absent is None when the check is exhaustive, so anything not present is
+    missed, and removed once missed enough times in a row; otherwise only
+    values in absent count as removed.
+    """
+
+    present: Set[str]
+    absent: Optional[Set[str]] = None
+
+
+class Change(NamedTuple):
+    job: Job
+    added: List[str]
+    removed: List[str]
+
+
+# watch kind -> kind of the records its changes are stored as
+RECORD_KINDS = {"sherlock": "account", "dns": "ip"}
+
+
+def interval(kind: str) -> float:
+    key = "watch_username_interval" if kind == "sherlock" else "watch_host_interval"
+    return float(config.get("zenith", key))
+
+
+def next_run(kind: str, now: float) -> float:
+    """Now plus the kind's interval, stretched or shrunk by up to watch_jitter."""
+    jitter = float(config.get("zenith", "watch_jitter"))
+    return now + interval(kind) * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _connect():
+    from zenith.core.results import connect
+
+    connection = connect()
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def watchlist(kinds: Optional[Set[str]] = None) -> List[Job]:
+    """Jobs for usernames.txt and hosts.txt, read afresh so edits apply."""
+    from zenith.core.hosts import get_hosts
+    from zenith.core.usernames import get_usernames
+
+    jobs = [Job("sherlock", username) for username in get_usernames()]
+    jobs += [Job("dns", host) for host in get_hosts()]
+    return list(
+        dict.fromkeys(
+            job for job in jobs if job.target and (kinds is None or job.kind in kinds)
+        )
+    )
+
+
+def schedule(jobs: List[Job], now: float) -> Dict[Job, Tuple[float, Optional[str]]]:
+    """Returns (next_run, snapshot) for every job, scheduling new ones.
+
+    New jobs are spread over the first watch_jitter share of their interval
+    instead of all starting at once; jobs dropped from the watchlist keep
+    their state in case they come back.
+    """
+    connection = _connect()
+    state = {
+        Job(row["kind"], row["target"]): (row["next_run"], row["snapshot"])
+        for row in connection.execute("SELECT * FROM watch_state")
+    }
+    jitter = float(config.get("zenith", "watch_jitter"))
+    new_jobs = [job for job in jobs if job not in state]
+    for job in new_jobs:
+        state[job] = (now + random.uniform(0, interval(job.kind) * jitter), None)
+    if new_jobs:
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO watch_state (kind, target, next_run) VALUES (?, ?, ?)",
+                [(job.kind, job.target, state[job][0]) for job in new_jobs],
+            )
+    return {job: state[job] for job in jobs}
+
+
+def read_outcomes(csv_file: str) -> Optional[Observation]:
+    """Claimed and available profile URLs from a Sherlock --csv report.
+
+    Available rows are only there with --print-all, see SherlockRepo.command.
+    """
+    claimed, available = set(), set()
+    try:
+        with open(csv_file, encoding="utf-8", newline="") as report:
+            for row in csv.DictReader(report):
+                if row.get("exists") == "Claimed":
+                    claimed.add(row.get("url_user", ""))
+                elif row.get("exists") == "Available":
+                    available.add(row.get("url_user", ""))
+    except OSError:
+        return None
+    # sites that errored or were skipped say nothing about existing accounts
+    return Observation(claimed - {""}, available - {""})
+
+
+def check_usernames(
+    usernames: List[str], sites: Optional[List[str]] = None
+) -> Dict[str, Optional[Observation]]:
+    from zenith.enumeration.sherlock import sherlock
+
+    with tempfile.TemporaryDirectory() as folder:
+        found = sherlock.search_batch(usernames, folder, sites)
+        observations = {}
+        for username in usernames:
+            observation = read_outcomes(os.path.join(folder, f"{username}.csv"))
+            if observation is None and found[username]:
+                # no report to tell removals from errors, only count additions
+                observation = Observation(set(found[username]), set())
+            observations[username] = observation
+        return observations
+
+
+def resolve(host: str) -> Optional[Observation]:
+    try:
+        answer = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except socket.gaierror as error:
+        if error.errno == socket.EAI_NONAME:
+            return Observation(set())
+        # a failing resolver says nothing about the host
+        return None
+    return Observation({info[4][0] for info in answer})
+
+
+def load_snapshot(snapshot: Optional[str]) -> Dict[str, int]:
+    """Watched values and how many checks in a row have missed each."""
+    values = json.loads(snapshot) if snapshot else {}
+    # snapshots used to be plain lists of values
+    return {value: 0 for value in values} if isinstance(values, list) else values
+
+
+def diff(
+    snapshot: Optional[str], observation: Observation, misses: int = 1
+) -> Tuple[List[str], List[str], str]:
+    """Added and removed values against the stored snapshot, and the new one.
+
+    With an exhaustive observation a value is removed after misses checks in
+    a row did not see it.
+    """
+    previous = load_snapshot(snapshot)
+    current: Dict[str, int] = {}
+    removed = []
+    for value, missed in previous.items():
+        if value in observation.present:
+            current[value] = 0
+        elif observation.absent is None:
+            if missed + 1 >= misses:
+                removed.append(value)
+            else:
+                current[value] = missed + 1
+        elif value in observation.absent:
+            removed.append(value)
+        else:
+            current[value] = missed
+    added = observation.present - previous.keys()
+    current.update(dict.fromkeys(added, 0))
+    return sorted(added), sorted(removed), json.dumps(dict(sorted(current.items())))
+
+
+def run_due(
+    jobs: Dict[Job, Tuple[float, Optional[str]]],
+    now: float,
+    workers: int = 8,
+    sites: Optional[List[str]] = None,
+) -> Tuple[int, List[Change]]:
+    """Checks the due jobs; returns how many ran and what changed.
+
+    A job's first check only records a baseline. Changes are stored as
+    records of the watch tool, one run per pass that saw any.
+    """
+    from zenith.console import console
+    from zenith.core.results import record_run
+
+    due = [job for job, (scheduled, _) in jobs.items() if scheduled <= now]
+    usernames = [job.target for job in due if job.kind == "sherlock"]
+    hosts = [job.target for job in due if job.kind == "dns"]
+
+    misses = {"dns": int(config.get("zenith", "watch_dns_misses"))}
+    changes: List[Change] = []
+    updates = []
+    ran = 0
+    with ThreadPoolExecutor(workers) as pool:
+        futures: Dict[Future, str] = {}
+        for start in range(0, len(usernames), SHERLOCK_BATCH):
+            batch = usernames[start : start + SHERLOCK_BATCH]
+            futures[pool.submit(check_usernames, batch, sites)] = "sherlock"
+        for host in hosts:
+            futures[pool.submit(lambda host=host: {host: resolve(host)})] = "dns"
+        # results are handled here, in the thread that owns the results store
+        for future in as_completed(futures):
+            kind = futures[future]
+            try:
+                observations = future.result()
+            except Exception as error:
+                console.print(f"{kind} check failed: {error}", style="error")
+                continue
+            for target, observation in observations.items():
+                job = Job(kind, target)
+                ran += 1
+                snapshot = jobs[job][1]
+                if observation is None:
+                    updates.append((snapshot, time.time(), next_run(kind, now), job))
+                    continue
+                added, removed, new_snapshot = diff(
+                    snapshot, observation, misses.get(kind, 1)
+                )
+                if snapshot is not None and (added or removed):
+                    changes.append(Change(job, added, removed))
+                updates.append((new_snapshot, time.time(), next_run(kind, now), job))
+
+    connection = _connect()
+    with connection:
+        connection.execute("BEGIN")
+        connection.executemany(
+            "UPDATE watch_state SET snapshot = ?, last_run = ?, next_run = ? "
+            "WHERE kind = ? AND target = ?",
+            [
+                (snapshot, last, scheduled, *job)
+                for snapshot, last, scheduled, job in updates
+            ],
+        )
+    if changes:
+        with record_run(TOOL, f"{ran} checks") as run:
+            for change in changes:
+                kind = RECORD_KINDS[change.job.kind]
+                for state, values in (
+                    ("added", change.added),
+                    ("removed", change.removed),
+                ):
+                    if values:
+                        run.add_many(
+                            kind, values, change=state, target=change.job.target
+                        )
+    return ran, changes
+
+
+def print_changes(changes: List[Change]) -> None:
+    from zenith.console import console
+
+    for change in changes:
+        for value in change.added:
+            console.print(f"  + {change.job.target}: {value}", style="success")
+        for value in change.removed:
+            console.print(f"  - {change.job.target}: {value}", style="warning")
+
+
+def print_jobs() -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    jobs = schedule(watchlist(), time.time())
+    last_runs = {
+        Job(row["kind"], row["target"]): row["last_run"]
+        for row in _connect().execute("SELECT kind, target, last_run FROM watch_state")
+    }
+
+    def when(timestamp: Optional[float]) -> str:
+        if timestamp is None:
+            return "never"
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+    table = Table("Kind", "Target", "Last run", "Next run", title_style="highlight")
+    for job, (scheduled, snapshot) in sorted(jobs.items(), key=lambda item: item[1][0]):
+        watched = len(json.loads(snapshot)) if snapshot else 0
+        table.add_row(
+            job.kind,
+            f"{job.target} ({watched})",
+            when(last_runs.get(job)),
+            when(scheduled),
+        )
+    console.print(table)
+
+
+def print_recent(limit: int) -> None:
+    from rich.table import Table
+
+    from zenith.console import console
+
+    rows = _connect().execute(
+        "SELECT kind, value, data, created FROM records WHERE tool = ? "
+        "ORDER BY id DESC LIMIT ?",
+        (TOOL, limit),
+    )
+    table = Table("Time", "Change", "Target", "Kind", "Value", title_style="highlight")
+    for row in rows:
+        data = json.loads(row["data"] or "{}")
+        table.add_row(
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"])),
+            data.get("change", ""),
+            data.get("target", ""),
+            row["kind"],
+            row["value"],
+        )
+    console.print(table)
+
+
+def watch(
+    once: bool = False, now: bool = False, workers: int = 8, fast: bool = False
+) -> int:
+    from zenith.console import console
+    from zenith.core.status import installed
+    from zenith.enumeration import sites as site_history
+    from zenith.enumeration.sherlock import sherlock
+
+    kinds = {"dns"}
+    if installed(sherlock):
+        kinds.add("sherlock")
+    else:
+        console.print("sherlock is not installed, watching hosts only", style="warning")
+    sites = None
+    if fast and "sherlock" in kinds:
+        allowed, skipped = site_history.plan(
+            site_history.known_sites(sherlock.full_path)
+        )
+        site_history.print_skipped(skipped)
+        if skipped and allowed:
+            sites = allowed
+    force = now
+    while True:
+        started = time.time()
+        jobs = schedule(watchlist(kinds), started)
+        if force:
+            jobs = {job: (started, snapshot) for job, (_, snapshot) in jobs.items()}
+            force = False
+        ran, changes = run_due(jobs, started, workers, sites)
+        if ran:
+            console.print(
+                f"{time.strftime('%H:%M:%S')} {ran} checks, {len(changes)} changed",
+                style="info",
+            )
+            print_changes(changes)
+        if once:
+            return 0
+        pending = [
+            scheduled
+            for scheduled, _ in schedule(watchlist(kinds), time.time()).values()
+        ]
+        wait = min(pending, default=time.time() + POLL_SECONDS) - time.time()
+        time.sleep(min(max(wait, 1), POLL_SECONDS))
+
+
+def command(args: Namespace) -> int:
+    if args.action == "list":
+        print_jobs()
+        return 0
+    if args.action == "changes":
+        print_recent(args.limit)
+        return 0
+    try:
+        return watch(args.once, args.now, args.workers, args.fast)
+    except KeyboardInterrupt:
+        return 130
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "watch", help="re-check watched usernames and hosts, reporting changes"
+    )
+    parser.add_argument(
+        "action", nargs="?", default="run", choices=["run", "list", "changes"]
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="run the due checks once and exit"
+    )
+    parser.add_argument(
+        "--now", action="store_true", help="check everything now, then keep schedule"
+    )
+    parser.add_argument("-j", "--workers", type=int, default=8)
+    parser.add_argument(
+        "--fast", action="store_true", help="skip slow or failing Sherlock sites"
+    )
+    parser.add_argument("-n", "--limit", type=int, default=50, help="changes to show")
+    parser.set_defaults(func=command)
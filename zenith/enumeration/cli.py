@@ -1,8 +1,7 @@
+from zenith.core.catalog import tools
 from zenith.core.menu import tools_cli
 
-from .sherlock import sherlock
-
-__tools__ = [sherlock]
+__tools__ = tools("enumeration")
 
 
 def cli():
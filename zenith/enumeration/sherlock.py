@@ -1,6 +1,33 @@
 import os
-
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from zenith.core import sandbox
 from zenith.core.repo import GitHubRepo
+from zenith.enumeration import sites as site_history
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def read_found_accounts(result_file: str) -> List[str]:
+    try:
+        with open(result_file, encoding="utf-8") as results:
+            return [line.strip() for line in results if "://" in line]
+    except OSError:
+        return []
+
+
+def interrupted(returncode: int) -> bool:
+    return returncode in (130, -signal.SIGINT)
+
+
+def not_found(line: str) -> bool:
+    """A "[-] Site: Not Found!" style line, which --print-all echoes too."""
+    return ANSI_RE.sub("", line).lstrip().startswith("[-]")
 
 
 class SherlockRepo(GitHubRepo):
@@ -11,15 +38,69 @@ class SherlockRepo(GitHubRepo):
             description="Hunt down social media accounts by username across social networks",
         )
 
+    def command(
+        self, usernames: List[str], sites: Optional[List[str]] = None
+    ) -> List[str]:
+        script = os.path.join(self.full_path, "sherlock_project", "sherlock.py")
+        if os.path.exists(script):
+            argv = ["python3", script, *usernames]
+        else:
+            argv = ["sherlock", *usernames]
+        # --csv reports each site's outcome and latency for the site history;
+        # without --print-all it only holds the claimed sites
+        argv += ["--csv", "--print-all"]
+        for site in sites or []:
+            argv += ["--site", site]
+        return argv
+
+    def fast_sites(self) -> Optional[List[str]]:
+        """Sites worth querying in fast mode; reports the ones left out."""
+        allowed, skipped = site_history.plan(site_history.known_sites(self.full_path))
+        site_history.print_skipped(skipped)
+        # nothing skipped, or no history yet: let Sherlock pick its own sites
+        return allowed if skipped and allowed else None
+
+    def search_batch(
+        self, usernames: List[str], folder: str, sites: Optional[List[str]] = None
+    ) -> Dict[str, List[str]]:
+        """One Sherlock process for several usernames; returns the found URLs."""
+        sandbox.run(
+            str(self),
+            self.command(usernames, sites) + ["--folderoutput", folder],
+            cwd=self.full_path,
+            capture_output=True,
+            check=False,
+        )
+        site_history.record_folder(folder, usernames)
+        return {
+            username: read_found_accounts(os.path.join(folder, f"{username}.txt"))
+            for username in usernames
+        }
+
+    def run_echoing_found(self, argv: List[str]) -> int:
+        """Runs Sherlock, echoing its output minus the sites without an account."""
+        from zenith.core.governor import governed
+
+        with governed(str(self)), sandbox.limited(str(self), argv) as (argv, env):
+            with subprocess.Popen(
+                argv,
+                env=env,
+                stdout=subprocess.PIPE,
+                encoding="utf-8",
+                errors="replace",
+            ) as process:
+                assert process.stdout
+                for line in process.stdout:
+                    if not not_found(line):
+                        sys.stdout.write(line)
+                        sys.stdout.flush()
+                return process.wait()
+
     def run(self):
         from zenith.console import console
+        from zenith.core.journal import Journal
         from zenith.core.menu import confirm
 
-        results_dir = os.path.join(self.full_path, "results")
-        os.makedirs(results_dir, exist_ok=True)
-
-        os.chdir(self.full_path)
-
         console.print("\n===== Sherlock Username Search =====", style="info")
         user_usernames = input("\nEnter one or more usernames: ").strip()
 
@@ -28,36 +109,90 @@ class SherlockRepo(GitHubRepo):
             return 1
 
         save_results = confirm("\nDo you want to save search results to a file?")
+        fast = confirm("\nFast mode: skip sites that are usually slow or failing?")
+        also_variants = confirm("\nAlso search generated variants of these names?")
+
+        journal = Journal.create(
+            str(self),
+            {
+                "usernames": user_usernames.split(),
+                "save_results": save_results,
+                "fast": fast,
+                "date_suffix": os.popen("date +'%Y%m%d_%H%M%S'").read().strip(),
+            },
+        )
+        exit_code = self.search(journal)
+        if also_variants:
+            from zenith.enumeration.variants import run_search
 
-        searched_usernames = user_usernames.split()
-        date_suffix = os.popen("date +'%Y%m%d_%H%M%S'").read().strip()
+            # each entered username is a seed, as in the search above
+            exit_code = run_search(user_usernames.split(), fast=fast) or exit_code
+        return exit_code
 
-        exit_code = 0
-        for username in searched_usernames:
-            if os.path.exists(
-                os.path.join(self.full_path, "sherlock_project", "sherlock.py")
-            ):
-                base_cmd = f"python3 {os.path.join(self.full_path, 'sherlock_project', 'sherlock.py')} {username}"
-            else:
-                base_cmd = f"sherlock {username}"
+    def resume(self, journal) -> int:
+        return self.search(journal)
 
-            if save_results:
+    def search(self, journal) -> int:
+        from zenith.console import console
+        from zenith.core.results import add_records
 
-                username_dir = os.path.join(results_dir, f"{username}_{date_suffix}")
+        results_dir = os.path.join(self.full_path, "results")
+        os.makedirs(results_dir, exist_ok=True)
+
+        os.chdir(self.full_path)
+
+        searched_usernames = journal.params["usernames"]
+        save_results = journal.params["save_results"]
+        date_suffix = journal.params["date_suffix"]
+        # runs journaled before fast mode existed searched every site
+        sites = self.fast_sites() if journal.params.get("fast") else None
+
+        exit_code = next(
+            (
+                result["exit_code"]
+                for result in journal.completed.values()
+                if result.get("exit_code")
+            ),
+            0,
+        )
+        scratch_dir = tempfile.TemporaryDirectory()
+        try:
+            for username in journal.pending(searched_usernames):
+                if save_results:
+
+                    username_dir = os.path.join(
+                        results_dir, f"{username}_{date_suffix}"
+                    )
+                else:
+                    # unsaved searches still go through a scratch folder so the
+                    # found accounts can be recorded in the results store
+                    username_dir = os.path.join(scratch_dir.name, username)
                 os.makedirs(username_dir, exist_ok=True)
-                cmd = f"{base_cmd} --folderoutput {username_dir} --print-found"
-            else:
-                cmd = f"{base_cmd} --print-found"
-
-            result = os.system(cmd)
-            if result != 0:
-                exit_code = result
-
-            result_files = []
-            if save_results and os.path.exists(username_dir):
-                result_files = [
-                    f for f in os.listdir(username_dir) if f.endswith(".txt")
-                ]
+                result = self.run_echoing_found(
+                    self.command([username], sites) + ["--folderoutput", username_dir]
+                )
+                if interrupted(result):
+                    raise KeyboardInterrupt
+                if result != 0:
+                    exit_code = result
+
+                site_history.record_folder(username_dir, [username])
+                accounts = read_found_accounts(
+                    os.path.join(username_dir, f"{username}.txt")
+                )
+                add_records(str(self), "account", accounts, username=username)
+                journal.complete(username, exit_code=result, accounts=len(accounts))
+        except KeyboardInterrupt:
+            console.print(
+                f"\nInterrupted after {len(journal.completed)} of "
+                f"{len(searched_usernames)} usernames. "
+                f"Resume with: zenith --resume {journal.run_id}",
+                style="warning",
+            )
+            raise
+        finally:
+            scratch_dir.cleanup()
+        journal.finish()
 
         if save_results and len(searched_usernames) > 0:
             console.print("\n═════ Search Summary ═════", style="info")
@@ -0,0 +1,186 @@
+import csv
+import json
+import os
+import statistics
+import time
+from collections.abc import Iterable
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from zenith.core.config import get_config, tool_option
+
+config = get_config()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS site_probes (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    latency REAL,
+    probed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS site_probes_site ON site_probes(site, probed);
+"""
+
+# Sherlock's "exists" column; anything else is an answer from the site
+FAILURES = {"Unknown", "WAF"}
+# probes older than this are dropped when new ones are recorded
+HISTORY_DAYS = 30
+
+
+class SiteStats(NamedTuple):
+    samples: int
+    failure_rate: float
+    p95: Optional[float]
+
+
+class Thresholds(NamedTuple):
+    max_failure_rate: float
+    max_p95: float
+    min_samples: int
+    window: int
+
+
+def thresholds() -> Thresholds:
+    """Reads the fast mode limits from the [tool.sherlock] section of zenith.cfg."""
+
+    def option(key: str, default: str) -> str:
+        return tool_option(config, "sherlock", key, default) or default
+
+    return Thresholds(
+        max_failure_rate=float(option("fast_max_failure_rate", "0.5")),
+        max_p95=float(option("fast_max_p95", "10")),
+        min_samples=int(option("fast_min_samples", "5")),
+        window=int(option("fast_window", "50")),
+    )
+
+
+def _connect():
+    from zenith.core.results import connect
+
+    connection = connect()
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def read_probes(csv_file: str) -> List[Tuple[str, str, Optional[float]]]:
+    """Per-site (site, outcome, latency) rows from a Sherlock --csv report."""
+    probes = []
+    try:
+        with open(csv_file, encoding="utf-8", newline="") as report:
+            for row in csv.DictReader(report):
+                site, outcome = row.get("name"), row.get("exists")
+                if not site or not outcome:
+                    continue
+                try:
+                    latency: Optional[float] = float(row.get("response_time_s") or "")
+                except ValueError:
+                    latency = None
+                probes.append((site, outcome, latency))
+    except OSError:
+        pass
+    return probes
+
+
+def record(probes: Iterable[Tuple[str, str, Optional[float]]]) -> int:
+    now = time.time()
+    rows = [(site, outcome, latency, now) for site, outcome, latency in probes]
+    if not rows:
+        return 0
+    connection = _connect()
+    with connection:
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO site_probes (site, outcome, latency, probed) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        connection.execute(
+            "DELETE FROM site_probes WHERE probed < ?",
+            (now - HISTORY_DAYS * 86400,),
+        )
+    return len(rows)
+
+
+def record_folder(folder: str, usernames: Iterable[str]) -> int:
+    return sum(
+        record(read_probes(os.path.join(folder, f"{username}.csv")))
+        for username in usernames
+    )
+
+
+def p95(latencies: List[float]) -> Optional[float]:
+    if not latencies:
+        return None
+    if len(latencies) == 1:
+        return latencies[0]
+    return statistics.quantiles(latencies, n=20, method="inclusive")[18]
+
+
+def site_stats(window: int = 50) -> Dict[str, SiteStats]:
+    """Failure rate and p95 latency over each site's last window probes."""
+    probes: Dict[str, List[Tuple[str, Optional[float]]]] = {}
+    rows = _connect().execute(
+        "SELECT site, outcome, latency FROM site_probes ORDER BY probed DESC, id DESC"
+    )
+    for row in rows:
+        recent = probes.setdefault(row["site"], [])
+        if len(recent) < window:
+            recent.append((row["outcome"], row["latency"]))
+    return {
+        site: SiteStats(
+            samples=len(recent),
+            failure_rate=sum(outcome in FAILURES for outcome, _ in recent)
+            / len(recent),
+            p95=p95([latency for _, latency in recent if latency is not None]),
+        )
+        for site, recent in probes.items()
+    }
+
+
+def known_sites(full_path: str) -> List[str]:
+    """Site names from the data.json of a cloned Sherlock, else from history."""
+    manifest = os.path.join(full_path, "sherlock_project", "resources", "data.json")
+    try:
+        with open(manifest, encoding="utf-8") as sites:
+            return sorted(name for name in json.load(sites) if name != "$schema")
+    except (OSError, ValueError):
+        return sorted(
+            row["site"]
+            for row in _connect().execute("SELECT DISTINCT site FROM site_probes")
+        )
+
+
+def plan(
+    sites: List[str], limits: Optional[Thresholds] = None
+) -> Tuple[List[str], Dict[str, str]]:
+    """Splits sites into the ones fast mode queries and the skipped ones.
+
+    Sites with fewer than min_samples recent probes are always kept, so new
+    or rarely seen sites get measured before they can be skipped.
+    """
+    limits = limits or thresholds()
+    stats = site_stats(limits.window)
+    allowed, skipped = [], {}
+    for site in sites:
+        site_stat = stats.get(site)
+        if site_stat is None or site_stat.samples < limits.min_samples:
+            allowed.append(site)
+        elif site_stat.failure_rate > limits.max_failure_rate:
+            skipped[site] = f"{site_stat.failure_rate:.0%} failed"
+        elif site_stat.p95 is not None and site_stat.p95 > limits.max_p95:
+            skipped[site] = f"p95 {site_stat.p95:.1f}s"
+        else:
+            allowed.append(site)
+    return allowed, skipped
+
+
+def print_skipped(skipped: Dict[str, str]) -> None:
+    from zenith.console import console
+
+    if not skipped:
+        return
+    console.print(
+        f"Fast mode: skipping {len(skipped)} slow or failing sites", style="warning"
+    )
+    for site, reason in sorted(skipped.items()):
+        console.print(f"  • {site}: {reason}", style="warning")
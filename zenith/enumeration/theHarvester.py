@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from zenith.core import sandbox
+from zenith.core.cache import touch
+from zenith.core.config import INSTALL_DIR, get_config
+from zenith.core.repo import GitHubRepo
+
+config = get_config()
+
+CACHE_DIR = os.path.join(INSTALL_DIR, "cache", "theHarvester")
+DEFAULT_SOURCES = ["crtsh", "hackertarget", "otx", "rapiddns", "urlscan"]
+RESULT_KEYS = ["emails", "hosts", "ips"]
+
+
+def cache_path(domain: str, source: str) -> str:
+    return os.path.join(CACHE_DIR, domain.lower(), f"{source}.json")
+
+
+def read_cache(domain: str, source: str, ttl: int) -> Optional[Dict[str, List[str]]]:
+    path = cache_path(domain, source)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, encoding="utf-8") as cachefile:
+            results = json.load(cachefile)
+    except (OSError, ValueError):
+        return None
+    # the file mtime is the TTL, so mark the domain as used on its directory
+    touch(os.path.dirname(path))
+    return results
+
+
+def write_cache(domain: str, source: str, results: Dict[str, List[str]]) -> None:
+    path = cache_path(domain, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as cachefile:
+        json.dump(results, cachefile)
+    os.replace(tmp_path, path)
+
+
+def parse_results(data: dict) -> Dict[str, List[str]]:
+    results: Dict[str, List[str]] = {key: [] for key in RESULT_KEYS}
+    for email in data.get("emails") or []:
+        results["emails"].append(email.strip().lower())
+    for entry in data.get("hosts") or []:
+        # theHarvester reports resolved hosts as "host:ip"
+        host, _, ip = entry.partition(":")
+        results["hosts"].append(host.strip().lower())
+        if ip:
+            results["ips"].append(ip.strip())
+    for ip in data.get("ips") or []:
+        results["ips"].append(ip.strip())
+    return {key: sorted(set(filter(None, values))) for key, values in results.items()}
+
+
+def merge_results(results: List[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    merged: Dict[str, set] = {key: set() for key in RESULT_KEYS}
+    for result in results:
+        for key in RESULT_KEYS:
+            merged[key].update(result.get(key, []))
+    return {key: sorted(values) for key, values in merged.items()}
+
+
+class TheHarvesterRepo(GitHubRepo):
+    def __init__(self):
+        super().__init__(
+            path="laramies/theHarvester",
+            install={"pip": "pip install ."},
+            description="Gather emails, subdomains and IPs for a domain from public sources",
+        )
+
+    def command(self, domain: str, source: str, output: str) -> List[str]:
+        script = os.path.join(self.full_path, "theHarvester.py")
+        if os.path.exists(script):
+            base_cmd = [sys.executable, script]
+        else:
+            base_cmd = ["theHarvester"]
+        return base_cmd + ["-d", domain, "-b", source, "-f", output]
+
+    def query(self, domain: str, source: str, ttl: int = 0) -> Dict[str, List[str]]:
+        if ttl > 0:
+            cached = read_cache(domain, source, ttl)
+            if cached is not None:
+                return cached
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, f"{source}")
+            sandbox.run(
+                str(self),
+                self.command(domain, source, output),
+                target=domain,
+                cwd=self.full_path,
+                capture_output=True,
+                check=False,
+            )
+            try:
+                with open(f"{output}.json", encoding="utf-8") as result_file:
+                    results = parse_results(json.load(result_file))
+            except (OSError, ValueError):
+                # failed sources are not cached so they are retried next run
+                return {key: [] for key in RESULT_KEYS}
+        write_cache(domain, source, results)
+        return results
+
+    def harvest(
+        self, domain: str, sources: List[str], ttl: int = 0, workers: int = 8
+    ) -> Dict[str, List[str]]:
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+            futures = {
+                pool.submit(self.query, domain, source, ttl): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                results.append(future.result())
+        return merge_results(results)
+
+    def run(self):
+        from zenith.console import console
+        from zenith.core.journal import Journal
+
+        console.print("\n===== theHarvester Domain Search =====", style="info")
+        domains = input("\nEnter one or more domains: ").split()
+        if not domains:
+            console.print("No domains entered. Aborting.", style="warning")
+            return 1
+        sources = (
+            input(f"Sources [{','.join(DEFAULT_SOURCES)}]: ")
+            .strip()
+            .replace(",", " ")
+            .split()
+            or DEFAULT_SOURCES
+        )
+        journal = Journal.create(str(self), {"domains": domains, "sources": sources})
+        return self.search(journal)
+
+    def resume(self, journal) -> int:
+        return self.search(journal)
+
+    def search(self, journal) -> int:
+        from zenith.console import console
+        from zenith.core.hosts import add_hosts
+        from zenith.core.results import add_records
+
+        domains = journal.params["domains"]
+        sources = journal.params["sources"]
+        ttl = config.getint("zenith", "harvester_cache_ttl")
+
+        try:
+            for domain in journal.pending(domains):
+                started = time.perf_counter()
+                results = self.harvest(domain, sources, ttl)
+                elapsed = time.perf_counter() - started
+                console.print(
+                    f"\n{domain}: {len(sources)} sources in {elapsed:.1f}s",
+                    style="info",
+                )
+                for key in RESULT_KEYS:
+                    console.print(f"  {key} ({len(results[key])})", style="success")
+                    for value in results[key]:
+                        console.print(f"    {value}", style="tool_description")
+                for key in RESULT_KEYS:
+                    # "hosts" -> "host" so kinds line up with other tools' records
+                    add_records(str(self), key[:-1], results[key], domain=domain)
+                new_hosts = add_hosts(results["hosts"])
+                console.print(
+                    f"  {len(new_hosts)} new hosts added to the inventory",
+                    style="info",
+                )
+                journal.complete(
+                    domain, **{key: len(values) for key, values in results.items()}
+                )
+        except KeyboardInterrupt:
+            console.print(
+                f"\nInterrupted after {len(journal.completed)} of {len(domains)} "
+                f"domains. Resume with: zenith --resume {journal.run_id}",
+                style="warning",
+            )
+            raise
+        journal.finish()
+        return 0
+
+
+theHarvester = TheHarvesterRepo()
@@ -0,0 +1,321 @@
+import os
+import re
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date
+from itertools import islice
+from typing import Dict, List, Optional, Set
+
+SEPARATORS = ["", ".", "_", "-"]
+PREFIXES = ["real", "the", "iam", "its"]
+SUFFIXES = ["official", "real", "hq", "tv", "dev", "x", "_"]
+DEFAULT_BATCH = 8
+# every candidate costs a Sherlock pass over hundreds of sites
+DEFAULT_LIMIT = 200
+# birth years of account holders aged about 15 to 45
+DEFAULT_YEARS = f"{date.today().year - 45}-{date.today().year - 15}"
+# characters most sites accept in a handle; anything else is split on or dropped
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokens(seed: str) -> List[str]:
+    """Name parts of a seed: "John Smith", "john_smith" and "john.smith" agree."""
+    return TOKEN_PATTERN.findall(seed.lower())
+
+
+def bases(parts: List[str]) -> Iterator[str]:
+    """Joins of the name parts, their initials and the reversed order."""
+    if not parts:
+        return
+    yield "".join(parts)
+    if len(parts) == 1:
+        return
+    first, last = parts[0], parts[-1]
+    for separator in SEPARATORS:
+        yield separator.join(parts)
+        yield separator.join(reversed(parts))
+        yield f"{first[0]}{separator}{last}"
+        yield f"{first}{separator}{last[0]}"
+        yield f"{last}{separator}{first[0]}"
+    yield "".join(part[0] for part in parts)
+    yield first
+    yield last
+
+
+def suffixes(years: Iterable[int], digits: int) -> Iterator[str]:
+    yield ""
+    for suffix in SUFFIXES:
+        yield suffix
+        yield f"_{suffix}"
+    for number in range(10**digits if digits else 0):
+        yield str(number)
+        if digits > 1 and number < 10:
+            yield f"{number:02d}"
+    for year in years:
+        yield str(year)
+        yield f"{year % 100:02d}"
+
+
+def variants(
+    seed: str,
+    years: Iterable[int] = (),
+    digits: int = 2,
+    prefixes: bool = True,
+) -> Iterator[str]:
+    """Lazily expands one seed into candidate handles, most likely ones first.
+
+    Only this seed's candidates are remembered for deduplication, so memory
+    stays proportional to one seed's expansion however many seeds there are.
+    """
+    seen: Set[str] = set()
+    years = list(years)
+    base_names = list(dict.fromkeys(bases(tokens(seed))))
+    # every base before any decorated form, so plain handles are searched first
+    for suffix in suffixes(years, digits):
+        for base in base_names:
+            forms = [base + suffix]
+            if prefixes and not suffix:
+                # "therealjohn" style handles rarely carry digits as well
+                forms += [prefix + base for prefix in PREFIXES]
+            for candidate in forms:
+                if candidate not in seen and len(candidate) > 1:
+                    seen.add(candidate)
+                    yield candidate
+
+
+def expand(
+    seeds: Iterable[str],
+    known: Optional[Set[str]] = None,
+    limit: int = 0,
+    **options,
+) -> Iterator[str]:
+    """Streams candidates for all seeds, skipping handles already in the store."""
+    known = known or set()
+    produced = 0
+    for seed in seeds:
+        for candidate in variants(seed, **options):
+            if candidate in known:
+                continue
+            yield candidate
+            produced += 1
+            if limit and produced >= limit:
+                return
+
+
+def _batches(candidates: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(candidates)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def search(
+    sherlock,
+    candidates: Iterable[str],
+    batch_size: int = DEFAULT_BATCH,
+    workers: int = 4,
+    on_result: Optional[Callable[[str, List[str]], None]] = None,
+    sites: Optional[List[str]] = None,
+) -> Dict[str, List[str]]:
+    """Runs Sherlock over streamed candidates, batch_size handles per process.
+
+    At most twice as many batches as workers are pulled from candidates at
+    any time, so the stream is never materialized. Returns the handles that
+    had accounts, with their URLs. sites restricts Sherlock to those sites.
+    """
+    found: Dict[str, List[str]] = {}
+    batches = _batches(candidates, batch_size)
+    with tempfile.TemporaryDirectory() as scratch_dir, ThreadPoolExecutor(
+        workers
+    ) as pool:
+        pending: Set[Future] = set()
+
+        def refill() -> None:
+            for batch in islice(batches, workers * 2 - len(pending)):
+                folder = tempfile.mkdtemp(dir=scratch_dir)
+                pending.add(pool.submit(sherlock.search_batch, batch, folder, sites))
+
+        refill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                # results are handled here, in the thread that owns the run
+                for username, accounts in future.result().items():
+                    if on_result:
+                        on_result(username, accounts)
+                    if accounts:
+                        found[username] = accounts
+            refill()
+    return found
+
+
+def run_search(
+    seeds: List[str],
+    batch_size: int = DEFAULT_BATCH,
+    workers: int = 4,
+    limit: int = DEFAULT_LIMIT,
+    years: Optional[Iterable[int]] = None,
+    digits: int = 2,
+    fast: bool = False,
+    defer: bool = False,
+) -> int:
+    """Searches the seeds' variants; fast mode skips historically slow or
+    failing sites, and defer searches those afterwards in a second pass."""
+    from zenith.console import console
+    from zenith.core.results import add_records
+    from zenith.core.usernames import add_usernames, get_usernames
+    from zenith.enumeration import sites as site_history
+    from zenith.enumeration.sherlock import sherlock
+
+    checked = 0
+    started = time.perf_counter()
+    first_pass = True
+
+    def report(username: str, accounts: List[str]) -> None:
+        nonlocal checked
+        # the deferred pass goes over the same candidates again
+        if first_pass:
+            checked += 1
+        if accounts:
+            console.print(f"  {username}: {len(accounts)} accounts", style="success")
+            add_records(str(sherlock), "account", accounts, username=username)
+
+    if years is None:
+        years = parse_years(DEFAULT_YEARS)
+    known = set(get_usernames())
+    sites: Optional[List[str]] = None
+    deferred: List[str] = []
+    if fast or defer:
+        allowed, skipped = site_history.plan(
+            site_history.known_sites(sherlock.full_path)
+        )
+        site_history.print_skipped(skipped)
+        if skipped and allowed:
+            sites, deferred = allowed, sorted(skipped)
+    passes = [sites] + ([deferred] if defer and deferred else [])
+    found: Dict[str, List[str]] = {}
+    try:
+        for number, pass_sites in enumerate(passes):
+            if number:
+                first_pass = False
+                console.print(
+                    f"\nSearching the {len(deferred)} deferred sites", style="info"
+                )
+            candidates = expand(seeds, known, limit=limit, years=years, digits=digits)
+            for username, accounts in search(
+                sherlock, candidates, batch_size, workers, report, pass_sites
+            ).items():
+                found.setdefault(username, []).extend(accounts)
+    except KeyboardInterrupt:
+        console.print(f"\nStopped after {checked} candidates", style="warning")
+        raise
+    new_usernames = add_usernames(found)
+    console.print(
+        f"\n{checked} candidates in {time.perf_counter() - started:.1f}s, "
+        f"{len(found)} with accounts, {len(new_usernames)} added to the usernames store",
+        style="info",
+    )
+    return 0
+
+
+def parse_years(value: str) -> List[int]:
+    if not value:
+        return []
+    start, _, end = value.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+def command(args: Namespace) -> int:
+    from zenith.console import console
+    from zenith.core.results import record_run
+    from zenith.core.status import installed
+    from zenith.core.usernames import get_usernames
+    from zenith.enumeration.sherlock import sherlock
+
+    years = parse_years(args.years)
+    if args.print:
+        candidates = expand(
+            args.seeds,
+            set() if args.all else set(get_usernames()),
+            limit=args.limit,
+            years=years,
+            digits=args.digits,
+        )
+        try:
+            for candidate in candidates:
+                sys.stdout.write(f"{candidate}\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # the reader, e.g. head, has seen enough; keep exit from complaining
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    if not installed(sherlock):
+        console.print("sherlock is not installed, install it from the menu first")
+        return 1
+    try:
+        with record_run(str(sherlock), " ".join(args.seeds)):
+            return run_search(
+                args.seeds,
+                args.batch,
+                args.workers,
+                args.limit,
+                years,
+                args.digits,
+                fast=args.fast,
+                defer=args.defer,
+            )
+    except KeyboardInterrupt:
+        return 130
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "variants", help="expand names into username variants and search them"
+    )
+    parser.add_argument("seeds", nargs="+", metavar="SEED", help='e.g. "John Smith"')
+    parser.add_argument(
+        "--print", action="store_true", help="only print the candidates"
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="keep candidates already in the store"
+    )
+    parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help="stop after N candidates, 0 for no limit",
+    )
+    parser.add_argument(
+        "--years",
+        default=DEFAULT_YEARS,
+        help="year suffixes, e.g. 1985-1995, empty for none",
+    )
+    parser.add_argument(
+        "--digits", type=int, default=2, help="append numbers up to this many digits"
+    )
+    parser.add_argument(
+        "-b", "--batch", type=int, default=DEFAULT_BATCH, help="handles per Sherlock"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Sherlocks at once",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="skip sites that were slow or failing in recent runs",
+    )
+    parser.add_argument(
+        "--defer",
+        action="store_true",
+        help="like --fast, then search the skipped sites afterwards",
+    )
+    parser.set_defaults(func=command)
@@ -1,3 +1,3 @@
 from .cli import __tools__, cli
 
-__all__ = ["cli", "__tools__"] + [str(tool) for tool in __tools__]
+__all__ = ["cli", "__tools__"]
@@ -1,7 +1,8 @@
+from zenith.core.catalog import tools
 from zenith.core.menu import tools_cli
 
-__tools__ = []
+__tools__ = tools("obfuscation")
 
 
 def cli():
-    tools_cli(__name__, __tools__)
+    tools_cli(__name__, __tools__, links=False)
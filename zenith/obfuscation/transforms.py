@@ -0,0 +1,226 @@
+import bz2
+import json
+import lzma
+import os
+import sys
+import zlib
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+from typing import Callable, Dict, List, Optional, Tuple
+
+from zenith.console import console
+from zenith.core.encoding import CodecError, encoder
+from zenith.core.utilities import Utility
+
+Step = Dict[str, object]
+Pipelines = Dict[str, List[Step]]
+
+# the single positional value a step accepts in the short "op:value|op" syntax
+PRIMARY_PARAMS = {
+    "encode": "codec",
+    "compress": "format",
+    "chunk": "size",
+    "wrap": "prefix",
+    "template": "template",
+}
+
+
+class PipelineError(Exception):
+    pass
+
+
+def encode(data: bytes, codec: str = "base64") -> bytes:
+    chain = encoder(codec)
+    return chain.update(data) + chain.finish()
+
+
+def compress(data: bytes, format: str = "gzip", level: int = 9) -> bytes:
+    if format == "gzip":
+        compressor = zlib.compressobj(level, wbits=31)
+        return compressor.compress(data) + compressor.flush()
+    if format == "zlib":
+        return zlib.compress(data, level)
+    if format == "bz2":
+        return bz2.compress(data, level)
+    if format == "lzma":
+        return lzma.compress(data)
+    raise PipelineError(f"Unknown compression format: {format}")
+
+
+def chunk(data: bytes, size: int = 76, separator: str = "\n") -> bytes:
+    size = int(size)
+    pieces = [data[i : i + size] for i in range(0, len(data), size)]
+    return separator.encode().join(pieces)
+
+
+def wrap(data: bytes, prefix: str = "", suffix: str = "") -> bytes:
+    return prefix.encode() + data + suffix.encode()
+
+
+def template(data: bytes, template: str = "$payload", name: str = "") -> bytes:
+    if template.startswith("@"):
+        with open(template[1:], encoding="utf-8") as template_file:
+            template = template_file.read()
+    return (
+        Template(template)
+        .safe_substitute(payload=data.decode(errors="surrogateescape"), name=name)
+        .encode(errors="surrogateescape")
+    )
+
+
+TRANSFORMS: Dict[str, Callable[..., bytes]] = {
+    "encode": encode,
+    "compress": compress,
+    "chunk": chunk,
+    "wrap": wrap,
+    "template": template,
+}
+
+
+def validate(steps: List[Step]) -> List[Step]:
+    for step in steps:
+        if step.get("op") not in TRANSFORMS:
+            raise PipelineError(f"Unknown transform: {step.get('op')}")
+    return steps
+
+
+def parse_spec(spec: str) -> List[Step]:
+    """Parses the short form, e.g. "compress:gzip|encode:base64|chunk:64"."""
+    steps: List[Step] = []
+    for part in filter(None, (part.strip() for part in spec.split("|"))):
+        op, _, value = part.partition(":")
+        step: Step = {"op": op}
+        if value and op in PRIMARY_PARAMS:
+            step[PRIMARY_PARAMS[op]] = value
+        steps.append(step)
+    return validate(steps)
+
+
+def load_pipelines(path: str) -> Pipelines:
+    """Loads {"pipelines": {name: [steps]}}, {"steps": [...]} or a bare step list."""
+    with open(path, encoding="utf-8") as pipeline_file:
+        data = json.load(pipeline_file)
+    if isinstance(data, list):
+        data = {"steps": data}
+    if "pipelines" in data:
+        return {name: validate(steps) for name, steps in data["pipelines"].items()}
+    name = os.path.splitext(os.path.basename(path))[0]
+    return {name: validate(data.get("steps", []))}
+
+
+def apply(data: bytes, steps: List[Step], name: str = "") -> bytes:
+    for step in steps:
+        params = {key: value for key, value in step.items() if key != "op"}
+        if step["op"] == "template":
+            params.setdefault("name", name)
+        data = TRANSFORMS[str(step["op"])](data, **params)
+    return data
+
+
+def _apply_file(task: Tuple[str, List[Step], str]) -> str:
+    path, steps, output = task
+    with open(path, "rb") as source:
+        data = source.read()
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "wb") as target:
+        target.write(apply(data, steps, os.path.basename(path)))
+    return output
+
+
+def output_paths(inputs: List[str], output_dir: str) -> Dict[str, str]:
+    """Maps each input to its output path stem, keeping the inputs' layout.
+
+    Paths are taken relative to the inputs' common directory, so a/x.txt and
+    b/x.txt become output_dir/a/x.txt and output_dir/b/x.txt.
+    """
+    sources = list(dict.fromkeys(os.path.abspath(path) for path in inputs))
+    if not sources:
+        return {}
+    base = os.path.commonpath([os.path.dirname(path) for path in sources])
+    return {
+        path: os.path.join(output_dir, os.path.relpath(path, base)) for path in sources
+    }
+
+
+def run_batch(
+    inputs: List[str],
+    pipelines: Pipelines,
+    output_dir: str,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """Applies every pipeline to every input file over a process pool."""
+    tasks = [
+        (path, steps, f"{stem}.{name}")
+        for path, stem in output_paths(inputs, output_dir).items()
+        for name, steps in pipelines.items()
+    ]
+    outputs: Dict[str, str] = {}
+    for path, _, output in tasks:
+        if output in outputs:
+            raise PipelineError(
+                f"{path} and {outputs[output]} would both be written to {output}"
+            )
+        outputs[output] = path
+    os.makedirs(output_dir, exist_ok=True)
+    if not tasks:
+        return []
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_apply_file, tasks, chunksize=chunksize))
+
+
+def get_pipelines(pipeline: str) -> Pipelines:
+    if os.path.isfile(pipeline):
+        return load_pipelines(pipeline)
+    return {"out": parse_spec(pipeline)}
+
+
+def command(args: Namespace) -> int:
+    try:
+        pipelines = get_pipelines(args.pipeline)
+        outputs = run_batch(args.inputs, pipelines, args.output, args.jobs)
+    except (PipelineError, CodecError, OSError, ValueError, TypeError) as error:
+        print(f"transform: {error}", file=sys.stderr)
+        return 1
+    print(f"{len(outputs)} files written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def add_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        "transform", help="apply an encode/compress/chunk/wrap/template pipeline"
+    )
+    parser.add_argument(
+        "-p",
+        "--pipeline",
+        required=True,
+        help='JSON pipeline file or spec such as "compress:gzip|encode:base64"',
+    )
+    parser.add_argument("-o", "--output", default="transformed", help="output dir")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes")
+    parser.add_argument("inputs", nargs="+", help="input files")
+    parser.set_defaults(func=command)
+
+
+class transform(Utility):
+    def __init__(self):
+        super().__init__(description="Apply a transform pipeline to many inputs")
+
+    def run(self):
+        pipeline = input(
+            '\nPipeline file or spec (e.g. "compress:gzip|encode:base64"): '
+        ).strip()
+        inputs = input("Input files: ").split()
+        output_dir = input("Output directory [transformed]: ").strip() or "transformed"
+        try:
+            pipelines = get_pipelines(pipeline)
+            outputs = run_batch(inputs, pipelines, output_dir)
+        except (PipelineError, CodecError, OSError, ValueError, TypeError) as error:
+            console.print(f"\n{error}", style="error")
+            return 1
+        console.print(
+            f"\n{len(outputs)} files written to {output_dir}", style="success"
+        )
+        return 0
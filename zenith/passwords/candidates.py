@@ -0,0 +1,229 @@
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import date
+from itertools import islice
+from multiprocessing import Pool
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from zenith.console import console
+from zenith.core.utilities import Utility
+
+RULES = ["case", "leet", "suffix", "years", "combinator"]
+DEFAULT_RULES = ["case", "leet", "suffix"]
+CHUNK_SIZE = 512
+# word chunks handed to a worker at once, CHUNK_SIZE * POOL_CHUNKSIZE words
+POOL_CHUNKSIZE = 4
+
+LEET_TABLES = [
+    str.maketrans({"a": "4", "e": "3", "i": "1", "o": "0", "s": "5", "t": "7"}),
+    str.maketrans({"a": "@", "e": "3", "i": "!", "o": "0", "s": "$"}),
+]
+SUFFIXES = [str(digit) for digit in range(10)] + ["!", "123", "1234", "!@#"]
+
+Options = Dict[str, object]
+
+
+def case_variants(word: str) -> List[str]:
+    return [word, word.lower(), word.upper(), word.capitalize(), word.swapcase()]
+
+
+def leet_variants(word: str) -> List[str]:
+    return [word] + [word.translate(table) for table in LEET_TABLES]
+
+
+def suffix_variants(word: str, suffixes: List[str]) -> List[str]:
+    return [word] + [word + suffix for suffix in suffixes]
+
+
+def mutate(word: str, rules: List[str], options: Options) -> List[str]:
+    """Applies each rule in order to every variant produced by the previous one."""
+    variants = [word]
+    for rule in rules:
+        if rule == "case":
+            variants = [v for base in variants for v in case_variants(base)]
+        elif rule == "leet":
+            variants = [v for base in variants for v in leet_variants(base)]
+        elif rule == "suffix":
+            variants = [v for base in variants for v in suffix_variants(base, SUFFIXES)]
+        elif rule == "years":
+            years = options["years"]
+            variants = [v for base in variants for v in suffix_variants(base, years)]
+        elif rule == "combinator":
+            right = options["right"]
+            variants = [v for base in variants for v in suffix_variants(base, right)]
+        else:
+            raise ValueError(f"Unknown rule: {rule}")
+    # dict keeps first-seen order so the output stays deterministic
+    return list(dict.fromkeys(variants))
+
+
+def _generate_chunk(task: Tuple[List[str], List[str], Options]) -> Tuple[bytes, int]:
+    words, rules, options = task
+    candidates = [c for word in words for c in mutate(word, rules, options)]
+    if not candidates:
+        return b"", 0
+    return ("\n".join(candidates) + "\n").encode(errors="surrogateescape"), len(
+        candidates
+    )
+
+
+def read_words(path: str, part: int = 0, parts: int = 1) -> Iterator[str]:
+    """Streams base words, keeping only the words that belong to this partition."""
+    with open(path, encoding="utf-8", errors="surrogateescape") as wordlist:
+        index = 0
+        for line in wordlist:
+            word = line.rstrip("\r\n")
+            if not word:
+                continue
+            if index % parts == part:
+                yield word
+            index += 1
+
+
+def _chunks(words: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(words)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _bounded(
+    items: Iterable, slots: threading.Semaphore, stop: threading.Event
+) -> Iterator:
+    """Yields items only while slots are free; the consumer releases them.
+
+    Pool.imap pulls its input as fast as it can, so without this a huge
+    wordlist would be read into the task queue ahead of the workers. Once
+    stop is set the next free slot ends the stream instead.
+    """
+    for item in items:
+        slots.acquire()
+        if stop.is_set():
+            return
+        yield item
+
+
+def check_rules(rules: List[str]) -> None:
+    unknown = [rule for rule in rules if rule not in RULES]
+    if unknown:
+        raise ValueError(
+            f"Unknown rule: {', '.join(unknown)} (known: {', '.join(RULES)})"
+        )
+
+
+def generate(
+    words: Iterable[str],
+    output: BinaryIO,
+    rules: Optional[List[str]] = None,
+    years: Tuple[int, int] = (1970, date.today().year),
+    right: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+) -> int:
+    rules = rules or DEFAULT_RULES
+    check_rules(rules)
+    workers = workers or os.cpu_count() or 1
+    options: Options = {
+        "years": [str(year) for year in range(years[0], years[1] + 1)],
+        "right": right or [],
+    }
+    count = 0
+    # a few rounds of chunks in flight per worker keep them all busy
+    slots = threading.Semaphore(workers * POOL_CHUNKSIZE * 4)
+    stop = threading.Event()
+    tasks = _bounded(
+        ((chunk, rules, options) for chunk in _chunks(words, CHUNK_SIZE)), slots, stop
+    )
+    with Pool(workers) as pool:
+        try:
+            for data, chunk_count in pool.imap(
+                _generate_chunk, tasks, chunksize=POOL_CHUNKSIZE
+            ):
+                slots.release()
+                output.write(data)
+                count += chunk_count
+        finally:
+            # on a failed write, e.g. a closed pipe, the feeder thread may be
+            # waiting for a slot; terminating the pool would wait on it forever
+            stop.set()
+            slots.release()
+    output.flush()
+    return count
+
+
+def benchmark(
+    word_count: int = 100000, rules: Optional[List[str]] = None, workers=None
+) -> Dict[str, float]:
+    words = (f"word{index}" for index in range(word_count))
+    with open(os.devnull, "wb") as devnull:
+        started = time.perf_counter()
+        count = generate(words, devnull, rules, workers=workers)
+        elapsed = time.perf_counter() - started
+    return {"candidates": count, "seconds": elapsed, "rate": count / elapsed}
+
+
+def parse_partition(value: str) -> Tuple[int, int]:
+    """Parses "k/n", this run's share of a base list split n ways."""
+    try:
+        part, parts = (int(number) for number in value.split("/"))
+    except ValueError:
+        raise ValueError("Enter the partition as k/n, e.g. 0/4") from None
+    if parts < 1 or not 0 <= part < parts:
+        raise ValueError(f"Partition {value}: need n >= 1 and 0 <= k < n")
+    return part, parts
+
+
+def ask_partition() -> Tuple[int, int]:
+    while True:
+        try:
+            return parse_partition(input("Partition k/n [0/1]: ").strip() or "0/1")
+        except ValueError as error:
+            console.print(str(error), style="error")
+
+
+def ask_rules() -> List[str]:
+    while True:
+        answer = input(f"Rules ({','.join(RULES)}) [{','.join(DEFAULT_RULES)}]: ")
+        rules = answer.replace(",", " ").split() or DEFAULT_RULES
+        try:
+            check_rules(rules)
+            return rules
+        except ValueError as error:
+            console.print(str(error), style="error")
+
+
+class candidates(Utility):
+    def __init__(self):
+        super().__init__(description="Stream rule-based password candidates")
+
+    def run(self):
+        path = input("\nBase wordlist path: ").strip()
+        if not os.path.isfile(path):
+            console.print(f"Wordlist not found: {path}", style="error")
+            return 1
+        rules = ask_rules()
+        right = None
+        if "combinator" in rules:
+            right_path = input("Combinator wordlist path: ").strip()
+            if not os.path.isfile(right_path):
+                console.print(f"Wordlist not found: {right_path}", style="error")
+                return 1
+            right = list(read_words(right_path))
+        part, parts = ask_partition()
+        output_path = input("Output path [- for stdout]: ").strip() or "-"
+
+        started = time.perf_counter()
+        words = read_words(path, part, parts)
+        if output_path == "-":
+            count = generate(words, sys.stdout.buffer, rules, right=right)
+        else:
+            with open(output_path, "wb") as output:
+                count = generate(words, output, rules, right=right)
+        elapsed = time.perf_counter() - started
+        console.print(
+            f"\n{count} candidates in {elapsed:.1f}s "
+            f"({count / max(elapsed, 1e-9):,.0f}/s)",
+            style="success",
+        )
+        return 0
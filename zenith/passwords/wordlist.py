@@ -0,0 +1,404 @@
+import heapq
+import mmap
+import os
+import shutil
+import string
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from zenith.console import console
+from zenith.core.menu import set_readline
+from zenith.core.utilities import Utility
+
+BLOCK_SIZE = 1 << 24
+LINE_OVERHEAD = 64
+# sorted runs merged at once; each is an open file, so this stays far below
+# the usual limit of 1024 descriptors however many runs a large list spills
+MAX_FAN_IN = 64
+# hex digits of the "<range><line>" position tag merge() puts before each line
+TAG_SIZE = 16
+
+CHARSETS = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "digit": string.digits,
+    "special": string.punctuation + " ",
+    "alpha": string.ascii_letters,
+    "alnum": string.ascii_letters + string.digits,
+    "ascii": string.printable.strip() + " ",
+}
+
+Range = Tuple[str, int, int]
+
+
+def charset_bytes(spec: str) -> bytes:
+    """Builds an allowed byte set from class names (lower+digit) or literal chars."""
+    chars = ""
+    for part in spec.split("+"):
+        chars += CHARSETS.get(part, part)
+    return bytes(sorted(set(chars.encode())))
+
+
+def line_ranges(path: str, parts: int) -> List[Range]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    parts = max(1, min(parts, size // BLOCK_SIZE + 1))
+    ranges = []
+    with open(path, "rb") as wordlist, mmap.mmap(
+        wordlist.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        start = 0
+        for i in range(1, parts + 1):
+            end = size if i == parts else size * i // parts
+            if end < size:
+                newline = mm.find(b"\n", end)
+                end = size if newline == -1 else newline + 1
+            if end > start:
+                ranges.append((path, start, end))
+                start = end
+            if start >= size:
+                break
+    return ranges
+
+
+def iter_lines(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as wordlist, mmap.mmap(
+        wordlist.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        pos = start
+        while pos < end:
+            block_end = min(end, pos + BLOCK_SIZE)
+            if block_end < end:
+                newline = mm.rfind(b"\n", pos, block_end)
+                if newline != -1:
+                    block_end = newline + 1
+                else:
+                    newline = mm.find(b"\n", block_end, end)
+                    block_end = end if newline == -1 else newline + 1
+            for line in mm[pos:block_end].split(b"\n"):
+                line = line.rstrip(b"\r")
+                if line:
+                    yield line
+            pos = block_end
+
+
+def _range_stats(task: Range) -> Tuple[int, int, Counter, Counter]:
+    path, start, end = task
+    lines = 0
+    total = 0
+    lengths: Counter = Counter()
+    classes: Counter = Counter()
+    digits = string.digits.encode()
+    lower = string.ascii_lowercase.encode()
+    upper = string.ascii_uppercase.encode()
+    alnum = digits + lower + upper
+    for line in iter_lines(path, start, end):
+        lines += 1
+        total += len(line)
+        lengths[len(line)] += 1
+        if line.translate(None, digits) != line:
+            classes["digit"] += 1
+        if line.translate(None, lower) != line:
+            classes["lower"] += 1
+        if line.translate(None, upper) != line:
+            classes["upper"] += 1
+        if line.translate(None, alnum):
+            classes["special"] += 1
+    return lines, total, lengths, classes
+
+
+def _range_filter(
+    task: Tuple[Range, int, int, Optional[bytes], str],
+) -> Tuple[str, int]:
+    (path, start, end), min_len, max_len, allowed, tmp_dir = task
+    fd, part_path = tempfile.mkstemp(dir=tmp_dir)
+    count = 0
+    with os.fdopen(fd, "wb") as part:
+        for line in iter_lines(path, start, end):
+            if not min_len <= len(line) <= max_len:
+                continue
+            if allowed is not None and line.translate(None, allowed):
+                continue
+            part.write(line + b"\n")
+            count += 1
+    return part_path, count
+
+
+def _untagged(record: bytes) -> bytes:
+    return record[TAG_SIZE:]
+
+
+def _by_line(record: bytes) -> Tuple[bytes, bytes]:
+    # equal lines stay in input order, so the first occurrence comes first
+    return record[TAG_SIZE:], record[:TAG_SIZE]
+
+
+def _unique(
+    records: Iterable[bytes], key: Optional[Callable[[bytes], bytes]] = None
+) -> Iterator[bytes]:
+    """Drops records of sorted input that repeat their predecessor's key."""
+    previous = None
+    for record in records:
+        current = key(record) if key else record
+        if current != previous:
+            yield record
+            previous = current
+
+
+def _write_run(records: Iterable[bytes], tmp_dir: str) -> str:
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+    with os.fdopen(fd, "wb") as run:
+        for record in records:
+            run.write(record + b"\n")
+    return run_path
+
+
+def _spill(
+    records: Iterable[bytes],
+    budget: int,
+    tmp_dir: str,
+    key: Optional[Callable] = None,
+    unique_key: Optional[Callable[[bytes], bytes]] = None,
+) -> List[str]:
+    """Writes records as sorted, deduped runs of about budget bytes each."""
+    runs = []
+    chunk: List[bytes] = []
+    used = 0
+    for record in records:
+        chunk.append(record)
+        used += len(record) + LINE_OVERHEAD
+        if used >= budget:
+            runs.append(
+                _write_run(_unique(sorted(chunk, key=key), unique_key), tmp_dir)
+            )
+            chunk = []
+            used = 0
+    if chunk:
+        runs.append(_write_run(_unique(sorted(chunk, key=key), unique_key), tmp_dir))
+    return runs
+
+
+def _range_sort(task: Tuple[Range, int, str, int]) -> List[str]:
+    (path, start, end), budget, tmp_dir, number = task
+    lines: Iterable[bytes] = iter_lines(path, start, end)
+    if number < 0:
+        return _spill(lines, budget, tmp_dir)
+    # tag every line with its position for order-preserving merges
+    tagged = (b"%06x%010x" % (number, index) + line for index, line in enumerate(lines))
+    return _spill(tagged, budget, tmp_dir, _by_line, _untagged)
+
+
+def _read_run(run_path: str) -> Iterator[bytes]:
+    with open(run_path, "rb") as run:
+        for line in run:
+            yield line.rstrip(b"\n")
+
+
+def _merge_runs(
+    runs: List[str],
+    tmp_dir: str,
+    key: Optional[Callable] = None,
+    unique_key: Optional[Callable[[bytes], bytes]] = None,
+) -> Iterator[bytes]:
+    """Merges sorted runs in passes of MAX_FAN_IN, bounding the open files."""
+    while len(runs) > MAX_FAN_IN:
+        merged = []
+        for index in range(0, len(runs), MAX_FAN_IN):
+            group = runs[index : index + MAX_FAN_IN]
+            records = heapq.merge(*[_read_run(run) for run in group], key=key)
+            merged.append(_write_run(_unique(records, unique_key), tmp_dir))
+            for run in group:
+                os.remove(run)
+        runs = merged
+    records = heapq.merge(*[_read_run(run) for run in runs], key=key)
+    yield from _unique(records, unique_key)
+
+
+def _ranges(paths: Iterable[str], workers: int) -> List[Range]:
+    ranges = []
+    for path in paths:
+        ranges.extend(line_ranges(path, workers))
+    return ranges
+
+
+def stats(path: str, workers: Optional[int] = None) -> Dict[str, object]:
+    workers = workers or os.cpu_count() or 1
+    lines = 0
+    total = 0
+    lengths: Counter = Counter()
+    classes: Counter = Counter()
+    with Pool(workers) as pool:
+        for part in pool.imap_unordered(_range_stats, line_ranges(path, workers)):
+            lines += part[0]
+            total += part[1]
+            lengths.update(part[2])
+            classes.update(part[3])
+    return {
+        "path": path,
+        "size": os.path.getsize(path),
+        "lines": lines,
+        "min_length": min(lengths) if lengths else 0,
+        "max_length": max(lengths) if lengths else 0,
+        "avg_length": total / lines if lines else 0,
+        "lengths": dict(sorted(lengths.items())),
+        "classes": dict(classes),
+    }
+
+
+def filter_wordlist(
+    paths: List[str],
+    output: str,
+    min_len: int = 0,
+    max_len: int = 1 << 16,
+    charset: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> int:
+    workers = workers or os.cpu_count() or 1
+    allowed = charset_bytes(charset) if charset else None
+    count = 0
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(output))
+    ) as tmp_dir:
+        tasks = [
+            (task, min_len, max_len, allowed, tmp_dir)
+            for task in _ranges(paths, workers)
+        ]
+        with Pool(workers) as pool:
+            parts = pool.map(_range_filter, tasks)
+        # parts come back in range order, so the output keeps the input order
+        with open(output, "wb") as out:
+            for part_path, part_count in parts:
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, out, BLOCK_SIZE)
+                count += part_count
+    return count
+
+
+def _budget(memory_mb: int, workers: int) -> int:
+    return max(1 << 20, memory_mb * (1 << 20) // workers)
+
+
+def dedupe(
+    paths: List[str],
+    output: str,
+    memory_mb: int = 512,
+    workers: Optional[int] = None,
+) -> int:
+    """Sorts and dedupes one or more lists, spilling sorted runs to disk.
+
+    The output is in byte order; use merge() to keep the input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    budget = _budget(memory_mb, workers)
+    written = 0
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(output))
+    ) as tmp_dir:
+        tasks = [(task, budget, tmp_dir, -1) for task in _ranges(paths, workers)]
+        with Pool(workers) as pool:
+            runs = [run for part in pool.map(_range_sort, tasks) for run in part]
+        with open(output, "wb") as out:
+            for line in _merge_runs(runs, tmp_dir):
+                out.write(line + b"\n")
+                written += 1
+    return written
+
+
+def merge(
+    paths: List[str],
+    output: str,
+    memory_mb: int = 512,
+    workers: Optional[int] = None,
+) -> int:
+    """Concatenates lists in order, keeping only each word's first occurrence.
+
+    Lines are tagged with their position, sorted by word to drop repeats and
+    sorted back by position, all on disk, so memory stays within memory_mb.
+    """
+    workers = workers or os.cpu_count() or 1
+    budget = _budget(memory_mb, workers)
+    written = 0
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(output))
+    ) as tmp_dir:
+        tasks = [
+            (task, budget, tmp_dir, number)
+            for number, task in enumerate(_ranges(paths, workers))
+        ]
+        with Pool(workers) as pool:
+            runs = [run for part in pool.map(_range_sort, tasks) for run in part]
+        firsts = _merge_runs(runs, tmp_dir, _by_line, _untagged)
+        # the tags are fixed-width hex, so byte order is position order
+        by_position = _spill(firsts, memory_mb * (1 << 20), tmp_dir)
+        with open(output, "wb") as out:
+            for record in _merge_runs(by_position, tmp_dir):
+                out.write(record[TAG_SIZE:] + b"\n")
+                written += 1
+    return written
+
+
+def ask_int(message: str, default: int) -> int:
+    while True:
+        answer = input(message).strip()
+        if not answer:
+            return default
+        try:
+            return int(answer)
+        except ValueError:
+            console.print("Please enter a number", style="error")
+
+
+class wordlist(Utility):
+    def __init__(self):
+        super().__init__(description="Stats, filter, merge and dedupe large wordlists")
+
+    def run(self):
+        actions = ["stats", "filter", "dedupe", "merge"]
+        set_readline(actions)
+        action = input(f"\nAction ({'/'.join(actions)}): ").strip()
+        if action not in actions:
+            console.print("Invalid action", style="error")
+            return 1
+        paths = input("Wordlist path(s): ").split()
+        missing = [path for path in paths if not os.path.isfile(path)]
+        if not paths or missing:
+            console.print(f"Wordlist not found: {' '.join(missing)}", style="error")
+            return 1
+
+        if action == "stats":
+            for path in paths:
+                result = stats(path)
+                console.print(f"\n{path}", style="info")
+                for key in ["size", "lines", "min_length", "max_length"]:
+                    console.print(f"  {key}: {result[key]}", style="tool_description")
+                console.print(
+                    f"  avg_length: {result['avg_length']:.2f}",
+                    style="tool_description",
+                )
+                console.print(
+                    f"  classes: {result['classes']}", style="tool_description"
+                )
+            return 0
+
+        output = input("Output path: ").strip()
+        if not output:
+            console.print("No output path entered. Aborting.", style="warning")
+            return 1
+        if action == "filter":
+            min_len = ask_int("Minimum length [0]: ", 0)
+            max_len = ask_int("Maximum length [65536]: ", 1 << 16)
+            charset = input("Charset (e.g. lower+digit) [any]: ").strip() or None
+            count = filter_wordlist(paths, output, min_len, max_len, charset)
+            console.print(f"\n{count} words written", style="success")
+        elif action == "merge":
+            count = merge(paths, output)
+            console.print(f"\n{count} unique words written", style="success")
+        else:
+            count = dedupe(paths, output)
+            console.print(f"\n{count} unique words written", style="success")
+        console.print(f"Saved to {output}", style="success")
+        return 0
@@ -1,6 +1,7 @@
+from zenith.core.catalog import tools
 from zenith.core.menu import tools_cli
 
-__tools__ = []
+__tools__ = tools("web_apps")
 
 
 def cli():